@@ -11,59 +11,213 @@
  */
 
 import { getBrowserAPI } from '../utils/browser-api-factory';
+import { JobEvent, TERMINAL_STAGES } from '../models/job-event.model';
+import { Repository } from '../models/repository.model';
+import { ServerConnection, ServerReply } from './utils/server-connection';
 
 const browserAPI = getBrowserAPI();
 
+const SERVER_URL = 'http://localhost:5050';
+
+/**
+ * Shared connection: one WebSocket for every tab's requests, HTTP as fallback
+ */
+const server = new ServerConnection(SERVER_URL);
+const JOB_TIMEOUT_MS = 90000;
+const HEALTH_CACHE_MS = 5000;
+
+/**
+ * Human-readable labels for server pipeline stages
+ */
+const STAGE_LABELS: Record<string, string> = {
+  queued: 'Waiting for other requests...',
+  running: 'Starting...',
+  locate: 'Finding the commented line...',
+  launch: 'Launching Cursor...',
+  startup_wait: 'Waiting for Cursor to start...',
+  ready_wait: 'Waiting for Cursor to become responsive...',
+  file_wait: 'Waiting for the file to open...',
+  focus: 'Focusing Cursor...',
+  paste: 'Pasting into chat...',
+  submit: 'Submitting...',
+};
+
+/**
+ * When the server last reported itself ready; checks within HEALTH_CACHE_MS
+ * of it are skipped
+ */
+let serverReadyAt = 0;
+
+/**
+ * Check that the server is running and ready to automate Cursor before
+ * sending it anything. Returns null if it is, otherwise a message saying
+ * what is wrong.
+ */
+async function checkServer(): Promise<string | null> {
+  if (Date.now() - serverReadyAt < HEALTH_CACHE_MS) {
+    return null;
+  }
+  let reply: ServerReply;
+  try {
+    reply = await server.request('GET', '/health');
+  } catch (error) {
+    console.error('CursIt-Extension: Server health check failed:', error);
+    const address = SERVER_URL.replace(/^https?:\/\//, '');
+    return `CursIt server is not running at ${address}. Start it with "python run.py".`;
+  }
+  if (reply.status === 404) {
+    // Server predates /health: find out when sending
+    return null;
+  }
+  if (reply.status !== 200) {
+    return `CursIt server error: ${reply.status}`;
+  }
+
+  const health = reply.body;
+  if (health.status === 'starting') {
+    return 'CursIt server is still starting. Try again in a moment.';
+  }
+  if (!health.ready) {
+    console.warn('CursIt-Extension: Server not ready:', health);
+    return `CursIt server is not ready: ${health.problems.join('; ')}`;
+  }
+  serverReadyAt = Date.now();
+  return null;
+}
+
+/**
+ * Configured repository mappings keyed by normalized URL. Built on first use
+ * and dropped whenever the stored mappings change.
+ */
+let repositoryIndex: Map<string, Repository> | null = null;
+
+browserAPI.storageOnChangedAddListener((changes) => {
+  if ('repositories' in changes) {
+    repositoryIndex = null;
+  }
+});
+
+/**
+ * Normalize a repository URL for lookups (no trailing slash or .git suffix)
+ */
+function normalizeRepoUrl(url: string): string {
+  let normalized = url.trim();
+  while (normalized.endsWith('/')) {
+    normalized = normalized.slice(0, -1);
+  }
+  if (normalized.endsWith('.git')) {
+    normalized = normalized.slice(0, -4);
+  }
+  return normalized;
+}
+
+/**
+ * Find the local checkout of a repository: a configured mapping wins,
+ * otherwise the server's discovery index of local git checkouts is asked.
+ * Returns null if neither knows the repository.
+ */
+async function findRepositoryPath(repoUrl: string): Promise<string | null> {
+  if (!repositoryIndex) {
+    const result = await browserAPI.storageLocalGet('repositories');
+    const repositories = result.repositories || [];
+    repositoryIndex = new Map(
+      repositories.map((r): [string, Repository] => [normalizeRepoUrl(r.url), r])
+    );
+    console.log(`CursIt-Extension: Indexed ${repositoryIndex.size} configured repositories`);
+  }
+  const configured = repositoryIndex.get(normalizeRepoUrl(repoUrl));
+  if (configured) {
+    return configured.path;
+  }
+
+  console.log('CursIt-Extension: No configured mapping, asking the server to resolve', repoUrl);
+  const reply = await server.request('GET', `/repos/resolve?url=${encodeURIComponent(repoUrl)}`);
+  if (reply.status === 404) {
+    return null;
+  }
+  if (reply.status >= 400) {
+    throw new Error(`Server error: ${reply.status}`);
+  }
+  return reply.body.path;
+}
+
+/**
+ * Submit an automation request and follow the accepted job, calling onStage
+ * for every stage, until it finishes. Gives up (and cancels the job) after
+ * JOB_TIMEOUT_MS. Returns the reply itself if the request was not accepted.
+ */
+async function runJob(
+  path: string,
+  data: unknown,
+  onStage: (event: JobEvent) => Promise<void>
+): Promise<{ reply: ServerReply; job?: JobEvent }> {
+  let settle: (event: JobEvent) => void = () => undefined;
+  const finished = new Promise<JobEvent>((resolve) => (settle = resolve));
+  const reply = await server.request('POST', path, data, (event) => {
+    if (TERMINAL_STAGES.includes(event.stage)) {
+      settle(event);
+    } else {
+      onStage(event).catch(() => undefined);
+    }
+  });
+  if (reply.status !== 202) {
+    return { reply };
+  }
+
+  const { jobId } = reply.body;
+  console.log('CursIt-Extension: Request accepted as job', jobId);
+  let timer: ReturnType<typeof setTimeout> | undefined;
+  const timedOut = new Promise<null>((resolve) => {
+    timer = setTimeout(() => resolve(null), JOB_TIMEOUT_MS);
+  });
+  try {
+    const job = await Promise.race([finished, timedOut]);
+    if (!job) {
+      await server.request('DELETE', `/jobs/${jobId}`).catch(() => undefined);
+      throw new Error('Timed out waiting for Cursor');
+    }
+    return { reply, job };
+  } finally {
+    clearTimeout(timer);
+  }
+}
+
 browserAPI.runtimeOnMessageAddListener(async (request, sender, sendResponse) => {
   if (request.type === 'resolveComment' || request.type === 'executeInCursor') {
     try {
-      const result = await browserAPI.storageLocalGet('repositories');
-      console.log('CursIt-Extension: Searching for repository mapping...');
-      const repositories = result.repositories || [];
-      console.log('CursIt-Extension: Stored repositories:', JSON.stringify(repositories, null, 2));
-
       const requestRepoUrl = request.repoUrl;
       console.log('CursIt-Extension: Looking for URL from content script:', requestRepoUrl);
 
-      const repo = repositories.find((r) => {
-        let storedUrl = r.url;
-        console.log(`CursIt-Extension: Processing stored URL: '${storedUrl}'`);
-
-        if (storedUrl.endsWith('/')) {
-          storedUrl = storedUrl.slice(0, -1);
-        }
-        if (storedUrl.endsWith('.git')) {
-          storedUrl = storedUrl.slice(0, -4);
+      const problem = await checkServer();
+      if (problem) {
+        if (sender.tab?.id) {
+          await browserAPI.showPageError(sender.tab.id, problem);
         }
-        const isMatch = storedUrl === requestRepoUrl;
-        console.log(
-          `CursIt-Extension: Comparing normalized '${storedUrl}' with '${requestRepoUrl}'. Match: ${isMatch}`
-        );
-        return isMatch;
-      });
+        return;
+      }
+
+      const repoPath = await findRepositoryPath(requestRepoUrl);
 
-      if (repo) {
-        console.log('CursIt-Extension: Found matching repository:', JSON.stringify(repo, null, 2));
-        const absolutePath = `${repo.path}/${request.filePath}`;
+      if (repoPath) {
+        console.log('CursIt-Extension: Found repository at', repoPath);
+        const absolutePath = `${repoPath}/${request.filePath}`;
 
         // Determine if this is a simple file open (no comment/code) or a full operation
         const isSimpleFileOpen = !request.comment && !request.codeSnippet;
-        const endpoint = isSimpleFileOpen
-          ? 'http://localhost:5050/open-file'
-          : 'http://localhost:5050/open';
+        const endpoint = isSimpleFileOpen ? '/open-file' : '/open';
 
         const data = isSimpleFileOpen
           ? {
               // Simple file open - no comment, no code snippet, no clipboard/paste operations
               filePath: absolutePath,
-              workspacePath: repo.path,
+              workspacePath: repoPath,
             }
           : {
               // Full operation - open file AND paste to chat
               comment: request.comment,
               codeSnippet: request.codeSnippet,
               filePath: absolutePath,
-              workspacePath: repo.path,
+              workspacePath: repoPath,
               autoSubmit: request.autoSubmit || false,
             };
 
@@ -71,33 +225,65 @@ browserAPI.runtimeOnMessageAddListener(async (request, sender, sendResponse) =>
         console.log(JSON.stringify(data, null, 2));
 
         try {
-          const response = await fetch(endpoint, {
-            method: 'POST',
-            headers: {
-              'Content-Type': 'application/json',
-            },
-            body: JSON.stringify(data),
+          const { reply, job } = await runJob(endpoint, data, async (event) => {
+            const label = STAGE_LABELS[event.stage];
+            if (label && sender.tab?.id) {
+              await browserAPI.showPageInfo(sender.tab.id, label);
+            }
           });
 
-          if (!response.ok) {
-            const errorMsg = `Server error: ${response.status} ${response.statusText}`;
+          if (reply.status === 429) {
+            const retryAfter = reply.headers['retry-after'] || 'a few';
+            console.warn('CursIt-Extension: Server busy, retry after', retryAfter);
+            if (sender.tab?.id) {
+              await browserAPI.showPageWarning(
+                sender.tab.id,
+                `Cursor is busy with other requests. Try again in ${retryAfter} seconds.`
+              );
+            }
+            return;
+          }
+
+          if (!job) {
+            const errorMsg = `Server error: ${reply.status} ${reply.body?.error || ''}`;
             console.error('CursIt-Extension:', errorMsg);
 
             if (sender.tab?.id) {
               await browserAPI.showPageError(
                 sender.tab.id,
-                'Failed to send to Cursor. Is the server running?'
+                `Failed to send to Cursor: ${reply.body?.error || `server error ${reply.status}`}`
               );
             }
             throw new Error(errorMsg);
           }
 
-          console.log('CursIt-Extension: Request sent successfully.');
+          if (job.stage === 'cancelled') {
+            throw new Error('Request was cancelled');
+          }
+          if (job.stage === 'failed') {
+            console.error('CursIt-Extension: Job failed:', job.error, job.detail);
+            if (sender.tab?.id) {
+              await browserAPI.showPageError(
+                sender.tab.id,
+                `Failed to send to Cursor: ${job.error}${job.detail ? ` (${job.detail})` : ''}`
+              );
+            }
+            return;
+          }
+
+          console.log('CursIt-Extension: Request completed successfully.');
           if (sender.tab?.id) {
             const successMessage = isSimpleFileOpen
               ? 'File opened in Cursor!'
               : 'Comment sent to Cursor!';
-            await browserAPI.showPageSuccess(sender.tab.id, successMessage);
+            // The PR path was missing locally and the server opened another file
+            const resolvedFile = job.result?.['resolvedFile'];
+            await browserAPI.showPageSuccess(
+              sender.tab.id,
+              typeof resolvedFile === 'string'
+                ? `${successMessage} The PR file is missing locally, opened ${resolvedFile}.`
+                : successMessage
+            );
           }
         } catch (error) {
           console.error('CursIt-Extension: There was a problem sending the comment data:', error);
@@ -106,18 +292,18 @@ browserAPI.runtimeOnMessageAddListener(async (request, sender, sendResponse) =>
           if (sender.tab?.id) {
             await browserAPI.showPageError(
               sender.tab.id,
-              `Failed to send to Cursor: ${errorMessage}. Is the server running?`
+              `Failed to send to Cursor: ${errorMessage}`
             );
           }
         }
       } else {
-        const errorMsg = `No repository mapping found for ${requestRepoUrl}`;
+        const errorMsg = `No local checkout found for ${requestRepoUrl}`;
         console.error('CursIt-Extension:', errorMsg);
 
         if (sender.tab?.id) {
           await browserAPI.showPageError(
             sender.tab.id,
-            'Repository not configured. Click the extension icon to set it up.'
+            'Repository not found. Map it via the extension icon or clone it under REPO_ROOTS.'
           );
         }
       }
@@ -0,0 +1,262 @@
+/* ============================================================================
+ * Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+ * File: browser-extension/src/extension-scripts/utils/server-connection.ts
+ * Purpose: Server connection - one multiplexed WebSocket with HTTP fallback
+ *
+ * Copyright (c) 2025 Volodymyr Yepishev
+ *              All rights reserved.
+ *
+ * Licensed under GNU General Public License v3.0
+ * ============================================================================
+ */
+
+import { JobEvent, TERMINAL_STAGES } from '../../models/job-event.model';
+
+const CONNECT_TIMEOUT_MS = 2000;
+const RETRY_AFTER_MS = 60000;
+const PING_INTERVAL_MS = 20000;
+
+/**
+ * Reply to a request, whichever transport carried it
+ */
+export interface ServerReply {
+  status: number;
+  headers: Record<string, string>;
+  body: any;
+}
+
+interface PendingRequest {
+  resolve: (reply: ServerReply) => void;
+  reject: (error: Error) => void;
+  onEvent?: (event: JobEvent) => void;
+  jobId?: string;
+  seq: number;
+}
+
+/**
+ * Talks to the server over one long-lived WebSocket (asyncio serving mode),
+ * multiplexing requests by correlation id and receiving job progress and
+ * server notices on it. Requests made in the same tick go out as one frame.
+ * Falls back to plain HTTP while the socket is unavailable, e.g. when the
+ * server runs in threaded mode.
+ */
+export class ServerConnection {
+  private socket: WebSocket | null = null;
+  private connecting: Promise<WebSocket | null> | null = null;
+  private unavailableUntil = 0;
+  private nextId = 1;
+  private pending = new Map<string, PendingRequest>();
+  private outbox: object[] = [];
+  private pingTimer: ReturnType<typeof setInterval> | null = null;
+
+  constructor(private readonly serverUrl: string) {}
+
+  /**
+   * Make a request to a server route. If onEvent is given and the request
+   * is accepted as a job (202), the job's progress events are passed to it
+   * until one with a terminal stage.
+   */
+  async request(
+    method: string,
+    path: string,
+    body?: unknown,
+    onEvent?: (event: JobEvent) => void
+  ): Promise<ServerReply> {
+    const socket = await this.connect();
+    if (!socket) {
+      return this.requestOverHttp(method, path, body, onEvent);
+    }
+
+    const id = String(this.nextId++);
+    const reply = new Promise<ServerReply>((resolve, reject) => {
+      this.pending.set(id, { resolve, reject, onEvent, seq: 0 });
+    });
+    this.enqueue({ id, method, path, body, follow: !!onEvent });
+    return reply;
+  }
+
+  private async requestOverHttp(
+    method: string,
+    path: string,
+    body?: unknown,
+    onEvent?: (event: JobEvent) => void
+  ): Promise<ServerReply> {
+    const response = await fetch(`${this.serverUrl}${path}`, {
+      method,
+      headers: body === undefined ? undefined : { 'Content-Type': 'application/json' },
+      body: body === undefined ? undefined : JSON.stringify(body),
+    });
+    const headers: Record<string, string> = {};
+    response.headers.forEach((value, name) => (headers[name] = value));
+    const text = await response.text();
+    let parsed: any = text;
+    try {
+      parsed = text ? JSON.parse(text) : null;
+    } catch {
+      // Not JSON: keep the text
+    }
+
+    if (onEvent && response.status === 202 && parsed?.jobId) {
+      this.followOverHttp(parsed.jobId, 0, onEvent);
+    }
+    return { status: response.status, headers, body: parsed };
+  }
+
+  /**
+   * Follow a job through its Server-Sent Events stream, resuming after seq
+   */
+  private followOverHttp(jobId: string, seq: number, onEvent: (event: JobEvent) => void): void {
+    const fail = (error: unknown) =>
+      onEvent({
+        seq: seq + 1,
+        stage: 'failed',
+        at: Date.now() / 1000,
+        elapsed: 0,
+        error: error instanceof Error ? error.message : 'Progress stream failed',
+      });
+
+    (async () => {
+      const response = await fetch(`${this.serverUrl}/jobs/${jobId}/events`, {
+        headers: { Accept: 'text/event-stream', 'Last-Event-ID': String(seq) },
+      });
+      if (!response.ok || !response.body) {
+        throw new Error(`Server error: ${response.status} ${response.statusText}`);
+      }
+
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+      let buffer = '';
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) {
+          break;
+        }
+        buffer += value;
+        let boundary: number;
+        while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+          const block = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+          const data = block
+            .split('\n')
+            .filter((line) => line.startsWith('data: '))
+            .map((line) => line.slice(6))
+            .join('\n');
+          if (!data) {
+            continue; // heartbeat
+          }
+          const event: JobEvent = JSON.parse(data);
+          seq = event.seq;
+          onEvent(event);
+          if (TERMINAL_STAGES.includes(event.stage)) {
+            reader.cancel();
+            return;
+          }
+        }
+      }
+      throw new Error('Progress stream ended unexpectedly');
+    })().catch(fail);
+  }
+
+  private connect(): Promise<WebSocket | null> {
+    if (this.socket?.readyState === WebSocket.OPEN) {
+      return Promise.resolve(this.socket);
+    }
+    if (Date.now() < this.unavailableUntil) {
+      return Promise.resolve(null);
+    }
+    if (!this.connecting) {
+      this.connecting = new Promise<WebSocket | null>((resolve) => {
+        const socket = new WebSocket(`${this.serverUrl.replace(/^http/, 'ws')}/ws`);
+        const timer = setTimeout(() => socket.close(), CONNECT_TIMEOUT_MS);
+
+        socket.onopen = () => {
+          clearTimeout(timer);
+          this.socket = socket;
+          console.log('CursIt-Extension: Connected to the server over WebSocket');
+          resolve(socket);
+        };
+        socket.onmessage = (message) => this.handleFrame(JSON.parse(message.data));
+        socket.onclose = () => {
+          clearTimeout(timer);
+          if (this.socket === socket) {
+            this.handleClose();
+          } else {
+            // Never opened: the server is down or serves HTTP only
+            this.unavailableUntil = Date.now() + RETRY_AFTER_MS;
+            resolve(null);
+          }
+        };
+      }).finally(() => (this.connecting = null));
+    }
+    return this.connecting;
+  }
+
+  private enqueue(frame: object): void {
+    this.outbox.push(frame);
+    if (this.outbox.length === 1) {
+      setTimeout(() => {
+        const frames = this.outbox;
+        this.outbox = [];
+        if (this.socket?.readyState === WebSocket.OPEN) {
+          this.socket.send(JSON.stringify(frames.length === 1 ? frames[0] : frames));
+        }
+      }, 0);
+    }
+    this.updatePing();
+  }
+
+  private handleFrame(frame: any): void {
+    if (frame.type === 'notice') {
+      console.log(`CursIt-Extension: Server notice (${frame.kind}): ${frame.message}`);
+      if (frame.kind === 'shutdown') {
+        this.socket?.close();
+      }
+      return;
+    }
+
+    const request = frame.id !== undefined ? this.pending.get(frame.id) : undefined;
+    if (!request) {
+      return;
+    }
+    if (frame.type === 'response') {
+      request.resolve({ status: frame.status, headers: frame.headers || {}, body: frame.body });
+      request.jobId = frame.status === 202 ? frame.body?.jobId : undefined;
+      if (!request.onEvent || !request.jobId) {
+        this.pending.delete(frame.id);
+      }
+    } else if (frame.type === 'event') {
+      request.seq = frame.event.seq;
+      request.onEvent?.(frame.event);
+    } else if (frame.type === 'done') {
+      this.pending.delete(frame.id);
+    }
+    this.updatePing();
+  }
+
+  private handleClose(): void {
+    console.warn('CursIt-Extension: WebSocket to the server closed');
+    this.socket = null;
+    const pending = [...this.pending.values()];
+    this.pending.clear();
+    this.updatePing();
+    for (const request of pending) {
+      if (request.jobId && request.onEvent) {
+        // Already accepted: keep following it over HTTP
+        this.followOverHttp(request.jobId, request.seq, request.onEvent);
+      } else {
+        request.reject(new Error('Connection to the server was lost'));
+      }
+    }
+  }
+
+  /**
+   * Ping while requests are in flight, so the service worker and socket stay alive
+   */
+  private updatePing(): void {
+    if (this.pending.size > 0 && !this.pingTimer) {
+      this.pingTimer = setInterval(() => this.enqueue({ type: 'ping' }), PING_INTERVAL_MS);
+    } else if (this.pending.size === 0 && this.pingTimer) {
+      clearInterval(this.pingTimer);
+      this.pingTimer = null;
+    }
+  }
+}
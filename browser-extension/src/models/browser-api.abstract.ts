@@ -29,6 +29,11 @@ export abstract class BrowserAPI {
 
   abstract storageLocalSet(items: Partial<StorageData>): Promise<void>;
 
+  /**
+   * Storage API - Called with the changed keys whenever local storage changes
+   */
+  abstract storageOnChangedAddListener(callback: (changes: Partial<StorageData>) => void): void;
+
   /**
    * Runtime API - Messaging
    */
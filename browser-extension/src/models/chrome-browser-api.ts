@@ -38,6 +38,19 @@ export class ChromeBrowserAPI extends BrowserAPI {
     });
   }
 
+  storageOnChangedAddListener(callback: (changes: Partial<StorageData>) => void): void {
+    chrome.storage.onChanged.addListener((changes, areaName) => {
+      if (areaName !== 'local') {
+        return;
+      }
+      const values: Record<string, unknown> = {};
+      for (const key of Object.keys(changes)) {
+        values[key] = changes[key].newValue;
+      }
+      callback(values as Partial<StorageData>);
+    });
+  }
+
   runtimeSendMessage(message: ContentScriptMessage | BackgroundToContentMessage): Promise<void> {
     return new Promise((resolve) => {
       chrome.runtime.sendMessage(message, () => {
@@ -33,6 +33,19 @@ export class FirefoxBrowserAPI extends BrowserAPI {
     return browser.storage.local.set(items);
   }
 
+  storageOnChangedAddListener(callback: (changes: Partial<StorageData>) => void): void {
+    browser.storage.onChanged.addListener((changes, areaName) => {
+      if (areaName !== 'local') {
+        return;
+      }
+      const values: Record<string, unknown> = {};
+      for (const key of Object.keys(changes)) {
+        values[key] = changes[key].newValue;
+      }
+      callback(values as Partial<StorageData>);
+    });
+  }
+
   runtimeSendMessage(message: ContentScriptMessage | BackgroundToContentMessage): Promise<void> {
     return browser.runtime.sendMessage(message).then(() => undefined);
   }
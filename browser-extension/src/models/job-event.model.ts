@@ -0,0 +1,29 @@
+/* ============================================================================
+ * Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+ * File: browser-extension/src/models/job-event.model.ts
+ * Purpose: Server automation job progress event data model
+ *
+ * Copyright (c) 2025 Volodymyr Yepishev
+ *              All rights reserved.
+ *
+ * Licensed under GNU General Public License v3.0
+ * ============================================================================
+ */
+
+/**
+ * Stages that end a job's progress stream
+ */
+export const TERMINAL_STAGES = ['succeeded', 'failed', 'cancelled'];
+
+/**
+ * Stage event streamed by GET /jobs/<id>/events
+ */
+export interface JobEvent {
+  seq: number;
+  stage: string;
+  at: number;
+  elapsed: number;
+  result?: Record<string, unknown>;
+  error?: string;
+  detail?: string;
+}
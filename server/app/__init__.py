@@ -42,8 +42,13 @@ def create_app(config_class=Config):
     setup_logging()
     
     # Register blueprints
-    from app.routes import open_bp
+    from app.routes import open_bp, jobs_bp, metrics_bp, messages_bp, repos_bp, health_bp
     app.register_blueprint(open_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(messages_bp)
+    app.register_blueprint(repos_bp)
+    app.register_blueprint(health_bp)
     
     return app
 
@@ -0,0 +1,468 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/asgi.py
+# Purpose: ASGI application for the asyncio serving mode
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+ASGI entry point for the Cursor HTTP Server.
+
+In the asyncio serving mode (``SERVER_MODE=asyncio``) an ASGI server such as
+uvicorn runs this application. Job progress streams are served natively as
+coroutines, so an idle follower costs no thread. Every other route is handed
+to the Flask application on a small bounded executor; those handlers only
+validate and enqueue, so they return immediately and the executor stays free
+while automation runs on its own event loop.
+
+The extension can also keep one WebSocket open at ``/ws`` instead of making
+an HTTP request per click. Each request frame carries a correlation id and
+names an HTTP route, which runs through the Flask application exactly as over
+HTTP; accepted jobs are followed, and their progress, completion and server
+notices are pushed on the same socket::
+
+    client -> server  {"id": "7", "method": "POST", "path": "/open", "body": {...}, "headers": {...}}
+    server -> client  {"id": "7", "type": "response", "status": 202, "headers": {...}, "body": {"jobId": "..."}}
+    server -> client  {"id": "7", "type": "event", "event": {"seq": 1, "stage": "queued", ...}}
+    server -> client  {"id": "7", "type": "done", "job": {...}}   (as GET /jobs/<id>)
+    server -> client  {"type": "notice", "kind": "shutdown", "level": "warning", "message": "..."}
+
+A frame may also be a JSON array of requests, which run in one pass on the
+WSGI executor. ``"follow": false`` skips following an accepted job, and
+``{"type": "ping"}`` is answered with ``{"type": "pong"}``.
+
+Usage:
+    uvicorn app.asgi:application --host 127.0.0.1 --port 5050
+"""
+import asyncio
+import concurrent.futures
+import io
+import json
+import re
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+from app import create_app
+from app.config import Config
+from app.utils.logger import get_logger
+from app.services.async_runtime import get_automation_loop
+from app.services.job_queue import get_automation_queue, sse_message
+from app.services.workspace_pool import get_workspace_pool
+from app.services.repo_index import get_repo_index
+from app.services.companion_channel import get_companion_channel
+from app.services.health import get_health_monitor
+from app.services.notices import get_notice_board
+
+logger = get_logger(__name__)
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+_JOB_EVENTS_PATH = re.compile(r'^/jobs/(?P<job_id>[^/]+)/events$')
+WEBSOCKET_PATH = '/ws'
+HEALTH_PATH = '/health'
+WEBSOCKET_PROTOCOL_VERSION = 1
+
+
+class AsgiApp:
+    """ASGI application wrapping the Flask app."""
+
+    def __init__(self, flask_app=None, wsgi_workers: int = None):
+        self.flask_app = flask_app or create_app()
+        self.wsgi_workers = wsgi_workers or Config.ASGI_WSGI_WORKERS
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.wsgi_workers,
+            thread_name_prefix='asgi-wsgi'
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] == 'websocket':
+            await self._serve_websocket(scope, receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        if scope['path'] == HEALTH_PATH and scope['method'] == 'GET':
+            # Answered on the loop, so it does not wait behind busy WSGI workers
+            await _send_json(send, 200, get_health_monitor().snapshot())
+            return
+
+        match = _JOB_EVENTS_PATH.match(scope['path'])
+        if match and scope['method'] == 'GET':
+            job = get_automation_queue().get(match.group('job_id'))
+            if job is not None:
+                await self._stream_job_events(job, scope, receive, send)
+                return
+
+        await self._call_wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Start the automation loop and queue worker before the first request
+                get_automation_loop()
+                get_automation_queue()
+                if Config.WORKSPACE_POOL_ENABLED:
+                    get_workspace_pool().start()
+                get_repo_index().start()
+                if Config.COMPANION_ENABLED:
+                    get_companion_channel().start()
+                get_health_monitor()
+                logger.info("ASGI application ready (%s WSGI worker(s))", self.wsgi_workers)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                get_notice_board().publish('shutdown', "CursIt server is shutting down", level='warning')
+                get_workspace_pool().stop()
+                get_repo_index().stop()
+                get_companion_channel().stop()
+                get_health_monitor().stop()
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _stream_job_events(self, job, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Stream a job's stage events as Server-Sent Events.
+
+        Mirrors ``GET /jobs/<job_id>/events`` of the Flask routes, but waits
+        for events as a coroutine.
+        """
+        try:
+            seen = int(_header(scope, b'last-event-id') or 0)
+        except ValueError:
+            seen = 0
+
+        disconnected = asyncio.Event()
+
+        async def watch_disconnect():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+            disconnected.set()
+
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream; charset=utf-8'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),
+                ],
+            })
+            while not disconnected.is_set():
+                events = await job.wait_events(seen, timeout=Config.SSE_HEARTBEAT_INTERVAL)
+                if not events:
+                    if job.finished:
+                        break
+                    # Comment line keeps proxies and the client from timing out
+                    await send({'type': 'http.response.body', 'body': b': heartbeat\n\n', 'more_body': True})
+                    continue
+                for event in events:
+                    seen = event['seq']
+                    await send({'type': 'http.response.body', 'body': sse_message(event).encode('utf-8'), 'more_body': True})
+                if job.finished and seen >= len(job.events):
+                    break
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            watcher.cancel()
+
+    async def _serve_websocket(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Accept the extension's WebSocket and serve it until it closes."""
+        if (await receive())['type'] != 'websocket.connect':
+            return
+        origin = _header(scope, b'origin')
+        if scope['path'] != WEBSOCKET_PATH or (origin and not origin.startswith(Config.WS_ALLOWED_ORIGINS)):
+            # Web pages may open WebSockets to localhost; only the extension is served
+            logger.warning("WebSocket to %s from %s rejected", scope['path'], origin or 'no origin')
+            await send({'type': 'websocket.close', 'code': 1008})
+            return
+        await send({'type': 'websocket.accept'})
+        await _WebSocketSession(self, scope, send).run(receive)
+
+    async def _call_wsgi(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run the Flask application for one request on the WSGI executor."""
+        limit = Config.MAX_CONTENT_LENGTH
+        try:
+            declared = int(_header(scope, b'content-length') or 0)
+        except ValueError:
+            declared = 0
+        if limit is not None and declared > limit:
+            await _send_too_large(send)
+            return
+
+        # Buffer straight into the stream Flask will read, without a joined copy
+        body = io.BytesIO()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body.write(message.get('body', b''))
+            if limit is not None and body.tell() > limit:
+                # Chunked body that outgrew the limit: stop buffering it
+                await _send_too_large(send)
+                return
+            if not message.get('more_body', False):
+                break
+
+        body.seek(0)
+        environ = _build_environ(scope, body)
+        loop = asyncio.get_running_loop()
+        status, headers, chunks = await loop.run_in_executor(self.executor, self._run_wsgi, environ)
+
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b''.join(chunks), 'more_body': False})
+
+    def _run_wsgi(self, environ: Dict[str, Any]) -> Tuple[int, List[Tuple[bytes, bytes]], List[bytes]]:
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers
+            ]
+
+        result = self.flask_app(environ, start_response)
+        try:
+            chunks = list(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return response['status'], response['headers'], chunks
+
+
+class _WebSocketSession:
+    """One extension WebSocket: multiplexed requests, followed jobs and notices."""
+
+    def __init__(self, app: AsgiApp, scope: Scope, send: Send):
+        self.app = app
+        self.scope = scope
+        self._send = send
+        self._send_lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+        self._closed = False
+
+    async def run(self, receive: Receive) -> None:
+        """Handle frames until the client disconnects."""
+        loop = asyncio.get_running_loop()
+        notices: asyncio.Queue = asyncio.Queue()
+
+        def on_notice(notice):
+            loop.call_soon_threadsafe(notices.put_nowait, notice)
+
+        board = get_notice_board()
+        board.add_listener(on_notice)
+        self._spawn(self._push_notices(notices))
+        await self.send({"type": "hello", "version": WEBSOCKET_PROTOCOL_VERSION})
+        try:
+            while True:
+                message = await receive()
+                if message['type'] == 'websocket.disconnect':
+                    break
+                if message['type'] != 'websocket.receive':
+                    continue
+                text = message.get('text')
+                if text is None:
+                    text = (message.get('bytes') or b'').decode('utf-8', 'replace')
+                self._spawn(self._handle_frame(text))
+        finally:
+            self._closed = True
+            board.remove_listener(on_notice)
+            for task in list(self._tasks):
+                task.cancel()
+
+    async def send(self, frame: Dict[str, Any]) -> None:
+        """Send a frame unless the socket is closed (frames are never interleaved)."""
+        async with self._send_lock:
+            if self._closed:
+                return
+            try:
+                await self._send({'type': 'websocket.send', 'text': json.dumps(frame)})
+            except Exception as e:
+                self._closed = True
+                logger.info("WebSocket send failed, closing: %s", e)
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _push_notices(self, notices: asyncio.Queue) -> None:
+        while True:
+            await self.send(await notices.get())
+
+    async def _handle_frame(self, text: str) -> None:
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            await self.send({"type": "error", "error": "Invalid JSON"})
+            return
+        batch = parsed if isinstance(parsed, list) else [parsed]
+
+        prepared: List[Tuple[Any, Union[Dict[str, Any], Tuple[int, Dict[str, Any]]]]] = []
+        for request in batch:
+            if isinstance(request, dict) and request.get('type') == 'ping':
+                await self.send({"type": "pong", "id": request.get('id')})
+                continue
+            prepared.append((request, self._build_request(request)))
+
+        # Every routed request of the frame in one executor pass
+        environs = [target for _, target in prepared if not isinstance(target, tuple)]
+        loop = asyncio.get_running_loop()
+        responses = iter(await loop.run_in_executor(
+            self.app.executor, lambda: [self.app._run_wsgi(environ) for environ in environs]
+        ))
+
+        for request, target in prepared:
+            request_id = request.get('id') if isinstance(request, dict) else None
+            if isinstance(target, tuple):
+                status, headers, body = target[0], {}, target[1]
+            else:
+                status, raw_headers, chunks = next(responses)
+                headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in raw_headers}
+                body = _json_body(b''.join(chunks))
+            await self.send({"id": request_id, "type": "response", "status": status, "headers": headers, "body": body})
+
+            job_id = body.get('jobId') if isinstance(body, dict) and status == 202 else None
+            if job_id and request.get('follow', True):
+                self._spawn(self._follow(request_id, job_id))
+
+    def _build_request(self, request: Any) -> Union[Dict[str, Any], Tuple[int, Dict[str, Any]]]:
+        """
+        Build the WSGI environ for a request frame.
+
+        Returns:
+            The environ, or (status, error body) if the frame is not a valid request
+        """
+        if not isinstance(request, dict):
+            return 400, {"error": "Request must be a JSON object"}
+        path = request.get('path')
+        if not isinstance(path, str) or not path.startswith('/'):
+            return 400, {"error": "path is required"}
+        path, _, query = path.partition('?')
+        if _JOB_EVENTS_PATH.match(path) or path == WEBSOCKET_PATH:
+            return 400, {"error": "Streams are not available over the socket; accepted jobs are followed"}
+
+        body = b'' if request.get('body') is None else json.dumps(request['body']).encode('utf-8')
+        limit = Config.MAX_CONTENT_LENGTH
+        if limit is not None and len(body) > limit:
+            return 413, {"error": "Request body too large", "maxBytes": limit}
+        try:
+            headers = [(b'content-type', b'application/json')] + [
+                (str(name).lower().encode('latin-1'), str(value).encode('latin-1'))
+                for name, value in (request.get('headers') or {}).items()
+            ]
+            query_string = query.encode('latin-1')
+        except (AttributeError, UnicodeEncodeError):
+            return 400, {"error": "Invalid headers or query string"}
+
+        scope = {
+            'method': str(request.get('method') or 'GET').upper(),
+            'path': path,
+            'query_string': query_string,
+            'headers': headers,
+            'root_path': self.scope.get('root_path', ''),
+            'http_version': '1.1',
+            'scheme': 'http',
+            'server': self.scope.get('server'),
+            'client': self.scope.get('client'),
+        }
+        return _build_environ(scope, io.BytesIO(body))
+
+    async def _follow(self, request_id: Any, job_id: str) -> None:
+        job = get_automation_queue().get(job_id)
+        if job is None:
+            return
+        seen = 0
+        while True:
+            events = await job.wait_events(seen, timeout=Config.SSE_HEARTBEAT_INTERVAL)
+            for event in events:
+                seen = event['seq']
+                await self.send({"id": request_id, "type": "event", "event": event})
+            if job.finished and seen >= len(job.events):
+                break
+        await self.send({"id": request_id, "type": "done", "job": job.to_dict()})
+
+
+def _json_body(body: bytes) -> Any:
+    try:
+        return json.loads(body) if body else None
+    except ValueError:
+        return body.decode('utf-8', 'replace')
+
+
+async def _send_too_large(send: Send) -> None:
+    await _send_json(send, 413, {"error": "Request body too large", "maxBytes": Config.MAX_CONTENT_LENGTH})
+
+
+async def _send_json(send: Send, status: int, payload: Any) -> None:
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode('latin-1'))],
+    })
+    await send({'type': 'http.response.body', 'body': body, 'more_body': False})
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get('headers', []):
+        if key.lower() == name:
+            return value.decode('latin-1')
+    return None
+
+
+def _build_environ(scope: Scope, body: io.BytesIO) -> Dict[str, Any]:
+    """
+    Build a WSGI environ for an ASGI HTTP scope.
+
+    Args:
+        scope: ASGI HTTP connection scope
+        body: Complete request body, positioned at its start
+
+    Returns:
+        Dict[str, Any]: WSGI environ
+    """
+    server_name, server_port = scope.get('server') or (Config.HOST, Config.PORT)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(body.getbuffer().nbytes),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        key = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if key == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+            continue
+        if key == 'CONTENT_LENGTH':
+            continue
+        key = f'HTTP_{key}'
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+application = AsgiApp()
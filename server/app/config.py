@@ -32,11 +32,24 @@ class Config:
     
     # Cursor settings
     CURSOR_EXECUTABLE_NAME = os.environ.get('CURSOR_EXECUTABLE', 'cursor')
+    CURSOR_PROCESS_NAME = os.environ.get('CURSOR_PROCESS_NAME', 'Cursor.exe')
+    PROCESS_SCAN_TTL = float(os.environ.get('PROCESS_SCAN_TTL', 2.0))  # Cache lifetime of the process-table scan
+    
+    # Request settings (Flask rejects larger bodies with 413 before reading them)
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_REQUEST_BYTES', 8 * 1024 * 1024))
     
     # File settings
-    TMP_MESSAGE_FILENAME = 'cursor_received_message.txt'
+    MESSAGE_STORE_DIR = os.environ.get('MESSAGE_STORE_DIR', os.path.join(tempfile.gettempdir(), 'cursit_messages'))
+    MESSAGE_STORE_MAX_ENTRIES = int(os.environ.get('MESSAGE_STORE_MAX_ENTRIES', 200))  # Oldest messages are evicted beyond this
+    MESSAGE_STORE_MAX_BYTES = int(os.environ.get('MESSAGE_STORE_MAX_BYTES', 64 * 1024 * 1024))  # ...or beyond this total size
+    MESSAGE_CACHE_BYTES = int(os.environ.get('MESSAGE_CACHE_BYTES', 16 * 1024 * 1024))  # Recent messages kept in memory
+    MESSAGE_WRITE_CHUNK = 256 * 1024  # Characters encoded per write when saving a message
     LOG_FILENAME = 'cursor_listener.log'
     LOG_FILE_PATH = os.path.join(tempfile.gettempdir(), LOG_FILENAME)
+    LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 5 * 1024 * 1024))  # Rotate the log file at this size
+    LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 3))  # Rotated files to keep
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))  # Records buffered for the writer; overflow is dropped
+    LOG_PAYLOAD_MAX_CHARS = int(os.environ.get('LOG_PAYLOAD_MAX_CHARS', 200))  # Longer payloads are truncated and hashed
     
     # Timeout settings (in seconds)
     CURSOR_STARTUP_TIMEOUT = float(os.environ.get('CURSOR_STARTUP_TIMEOUT', 15.0))
@@ -48,12 +61,147 @@ class Config:
     POLL_INTERVAL = 0.2  # 200ms
     FILE_POLL_INTERVAL = 0.1  # 100ms
     REQUIRED_CONSECUTIVE_CHECKS = 3  # Number of consecutive successful checks for ready state
+    # How long a new Cursor window must stay up before it counts as ready
+    READY_STABLE_TIME = POLL_INTERVAL * (REQUIRED_CONSECUTIVE_CHECKS - 1)
+    
+    # Window monitor settings
+    WINDOW_EVENTS_ENABLED = os.environ.get('WINDOW_EVENTS_ENABLED', 'true').lower() != 'false'
+    WINDOW_IDLE_POLL_INTERVAL = 1.0  # Shared poll rate when nobody is waiting
+    
+    # Health state refreshed in the background for GET /health
+    HEALTH_REFRESH_INTERVAL = float(os.environ.get('HEALTH_REFRESH_INTERVAL', 5.0))
+    
+    # Companion channel: editor-side companions subscribe over loopback TCP and
+    # insert messages themselves; clipboard and keystrokes are the fallback
+    COMPANION_ENABLED = os.environ.get('COMPANION_ENABLED', 'true').lower() != 'false'
+    COMPANION_HOST = '127.0.0.1'
+    COMPANION_PORT = int(os.environ.get('COMPANION_PORT', 5051))  # 0 = any free port (published in the info file)
+    COMPANION_INFO_PATH = os.environ.get('COMPANION_INFO_PATH', os.path.join(tempfile.gettempdir(), 'cursit_companion.json'))
+    COMPANION_ACK_TIMEOUT = float(os.environ.get('COMPANION_ACK_TIMEOUT', 3.0))  # Before falling back to keystrokes
+    COMPANION_HELLO_TIMEOUT = 5.0  # For a new connection to authenticate
+    COMPANION_INLINE_MAX_BYTES = 64 * 1024  # Larger messages are passed as their message store file
+    
+    # Clipboard settings
+    CLIPBOARD_BACKEND = os.environ.get('CLIPBOARD_BACKEND', 'auto').lower()  # auto, win32, pyperclip or fake
+    CLIPBOARD_RESTORE = os.environ.get('CLIPBOARD_RESTORE', 'true').lower() != 'false'  # Put the user's clipboard back after pasting
+    CLIPBOARD_RESTORE_DELAY = float(os.environ.get('CLIPBOARD_RESTORE_DELAY', 1.0))  # Seconds after the paste, so Cursor has read it
+    CLIPBOARD_OPEN_ATTEMPTS = 5  # Tries to open a clipboard held by another application
+    CLIPBOARD_SNAPSHOT_MAX_BYTES = 16 * 1024 * 1024  # Largest previous contents saved for restoring
+    
+    # Keystrokes: named sequences in VS Code keybinding syntax (chords of '+'-joined
+    # keys separated by spaces, optional pauses like 50ms), overridable with
+    # KEYS_<NAME> to follow custom Cursor keybindings
+    KEYBOARD_BACKEND = os.environ.get('KEYBOARD_BACKEND', 'auto').lower()  # auto, sendinput, keybd_event or recording
+    KEY_CHORD_GAP = float(os.environ.get('KEY_CHORD_GAP', 0.02))  # Between the chords of a sequence
+    KEY_SEQUENCE_DEFAULTS = {
+        'dismiss': 'esc',  # Close modals and menus before opening the chat
+        'open_chat': 'ctrl+l',
+        'paste': 'ctrl+v',
+        'submit': 'enter',
+    }
+    KEY_SEQUENCES = {name: os.environ.get(f'KEYS_{name.upper()}', spec) for name, spec in KEY_SEQUENCE_DEFAULTS.items()}
+    
+    # Serving mode: 'threaded' (Flask dev server) or 'asyncio' (ASGI via uvicorn)
+    SERVER_MODE = os.environ.get('SERVER_MODE', 'threaded').lower()
+    BLOCKING_EXECUTOR_WORKERS = int(os.environ.get('BLOCKING_EXECUTOR_WORKERS', 4))  # Threads for blocking win32/clipboard calls
+    ASGI_WSGI_WORKERS = int(os.environ.get('ASGI_WSGI_WORKERS', 8))  # Threads running Flask views in asyncio mode
+    # Origins allowed to open the /ws WebSocket (asyncio mode); connections without an Origin are allowed too
+    WS_ALLOWED_ORIGINS = tuple(
+        os.environ.get('WS_ALLOWED_ORIGINS', 'chrome-extension://,moz-extension://,safari-web-extension://').split(',')
+    )
+    
+    # Workspace pool: pre-open the most used workspaces so requests take the hot path
+    WORKSPACE_POOL_ENABLED = os.environ.get('WORKSPACE_POOL_ENABLED', 'true').lower() != 'false'
+    WORKSPACE_POOL_SIZE = int(os.environ.get('WORKSPACE_POOL_SIZE', 3))  # Top-N workspaces kept open
+    WORKSPACE_POOL_MAX_WINDOWS = int(os.environ.get('WORKSPACE_POOL_MAX_WINDOWS', 4))  # Never pre-open beyond this many Cursor windows
+    WORKSPACE_POOL_MAX_MEMORY_MB = int(os.environ.get('WORKSPACE_POOL_MAX_MEMORY_MB', 0))  # ...or this much Cursor RSS (0 = no limit, needs psutil)
+    WORKSPACE_POOL_HALF_LIFE = float(os.environ.get('WORKSPACE_POOL_HALF_LIFE', 7 * 24 * 3600))  # Usage score half-life in seconds
+    WORKSPACE_POOL_IDLE_SECONDS = float(os.environ.get('WORKSPACE_POOL_IDLE_SECONDS', 60.0))  # Idle time before pre-warming again
+    WORKSPACE_POOL_CHECK_INTERVAL = 30.0
+    WORKSPACE_POOL_STARTUP_DELAY = 5.0
+    WORKSPACE_HISTORY_MAX = 50  # Workspaces remembered
+    WORKSPACE_HISTORY_PATH = os.environ.get('WORKSPACE_HISTORY_PATH', os.path.join(tempfile.gettempdir(), 'cursit_workspaces.json'))
+    
+    # Repository discovery: git checkouts under these roots are indexed by remote URL
+    REPO_ROOTS = [
+        os.path.expanduser(root.strip())
+        for root in os.environ.get('REPO_ROOTS', os.pathsep.join(
+            ['~/source/repos', '~/repos', '~/projects', '~/src', '~/git']
+        )).split(os.pathsep)
+        if root.strip()
+    ]
+    REPO_SCAN_MAX_DEPTH = int(os.environ.get('REPO_SCAN_MAX_DEPTH', 3))  # Directory levels below a root searched for checkouts
+    REPO_SCAN_INTERVAL = float(os.environ.get('REPO_SCAN_INTERVAL', 300.0))  # Seconds between incremental rescans
+    REPO_SCAN_MIN_INTERVAL = 5.0  # Lookup misses trigger a rescan at most this often
+    REPO_SCAN_SKIP = {'node_modules', 'bin', 'obj', 'build', 'dist', 'target', 'venv', '__pycache__'}
+    REPO_INDEX_PATH = os.environ.get('REPO_INDEX_PATH', os.path.join(tempfile.gettempdir(), 'cursit_repo_index.json'))
+    
+    # Workspace file index: resolves PR paths missing locally (stale branch, rename, subfolder checkout)
+    FILE_INDEX_MAX_WORKSPACES = int(os.environ.get('FILE_INDEX_MAX_WORKSPACES', 8))  # Indexes kept, least recently used dropped
+    FILE_INDEX_REFRESH_SECONDS = float(os.environ.get('FILE_INDEX_REFRESH_SECONDS', 30.0))  # Background refresh when older than this
+    FILE_INDEX_BUILD_WAIT = float(os.environ.get('FILE_INDEX_BUILD_WAIT', 3.0))  # Max wait for a first build when a path is missing
+    FILE_INDEX_MIN_REFRESH = 2.0  # A miss refreshes the index in the background when it is at least this old
+    FILE_INDEX_MISS_WAIT = float(os.environ.get('FILE_INDEX_MISS_WAIT', 0.25))  # Max wait for that refresh before answering
+    FILE_INDEX_SKIP = {'.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv', '.tox', '.mypy_cache', '.pytest_cache'}
+    
+    # Snippet locator: open files at the line the PR code snippet is on
+    SNIPPET_LOCATOR_ENABLED = os.environ.get('SNIPPET_LOCATOR_ENABLED', 'true').lower() != 'false'
+    SNIPPET_MIN_SCORE = float(os.environ.get('SNIPPET_MIN_SCORE', 0.6))  # Fraction of snippet lines that must be found together
+    SNIPPET_DRIFT_LINES = int(os.environ.get('SNIPPET_DRIFT_LINES', 5))  # Slack around the expected snippet position
+    SNIPPET_MAX_LINES = 200  # Longer snippets are matched by their first lines
+    SNIPPET_ANCHORS = 3  # Longest snippet lines searched for
+    SNIPPET_MIN_ANCHOR_CHARS = 6  # Shorter lines (braces, "else:") are too common to anchor on
+    SNIPPET_MAX_CANDIDATES = 50  # Anchor hits compared per anchor
+    SNIPPET_INDEX_CACHE_SIZE = 32  # Files whose line-offset index is kept
+    SNIPPET_INDEX_BLOCK = 64 * 1024  # Bytes per line-offset index entry
+    
+    # Automation queue settings
+    JOB_QUEUE_MAX_SIZE = int(os.environ.get('JOB_QUEUE_MAX_SIZE', 8))
+    JOB_CONCURRENCY = int(os.environ.get('JOB_CONCURRENCY', 4))  # Jobs run at once; desktop stages still take turns
+    JOB_RETENTION_SECONDS = float(os.environ.get('JOB_RETENTION_SECONDS', 600.0))  # Keep finished jobs for status lookups
+    DEDUP_WINDOW_SECONDS = float(os.environ.get('DEDUP_WINDOW_SECONDS', 10.0))  # Identical requests within this of a success reuse its job
+    JOB_RETRY_AFTER = 5.0  # Initial estimate of a job's run time for Retry-After
+    JOB_PRIORITY_OPEN_FILE = 0  # Lower runs first
+    JOB_PRIORITY_PASTE = 1
+    JOB_PRIORITY_PREWARM = 10  # Pre-warming only runs when no request is waiting
+    SSE_HEARTBEAT_INTERVAL = 15.0  # Seconds between keep-alive comments on progress streams
     
     # Timing settings (in seconds)
-    WINDOW_SETTLE_TIME = 0.3
-    UI_SETTLE_TIME = 0.3
+    WINDOW_SETTLE_TIME = float(os.environ.get('WINDOW_SETTLE_TIME', 0.3))  # Ceiling for the post-focus settle
+    UI_SETTLE_TIME = float(os.environ.get('UI_SETTLE_TIME', 0.3))  # Ceiling for the post-paste settle
     FALLBACK_DELAY = 0.5
 
+    # Adaptive timing model settings
+    TIMING_PERCENTILE = float(os.environ.get('TIMING_PERCENTILE', 90.0))  # Percentile of observed latencies used as the delay
+    TIMING_MIN_SAMPLES = int(os.environ.get('TIMING_MIN_SAMPLES', 5))  # Use the stage default until this many samples exist
+    TIMING_SAMPLE_WINDOW = int(os.environ.get('TIMING_SAMPLE_WINDOW', 50))  # Most recent samples kept per stage
+    TIMING_SAVE_INTERVAL = 10.0  # Minimum seconds between writes of the model file
+    TIMING_MODEL_PATH = os.environ.get('TIMING_MODEL_PATH', os.path.join(tempfile.gettempdir(), 'cursit_timing_model.json'))
+    PROBE_INTERVAL = 0.01  # 10ms between readiness probe checks
+
+    # Paste pipeline stages: name -> (default, floor, ceiling) in seconds.
+    # Floors and ceilings can be overridden with TIMING_<STAGE>_FLOOR / _CEILING.
+    TIMING_STAGES = {
+        stage: (
+            default,
+            float(os.environ.get(f'TIMING_{stage.upper()}_FLOOR', floor)),
+            float(os.environ.get(f'TIMING_{stage.upper()}_CEILING', ceiling)),
+        )
+        for stage, (default, floor, ceiling) in {
+            'window_restore': (0.05, 0.01, 0.2),  # After each ShowWindow call
+            'focus': (0.2, 0.02, WINDOW_SETTLE_TIME),  # Until our window is foreground
+            'focus_guard': (0.0, 0.0, WINDOW_SETTLE_TIME),  # Until our window is foreground again before keys
+            'escape': (0.15, 0.05, 0.75),  # Until modals are dismissed (chat_open retries with the ceiling)
+            'clipboard': (0.05, 0.0, 0.5),  # Until the clipboard holds our message
+            'chat_open': (0.5, 0.05, 1.5),  # Until the chat input has focus
+            'paste': (0.2, 0.02, UI_SETTLE_TIME),  # Until the pasted text has landed
+            'submit_prepare': (0.3, 0.02, 1.0),  # Before re-focusing the chat to submit
+            'refocus_escape': (0.2, 0.02, 1.0),  # After ESC when re-focusing the chat
+            'refocus_chat': (0.3, 0.02, 1.0),  # After Ctrl+L when re-focusing the chat
+            'submit': (0.05, 0.0, 0.5),  # After Enter, before the desktop is released
+        }.items()
+    }
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
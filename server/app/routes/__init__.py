@@ -12,9 +12,14 @@
 """API routes for the Cursor HTTP Server."""
 from flask import Blueprint
 
-# Create blueprint
+# Create blueprints
 open_bp = Blueprint('open', __name__)
+jobs_bp = Blueprint('jobs', __name__)
+metrics_bp = Blueprint('metrics', __name__)
+messages_bp = Blueprint('messages', __name__)
+repos_bp = Blueprint('repos', __name__)
+health_bp = Blueprint('health', __name__)
 
-# Import routes to register them with blueprint
-from app.routes import open_routes
+# Import routes to register them with blueprints
+from app.routes import open_routes, job_routes, metrics_routes, message_routes, repo_routes, health_routes
 
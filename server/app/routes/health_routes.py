@@ -0,0 +1,32 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/routes/health_routes.py
+# Purpose: Health/readiness endpoint answered from cached state
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Route for pre-flight health checks.
+"""
+from flask import jsonify
+from app.routes import health_bp
+from app.services.health import get_health_monitor
+
+
+@health_bp.route("/health", methods=["GET"])
+def get_health():
+    """
+    Get the server's health and readiness.
+    
+    Answered from state kept by the background health monitor; no window
+    enumeration, clipboard access or process spawning happens here.
+    
+    Returns:
+        JSON health state: status, ready, checks, problems, Cursor window,
+        companion and queue counts
+    """
+    return jsonify(get_health_monitor().snapshot())
@@ -0,0 +1,94 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/routes/job_routes.py
+# Purpose: API endpoints for automation job status and progress streams
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Routes for inspecting, following and cancelling queued automation jobs.
+"""
+from flask import Response, jsonify, request, stream_with_context
+from app.config import Config
+from app.routes import jobs_bp
+from app.services.job_queue import get_automation_queue, sse_message
+
+
+@jobs_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """
+    Get the status and timing of an automation job.
+    
+    Returns:
+        JSON job status, or 404 if the job is unknown or expired
+    """
+    job = get_automation_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found", "jobId": job_id}), 404
+    return jsonify(job.to_dict()), 200
+
+
+@jobs_bp.route("/jobs/<job_id>", methods=["DELETE"])
+def cancel_job(job_id):
+    """
+    Cancel an automation job.
+    
+    Queued jobs are dropped; running jobs stop at their next stage boundary.
+    
+    Returns:
+        202 if cancellation was requested, 409 if the job already finished,
+        404 if the job is unknown
+    """
+    job = get_automation_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found", "jobId": job_id}), 404
+    if not job.cancel():
+        return jsonify({"error": "Job already finished", "status": job.status}), 409
+    return jsonify({"status": "cancelling", "jobId": job_id}), 202
+
+
+@jobs_bp.route("/jobs/<job_id>/events", methods=["GET"])
+def stream_job_events(job_id):
+    """
+    Stream a job's stage events as Server-Sent Events.
+    
+    Every event carries the stage name and its timestamps; the stream ends
+    after the terminal succeeded/failed/cancelled event. Reconnecting clients
+    may send ``Last-Event-ID`` to resume.
+    
+    Returns:
+        text/event-stream response, or 404 if the job is unknown
+    """
+    job = get_automation_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found", "jobId": job_id}), 404
+    
+    try:
+        seen = int(request.headers.get("Last-Event-ID", 0))
+    except ValueError:
+        seen = 0
+    
+    def generate(seen):
+        while True:
+            events = job.events_since(seen, timeout=Config.SSE_HEARTBEAT_INTERVAL)
+            if not events:
+                if job.finished:
+                    return
+                # Comment line keeps proxies and the client from timing out
+                yield ": heartbeat\n\n"
+                continue
+            for event in events:
+                seen = event["seq"]
+                yield sse_message(event)
+            if job.finished and seen >= len(job.events):
+                return
+    
+    return Response(
+        stream_with_context(generate(seen)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
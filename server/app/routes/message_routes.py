@@ -0,0 +1,31 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/routes/message_routes.py
+# Purpose: API endpoint for fetching stored messages
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Routes for reading messages from the content-addressed message store.
+"""
+from flask import Response, jsonify
+from app.routes import messages_bp
+from app.services.message_store import get_message_store
+
+
+@messages_bp.route("/messages/<message_id>", methods=["GET"])
+def get_message(message_id):
+    """
+    Get a stored message by its id (the ``messageId`` of an /open result).
+    
+    Returns:
+        text/plain message, or 404 if the id is unknown or was evicted
+    """
+    message = get_message_store().get(message_id)
+    if message is None:
+        return jsonify({"error": "Message not found", "messageId": message_id}), 404
+    return Response(message, mimetype="text/plain; charset=utf-8")
@@ -0,0 +1,55 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/routes/metrics_routes.py
+# Purpose: Prometheus-style metrics endpoint and HTTP request timing
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Routes exposing server metrics for Prometheus-compatible scrapers.
+"""
+import time
+from flask import Response, g, request
+from app.routes import metrics_bp
+from app.services.job_queue import get_automation_queue
+from app.services.metrics import REGISTRY, HTTP_REQUEST_SECONDS, Gauge
+
+REGISTRY.register(Gauge(
+    'cursit_queue_depth',
+    'Automation jobs waiting to run.',
+    lambda: get_automation_queue().depth()
+))
+
+
+@metrics_bp.before_app_request
+def _start_timer():
+    g.request_started_at = time.perf_counter()
+
+
+@metrics_bp.after_app_request
+def _observe_request(response):
+    started_at = g.pop('request_started_at', None)
+    if started_at is not None and request.endpoint != 'metrics.get_metrics':
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started_at,
+            endpoint=request.url_rule.rule if request.url_rule else 'unmatched',
+            method=request.method,
+            status=str(response.status_code)
+        )
+    return response
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    """
+    Get server metrics in the Prometheus text exposition format.
+
+    Returns:
+        text/plain metrics: per-endpoint request and stage latency histograms,
+        cold/hot start, timeout, focus fallback and clipboard failure counters
+    """
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
@@ -12,16 +12,21 @@
 """
 Routes for opening files in Cursor and pasting messages.
 """
+import hashlib
+import json
 import os
-import time
-from flask import request, jsonify
+from flask import request, jsonify, url_for
+from werkzeug.exceptions import RequestEntityTooLarge
 from app.routes import open_bp
 from app.config import Config
-from app.utils.logger import get_logger
+from app.utils.logger import get_logger, payload
+from app.services.automation_service import AutomationService
 from app.services.message_service import MessageService
-from app.services.clipboard_service import ClipboardService
-from app.services.window_service import WindowService
-from app.services.cursor_service import CursorService
+from app.services.job_queue import QueueFullError, get_automation_queue
+from app.services import metrics
+from app.services.async_runtime import get_automation_loop
+from app.services.repo_index import get_repo_index
+from app.services.file_index import get_file_indexes
 
 logger = get_logger(__name__)
 
@@ -34,91 +39,58 @@ def open_file_only():
     Expected JSON payload:
     {
         "filePath": "path/to/file.py",
-        "workspacePath": "path/to/workspace" (optional)
+        "workspacePath": "path/to/workspace" (optional),
+        "repoUrl": "https://github.com/owner/repo" (optional, instead of workspacePath)
     }
     
     Returns:
-        JSON response with status and details
+        202 JSON response with the job id, 400 on invalid input or a file
+        that neither exists nor resolves through the workspace file index,
+        404 if repoUrl has no known checkout, 413 if the body exceeds
+        MAX_CONTENT_LENGTH, 429 with Retry-After when the automation queue
+        is full
     """
     # Parse request
-    try:
-        data = request.get_json(force=True)
-    except Exception:
-        return jsonify({"error": "Invalid JSON"}), 400
+    data, error = _read_json()
+    if error:
+        return error
     
     # Extract parameters (support both camelCase and snake_case)
     file_path = data.get("filePath") or data.get("file_path")
-    workspace_path = data.get("workspacePath") or data.get("workspace_path") or data.get("repoPath") or data.get("repo_path")
+    workspace_path, error = _workspace_path(data)
+    if error:
+        return error
     
     # Log request
     logger.info("=" * 60)
     logger.info("Received POST /open-file request")
-    logger.info(f"workspacePath: {workspace_path}")
-    logger.info(f"filePath: {file_path}")
+    logger.info("workspacePath: %s", workspace_path)
+    logger.info("filePath: %s", file_path)
     
     # Validate file path
     if not file_path:
         logger.error("Missing filePath")
         return jsonify({"error": "Missing 'filePath'"}), 400
     
-    # Normalize and validate file path
+    # Normalize and validate file path (relative paths are within the workspace)
     file_path = os.path.expanduser(file_path)
+    if workspace_path and not os.path.isabs(file_path):
+        file_path = os.path.join(workspace_path, file_path)
     file_path = os.path.abspath(file_path)
     
-    if not os.path.exists(file_path):
-        logger.error(f"File does not exist: {file_path}")
-        return jsonify({"error": "File does not exist", "filePath": file_path}), 400
-    
-    # Open workspace and file in Cursor (without any pasting)
-    opened, open_msg = CursorService.open_file_only(workspace_path, file_path)
-    if not opened:
-        return jsonify({"error": "Failed to open file", "detail": open_msg}), 500
-    
-    # Check if Cursor was already running (cold start detection)
-    cursor_was_running = WindowService.is_cursor_running()
-    logger.info(f"Cursor was {'already running' if cursor_was_running else 'NOT running (cold start)'}")
-    
-    # If Cursor wasn't running, wait for it to start up and become responsive
-    if not cursor_was_running:
-        cursor_started = WindowService.wait_for_cursor_startup()
-        if cursor_started:
-            cursor_ready = WindowService.wait_for_cursor_ready()
-            if not cursor_ready:
-                logger.warning("Cursor responsiveness timeout, proceeding anyway...")
-                time.sleep(Config.FALLBACK_DELAY)
-        else:
-            logger.warning("Cursor startup timeout, proceeding anyway...")
-            time.sleep(1.0)
-    
-    # Wait for Cursor to open the file
-    logger.info("Waiting for Cursor to open the file...")
-    file_timeout = Config.FILE_LOAD_TIMEOUT_COLD if not cursor_was_running else Config.FILE_LOAD_TIMEOUT_HOT
-    if workspace_path:
-        file_timeout = max(file_timeout, 12.0)  # Longer timeout for workspace
-    
-    file_loaded = WindowService.wait_for_file_loaded(file_path, timeout=file_timeout)
-    
-    if not file_loaded:
-        logger.warning("File load timeout, proceeding anyway...")
-        time.sleep(0.5)
-    
-    # Bring window to front (without pasting)
-    success, msg = CursorService.bring_window_to_front(target_filename=file_path)
-    
-    if not success:
-        logger.error(f"Could not bring window to front: {msg}")
-    
-    # Build response
-    response = {
-        "status": "ok",
-        "openedWorkspace": workspace_path,
-        "openedFile": file_path,
-        "note": "File opened in Cursor"
-    }
-    
-    logger.info(f"✓ File opened successfully")
-    logger.info("=" * 60)
-    return jsonify(response), 200
+    requested_path = file_path
+    file_path, error = _existing_file(workspace_path, file_path)
+    if error:
+        return error
+    
+    # Queue the automation; file-only opens jump ahead of paste jobs
+    return _enqueue(
+        "open-file",
+        lambda job: AutomationService.open_file_only(workspace_path, file_path, report=job.report),
+        Config.JOB_PRIORITY_OPEN_FILE,
+        _dedup_key("open-file", data, workspace_path, file_path),
+        _substitution(requested_path, file_path)
+    )
 
 
 @open_bp.route("/open", methods=["POST"])
@@ -129,122 +101,241 @@ def open_file():
     Expected JSON payload:
     {
         "filePath": "path/to/file.py",
+        "workspacePath": "path/to/workspace" (optional),
+        "repoUrl": "https://github.com/owner/repo" (optional, instead of workspacePath),
         "comment": "Comment text",
         "codeSnippet": "code here",
         "autoSubmit": false
     }
     
     Returns:
-        JSON response with status and details
+        202 JSON response with the job id, 400 on invalid input or a file
+        that neither exists nor resolves through the workspace file index,
+        404 if repoUrl has no known checkout, 413 if the body exceeds
+        MAX_CONTENT_LENGTH, 429 with Retry-After when the automation queue
+        is full
     """
     # Parse request
-    try:
-        data = request.get_json(force=True)
-    except Exception:
-        return jsonify({"error": "Invalid JSON"}), 400
+    data, error = _read_json()
+    if error:
+        return error
     
     # Extract parameters (support both camelCase and snake_case)
     comment = data.get("comment")
     code_snippet = data.get("codeSnippet") or data.get("code_snippet")
     file_path = data.get("filePath") or data.get("file_path")
-    workspace_path = data.get("workspacePath") or data.get("workspace_path") or data.get("repoPath") or data.get("repo_path")
+    workspace_path, error = _workspace_path(data)
+    if error:
+        return error
     auto_submit = data.get("autoSubmit", False) or data.get("auto_submit", False)
     
     # Log request
     logger.info("=" * 60)
     logger.info("Received POST /open request")
-    logger.info(f"workspacePath: {workspace_path}")
-    logger.info(f"filePath: {file_path}")
-    logger.info(f"comment: {comment}")
-    snippet_preview = code_snippet[:100] if code_snippet else None
-    if snippet_preview:
-        snippet_preview += '...' if len(code_snippet) > 100 else ''
-    logger.info(f"codeSnippet: {snippet_preview}")
-    logger.info(f"autoSubmit: {auto_submit}")
+    logger.info("workspacePath: %s", workspace_path)
+    logger.info("filePath: %s", file_path)
+    logger.info("comment: %s", payload(comment))
+    logger.info("codeSnippet: %s", payload(code_snippet, 100))
+    logger.info("autoSubmit: %s", auto_submit)
     
     # Validate file path
     if not file_path:
         logger.error("Missing filePath")
         return jsonify({"error": "Missing 'filePath'"}), 400
     
-    # Normalize and validate file path
+    # Normalize and validate file path (relative paths are within the workspace)
     file_path = os.path.expanduser(file_path)
+    if workspace_path and not os.path.isabs(file_path):
+        file_path = os.path.join(workspace_path, file_path)
     file_path = os.path.abspath(file_path)
     
-    if not os.path.exists(file_path):
-        logger.error(f"File does not exist: {file_path}")
-        return jsonify({"error": "File does not exist", "filePath": file_path}), 400
-    
-    # Combine message
-    combined_message = MessageService.combine_message(comment, code_snippet)
+    requested_path = file_path
+    file_path, error = _existing_file(workspace_path, file_path)
+    if error:
+        return error
+    
+    # Build the message once; the job keeps it and the code snippet (to find
+    # the snippet's line off the request thread), not the other request fields
+    message = MessageService.combine_message(comment, code_snippet)
+    
+    # Queue the automation
+    return _enqueue(
+        "open",
+        lambda job: AutomationService.open_file(
+            workspace_path, file_path, message, auto_submit, snippet=code_snippet, report=job.report
+        ),
+        Config.JOB_PRIORITY_PASTE,
+        _dedup_key("open", data, workspace_path, file_path, message, bool(auto_submit)),
+        _substitution(requested_path, file_path)
+    )
+
+
+def _read_json():
+    """
+    Parse the JSON body, holding at most two copies of it at any time.
     
-    # Open workspace and file in Cursor
-    opened, open_msg = CursorService.open_workspace_and_file(workspace_path, file_path)
-    if not opened:
-        return jsonify({"error": "Failed to open file", "detail": open_msg}), 500
+    Bodies larger than ``Config.MAX_CONTENT_LENGTH`` are rejected before
+    they are read. The raw bytes are not cached on the request and are
+    released as soon as they are decoded, before parsing.
     
-    # Save message to temp file
+    Returns:
+        Tuple of (parsed JSON, None) or (None, Flask error response tuple)
+    """
     try:
-        saved_path = MessageService.save_to_temp(combined_message)
-    except Exception as e:
-        logger.error(f"Failed to write message to temp: {e}")
-        return jsonify({"error": "Failed to write message to temp", "detail": str(e)}), 500
-    
-    # Copy to clipboard
-    copied, copy_err = ClipboardService.copy(combined_message)
-    if not copied:
-        logger.warning(f"Failed to copy to clipboard: {copy_err}")
-    
-    # Check if Cursor was already running (cold start detection)
-    cursor_was_running = WindowService.is_cursor_running()
-    logger.info(f"Cursor was {'already running' if cursor_was_running else 'NOT running (cold start)'}")
-    
-    # If Cursor wasn't running, wait for it to start up and become responsive
-    if not cursor_was_running:
-        cursor_started = WindowService.wait_for_cursor_startup()
-        if cursor_started:
-            cursor_ready = WindowService.wait_for_cursor_ready()
-            if not cursor_ready:
-                logger.warning("Cursor responsiveness timeout, proceeding anyway...")
-                time.sleep(Config.FALLBACK_DELAY)
-        else:
-            logger.warning("Cursor startup timeout, proceeding anyway...")
-            time.sleep(1.0)
-    
-    # Wait for Cursor to open the file
-    logger.info("Waiting for Cursor to open the file...")
-    # Use longer timeout for workspace+file
-    file_timeout = Config.FILE_LOAD_TIMEOUT_COLD if not cursor_was_running else Config.FILE_LOAD_TIMEOUT_HOT
-    if workspace_path:
-        file_timeout = max(file_timeout, 12.0)  # Longer timeout for workspace
-    
-    file_loaded = WindowService.wait_for_file_loaded(file_path, timeout=file_timeout)
-    
-    if not file_loaded:
-        logger.warning("File load timeout, proceeding anyway...")
-        time.sleep(0.5)
-    
-    # Bring window to front and paste
-    success, msg = CursorService.bring_window_to_front_and_paste(
-        target_filename=file_path,
-        auto_submit=auto_submit
-    )
+        text = request.get_data(cache=False).decode("utf-8")
+        return json.loads(text), None
+    except RequestEntityTooLarge:
+        logger.warning("Rejected request body over %d bytes", Config.MAX_CONTENT_LENGTH)
+        return None, (jsonify({"error": "Request body too large", "maxBytes": Config.MAX_CONTENT_LENGTH}), 413)
+    except Exception:
+        return None, (jsonify({"error": "Invalid JSON"}), 400)
+
+
+def _workspace_path(data):
+    """
+    Get the workspace of a request.
     
-    if not success:
-        logger.error(f"Could not bring window to front: {msg}")
-    
-    # Build response
-    note = "Pasted and submitted" if auto_submit else "Pasted (press Enter to submit)"
-    response = {
-        "status": "ok",
-        "openedWorkspace": workspace_path,
-        "openedFile": file_path,
-        "messageSavedTo": saved_path,
-        "autoSubmitted": auto_submit,
-        "note": note
-    }
+    An explicit ``workspacePath`` wins; otherwise ``repoUrl`` is resolved to
+    its local checkout through the repository index.
     
-    logger.info(f"✓ Request completed successfully: {note}")
-    logger.info("=" * 60)
-    return jsonify(response), 200
+    Returns:
+        Tuple of (workspace path or None, None) or (None, Flask error response tuple)
+    """
+    workspace_path = data.get("workspacePath") or data.get("workspace_path") or data.get("repoPath") or data.get("repo_path")
+    repo_url = data.get("repoUrl") or data.get("repo_url")
+    if workspace_path or not repo_url:
+        return workspace_path, None
+    
+    workspace_path = get_repo_index().resolve(repo_url)
+    if workspace_path is None:
+        logger.error("No local checkout of %s", repo_url)
+        return None, (jsonify({"error": "Repository not found", "repoUrl": repo_url}), 404)
+    logger.info("Resolved %s to %s", repo_url, workspace_path)
+    return workspace_path, None
+
 
+def _existing_file(workspace_path, file_path):
+    """
+    Check that the requested file exists, falling back to the workspace file index.
+    
+    A path missing locally (stale branch, moved directory, monorepo subfolder
+    checkout) resolves to the workspace file with the same name sharing the
+    longest path suffix, or to the only file with that name.
+    
+    Returns:
+        Tuple of (existing file path, None) or (None, Flask error response tuple)
+    """
+    indexes = get_file_indexes()
+    has_workspace = bool(workspace_path) and os.path.isdir(workspace_path)
+    if has_workspace:
+        # Builds the index in the background the first time a workspace is seen
+        indexes.get(workspace_path)
+    
+    if os.path.exists(file_path):
+        return file_path, None
+    
+    resolved = indexes.resolve(workspace_path, file_path) if has_workspace else None
+    if resolved is None:
+        logger.error("File does not exist: %s", file_path)
+        return None, (jsonify({"error": "File does not exist", "filePath": file_path}), 400)
+    logger.warning("File does not exist: %s, opening %s instead", file_path, resolved)
+    return resolved, None
+
+
+def _substitution(requested_path, file_path):
+    """
+    Describe a file substituted by the workspace file index.
+    
+    Returns:
+        Dict with ``requestedFile`` and ``resolvedFile``, or None if the
+        requested file exists
+    """
+    if file_path == requested_path:
+        return None
+    return {"requestedFile": requested_path, "resolvedFile": file_path}
+
+
+def _dedup_key(kind, data, *fields):
+    """
+    Build the de-duplication key of a request.
+    
+    A client-supplied idempotency key (``Idempotency-Key`` header or
+    ``idempotencyKey`` field) wins; otherwise the request is fingerprinted
+    from its normalized fields, so a double-clicked button maps to one job.
+    
+    Args:
+        kind: Job kind, e.g. "open" or "open-file"
+        data: Parsed JSON body
+        *fields: Values identifying the request (paths, message, flags)
+        
+    Returns:
+        str: Key for ``AutomationQueue.submit_once``
+    """
+    idempotency_key = request.headers.get("Idempotency-Key") or data.get("idempotencyKey")
+    if idempotency_key:
+        return f"{kind}:key:{idempotency_key}"
+    
+    digest = hashlib.sha256()
+    for field in fields:
+        text = "" if field is None else str(field)
+        # Hash in chunks so large messages are not encoded in one piece
+        for start in range(0, len(text), Config.MESSAGE_WRITE_CHUNK):
+            digest.update(text[start:start + Config.MESSAGE_WRITE_CHUNK].encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return f"{kind}:fp:{digest.hexdigest()}"
+
+
+def _enqueue(kind, func, priority, dedup_key, substitution=None):
+    """
+    Submit an automation job and build the 202 (or 429) response.
+    
+    A duplicate of an in-flight or recently completed request is answered
+    with that request's job instead of queueing the automation again.
+    
+    Args:
+        kind: Job kind, e.g. "open" or "open-file"
+        func: Pipeline coroutine function, called with the job and run on the
+            automation loop
+        priority: Queue priority (lower runs first)
+        dedup_key: De-duplication key (see ``_dedup_key``)
+        substitution: Requested and resolved file when the file index
+            substituted it (see ``_substitution``); added to the response and
+            the job result
+        
+    Returns:
+        Flask response tuple
+    """
+    endpoint = request.path
+    
+    def run(job):
+        # Label the job's metrics with this endpoint and time it end to end
+        with metrics.request_context(endpoint, job.created_at):
+            result = get_automation_loop().run(func(job))
+        if substitution:
+            result.update(substitution)
+        return result
+    
+    try:
+        job, created = get_automation_queue().submit_once(kind, run, priority, dedup_key)
+    except QueueFullError as e:
+        logger.warning("Automation queue full, rejecting %s request", kind)
+        logger.info("=" * 60)
+        return jsonify({"error": "Automation queue is full", "retryAfter": e.retry_after}), 429, {
+            "Retry-After": str(e.retry_after)
+        }
+    
+    status_url = url_for("jobs.get_job", job_id=job.id)
+    events_url = url_for("jobs.stream_job_events", job_id=job.id)
+    body = {"status": "accepted", "jobId": job.id, "statusUrl": status_url, "eventsUrl": events_url}
+    if substitution:
+        body.update(substitution)
+    if created:
+        logger.info("✓ Accepted as job %s", job.id)
+    else:
+        metrics.DUPLICATE_REQUESTS.inc(endpoint=endpoint)
+        logger.info("✓ Duplicate request, attached to job %s (%s)", job.id, job.status)
+        body["duplicate"] = True
+    logger.info("=" * 60)
+    return jsonify(body), 202, {
+        "Location": status_url
+    }
@@ -0,0 +1,62 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/routes/repo_routes.py
+# Purpose: API endpoints for resolving repository URLs to local checkouts
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Routes for the repository discovery index.
+"""
+from flask import jsonify, request
+from app.routes import repos_bp
+from app.services.repo_index import get_repo_index, normalize_remote_url
+
+
+@repos_bp.route("/repos/resolve", methods=["GET"])
+def resolve_repo():
+    """
+    Resolve a repository URL (remote or PR page base URL) to its local checkout.
+    
+    Query parameters:
+        url: Repository URL, e.g. https://github.com/owner/repo
+        
+    Returns:
+        JSON with the checkout path (and every checkout of that remote),
+        400 without a usable URL, 404 if no checkout is known
+    """
+    url = request.args.get("url", "")
+    key = normalize_remote_url(url)
+    if not key:
+        return jsonify({"error": "Missing or invalid 'url'"}), 400
+    
+    paths = get_repo_index().lookup(url)
+    if not paths:
+        return jsonify({"error": "Repository not found", "url": url, "key": key}), 404
+    return jsonify({"url": url, "key": key, "path": paths[0], "paths": paths})
+
+
+@repos_bp.route("/repos", methods=["GET"])
+def list_repos():
+    """
+    List the indexed checkouts.
+    
+    Returns:
+        JSON with the scanned roots, last scan time and normalized URL -> paths
+    """
+    return jsonify(get_repo_index().snapshot())
+
+
+@repos_bp.route("/repos/scan", methods=["POST"])
+def scan_repos():
+    """
+    Rescan the repository roots now (incrementally).
+    
+    Returns:
+        JSON with the scan statistics
+    """
+    return jsonify(get_repo_index().scan())
@@ -0,0 +1,132 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/async_runtime.py
+# Purpose: Automation event loop and bounded executor for blocking calls
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Asyncio runtime for the automation pipelines.
+
+Pipelines are coroutines: their waits (window appearance, title changes,
+settle delays, readiness probes) suspend instead of sleeping on a thread.
+They run on one shared event loop in a background thread. Blocking calls
+(pywin32, clipboard, process spawning, file IO) are confined to a small
+bounded executor through ``run_blocking``.
+"""
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Optional
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AutomationLoop:
+    """Event loop thread running automation coroutines."""
+
+    def __init__(self, blocking_workers: int = None):
+        self.blocking_workers = blocking_workers or Config.BLOCKING_EXECUTOR_WORKERS
+        self.loop = asyncio.new_event_loop()
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.blocking_workers,
+            thread_name_prefix='automation-blocking'
+        )
+        self.loop.set_default_executor(self.executor)
+        self._thread = threading.Thread(target=self._run, name='automation-loop', daemon=True)
+        self._thread.start()
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop from any thread.
+
+        The caller's context variables (e.g. the metrics endpoint label) are
+        carried into the task.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            concurrent.futures.Future: Completes with the coroutine's outcome
+        """
+        context = contextvars.copy_context()
+        future = concurrent.futures.Future()
+
+        def start():
+            task = context.run(self.loop.create_task, coro)
+            task.add_done_callback(functools.partial(_copy_outcome, future))
+
+        self.loop.call_soon_threadsafe(start)
+        return future
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and block the calling thread for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Maximum time to wait in seconds (None for no limit)
+
+        Returns:
+            Any: The coroutine's result (its exception is re-raised)
+        """
+        return self.submit(coro).result(timeout)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+
+def _copy_outcome(future: concurrent.futures.Future, task: asyncio.Task) -> None:
+    if future.cancelled():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking call on the running loop's bounded executor.
+
+    Args:
+        func: Blocking callable (e.g. a pywin32 or clipboard call)
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        Any: The call's result
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(None, functools.partial(context.run, func, *args, **kwargs))
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_automation_loop() -> AutomationLoop:
+    """
+    Get the shared automation loop, starting it on first use.
+
+    Returns:
+        AutomationLoop: The process-wide loop
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = AutomationLoop()
+            logger.info("Automation loop started (%s blocking worker(s))", _loop.blocking_workers)
+        return _loop
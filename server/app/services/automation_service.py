@@ -0,0 +1,349 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/automation_service.py
+# Purpose: Open/paste automation pipelines executed by the job queue
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Automation pipelines for opening files and pasting messages into Cursor.
+
+These are coroutines run on the automation loop for the queue's workers,
+after the route has validated the request and answered with 202. Waits
+suspend instead of holding a thread; blocking calls (spawning Cursor, file
+and clipboard IO) go through the bounded executor. Each stage boundary is
+announced through the ``report`` callback, which feeds the job's progress
+stream.
+
+Several pipelines run at once. Each holds its workspace's window lease from
+opening the file until the message is in, and takes the exclusive desktop
+lease only for the clipboard, focus and keystroke stages (see
+``desktop_scheduler``).
+"""
+import asyncio
+from typing import Any, Callable, Dict, Optional
+from app.config import Config
+from app.utils.logger import get_logger
+from app.services.job_queue import AutomationError
+from app.services.message_service import MessageService
+from app.services.clipboard_service import ClipboardService
+from app.services.window_service import WindowService
+from app.services.cursor_service import CursorService
+from app.services.cursor_launcher import CursorLauncher
+from app.services.async_runtime import run_blocking
+from app.services.workspace_pool import get_workspace_pool
+from app.services.snippet_locator import get_snippet_locator
+from app.services.companion_channel import get_companion_channel
+from app.services.message_store import StoredMessage
+from app.services.desktop_scheduler import get_desktop_scheduler
+from app.services import metrics
+
+logger = get_logger(__name__)
+
+# report(stage, **data) - called at every stage boundary
+ProgressReporter = Callable[..., None]
+
+
+def _no_report(stage: str, **data) -> None:
+    pass
+
+
+class AutomationService:
+    """Service running the open-file and open-and-paste pipelines."""
+
+    @staticmethod
+    async def open_file_only(
+        workspace_path: Optional[str],
+        file_path: str,
+        report: ProgressReporter = _no_report
+    ) -> Dict[str, Any]:
+        """
+        Open a file in Cursor and focus it, without any clipboard or chat operations.
+
+        Args:
+            workspace_path: Path to the workspace/repo root (optional)
+            file_path: Validated absolute path to the file
+            report: Progress callback invoked at each stage boundary
+
+        Returns:
+            Dict[str, Any]: Result payload
+
+        Raises:
+            AutomationError: If Cursor could not be launched
+        """
+        scheduler = get_desktop_scheduler()
+        async with scheduler.window(workspace_path):
+            # Open workspace and file in Cursor (without any pasting)
+            report("launch")
+            with metrics.observe_stage("spawn"):
+                launch = await run_blocking(CursorLauncher.launch, workspace_path, file_path)
+            if not launch.ok:
+                raise AutomationError("Failed to open file", launch.note)
+
+            await AutomationService._wait_for_cursor(launch.was_running, report)
+            await AutomationService._wait_for_file(file_path, workspace_path, launch.was_running, report)
+
+            # Bring window to front (without pasting)
+            async with scheduler.desktop(file_path):
+                report("focus")
+                with metrics.observe_stage("focus"):
+                    success, msg = await CursorService.bring_window_to_front(
+                        target_filename=file_path, workspace_path=workspace_path
+                    )
+
+        if not success:
+            logger.error("Could not bring window to front: %s", msg)
+
+        if workspace_path:
+            get_workspace_pool().record(workspace_path)
+        logger.info("✓ File opened successfully")
+        return {
+            "status": "ok",
+            "openedWorkspace": workspace_path,
+            "openedFile": file_path,
+            "note": "File opened in Cursor"
+        }
+
+    @staticmethod
+    async def open_file(
+        workspace_path: Optional[str],
+        file_path: str,
+        message: str,
+        auto_submit: bool,
+        snippet: Optional[str] = None,
+        report: ProgressReporter = _no_report
+    ) -> Dict[str, Any]:
+        """
+        Open a file in Cursor and paste a message into chat.
+
+        The message is built once by the route; the same string is written to
+        the message store and copied to the clipboard.
+
+        Args:
+            workspace_path: Path to the workspace/repo root (optional)
+            file_path: Validated absolute path to the file
+            message: Combined comment/code message (see ``MessageService.combine_message``)
+            auto_submit: If True, submit the message after pasting
+            snippet: Code snippet to locate, so the file opens at its line
+            report: Progress callback invoked at each stage boundary
+
+        Returns:
+            Dict[str, Any]: Result payload
+
+        Raises:
+            AutomationError: If Cursor could not be launched, the message could not be
+                saved, or the paste sequence failed
+        """
+        line = await AutomationService._locate_snippet(file_path, snippet, report)
+
+        scheduler = get_desktop_scheduler()
+        async with scheduler.window(workspace_path):
+            # Open workspace and file in Cursor
+            report("launch")
+            with metrics.observe_stage("spawn"):
+                launch = await run_blocking(CursorLauncher.launch, workspace_path, file_path, line)
+            if not launch.ok:
+                raise AutomationError("Failed to open file", launch.note)
+
+            # Save message to the message store
+            try:
+                stored = await run_blocking(MessageService.store, message)
+            except Exception as e:
+                logger.error("Failed to store message: %s", e)
+                raise AutomationError("Failed to store message", str(e))
+
+            await AutomationService._wait_for_cursor(launch.was_running, report)
+            await AutomationService._wait_for_file(file_path, workspace_path, launch.was_running, report)
+
+            # An editor companion inserts the message itself, without the desktop
+            channel = get_companion_channel()
+            if channel.subscriber_for(workspace_path, file_path) is not None:
+                report("deliver")
+                with metrics.observe_stage("deliver"):
+                    delivered, deliver_err = await channel.deliver(
+                        workspace_path, file_path, line, message, stored, auto_submit
+                    )
+                metrics.COMPANION_DELIVERIES.inc(outcome="delivered" if delivered else "fallback")
+                if delivered:
+                    return AutomationService._pasted(workspace_path, file_path, line, stored, auto_submit, "companion")
+                logger.warning("Falling back to clipboard and keystrokes: %s", deliver_err)
+
+            # Copy, bring window to front and paste; other requests' clipboard
+            # and keystrokes wait until this one is done
+            async with scheduler.desktop(file_path):
+                copied = await AutomationService._copy_message(message)
+                success, msg = await CursorService.bring_window_to_front_and_paste(
+                    target_filename=file_path,
+                    auto_submit=auto_submit,
+                    workspace_path=workspace_path,
+                    report=report,
+                    message=message if copied else None
+                )
+
+        if not success:
+            logger.error("Could not paste into Cursor: %s", msg)
+            raise AutomationError("Could not paste into Cursor", msg)
+
+        # The message stays on the clipboard if anything failed, for pasting by hand
+        if copied and Config.CLIPBOARD_RESTORE:
+            await run_blocking(ClipboardService.restore, Config.CLIPBOARD_RESTORE_DELAY)
+
+        return AutomationService._pasted(workspace_path, file_path, line, stored, auto_submit, "keystrokes")
+
+    @staticmethod
+    async def _copy_message(message: str) -> bool:
+        """
+        Copy the message to the clipboard, saving the user's contents for restoring.
+
+        Args:
+            message: Message to copy
+
+        Returns:
+            bool: True if the message is on the clipboard
+        """
+        with metrics.observe_stage("clipboard_copy"):
+            copied, copy_err = await run_blocking(ClipboardService.copy, message, Config.CLIPBOARD_RESTORE)
+        if not copied:
+            metrics.CLIPBOARD_FAILURES.inc()
+            logger.warning("Failed to copy to clipboard: %s", copy_err)
+        return copied
+
+    @staticmethod
+    def _pasted(
+        workspace_path: Optional[str],
+        file_path: str,
+        line: Optional[int],
+        stored: StoredMessage,
+        auto_submit: bool,
+        delivered_via: str
+    ) -> Dict[str, Any]:
+        """
+        Record a successful paste and build the job result.
+
+        Args:
+            workspace_path: Workspace the file was opened in (optional)
+            file_path: File that was opened
+            line: Line it was opened at (optional)
+            stored: The message's entry in the message store
+            auto_submit: Whether the message was submitted
+            delivered_via: "companion" or "keystrokes"
+
+        Returns:
+            Dict[str, Any]: Result payload
+        """
+        if workspace_path:
+            get_workspace_pool().record(workspace_path)
+        note = "Pasted and submitted" if auto_submit else "Pasted (press Enter to submit)"
+        logger.info("✓ Request completed successfully: %s (via %s)", note, delivered_via)
+        return {
+            "status": "ok",
+            "openedWorkspace": workspace_path,
+            "openedFile": file_path,
+            "line": line,
+            "messageId": stored.id,
+            "messageSavedTo": stored.path,
+            "autoSubmitted": auto_submit,
+            "deliveredVia": delivered_via,
+            "note": note
+        }
+
+    @staticmethod
+    async def _locate_snippet(
+        file_path: str,
+        snippet: Optional[str],
+        report: ProgressReporter
+    ) -> Optional[int]:
+        """
+        Find the line a code snippet is on, to open the file there.
+
+        Args:
+            file_path: File to search
+            snippet: Code snippet from the PR (optional)
+            report: Progress callback
+
+        Returns:
+            Optional[int]: 1-based line, or None to open the file at the top
+        """
+        if not snippet or not Config.SNIPPET_LOCATOR_ENABLED:
+            return None
+        report("locate")
+        with metrics.observe_stage("locate"):
+            match = await run_blocking(get_snippet_locator().locate, file_path, snippet)
+        if match is None:
+            logger.info("Code snippet not found in %s, opening at the top", file_path)
+            return None
+        logger.info("Code snippet found at line %s (score %.2f)", match.line, match.score)
+        return match.line
+
+    @staticmethod
+    async def _wait_for_cursor(cursor_was_running: bool, report: ProgressReporter) -> None:
+        """
+        On a cold start, wait for Cursor to come up and become responsive.
+
+        Args:
+            cursor_was_running: Running state snapshotted before the launch
+            report: Progress callback
+        """
+        logger.info("Cursor was %s", 'already running' if cursor_was_running else 'NOT running (cold start)')
+        metrics.CURSOR_STARTS.inc(start="hot" if cursor_was_running else "cold")
+
+        # If Cursor wasn't running, wait for it to start up and become responsive
+        if not cursor_was_running:
+            report("startup_wait")
+            with metrics.observe_stage("startup_wait"):
+                cursor_started = await WindowService.wait_for_cursor_startup()
+            if cursor_started:
+                report("ready_wait")
+                with metrics.observe_stage("ready_wait"):
+                    cursor_ready = await WindowService.wait_for_cursor_ready()
+                report("cursor_ready", ready=cursor_ready)
+                if not cursor_ready:
+                    metrics.TIMEOUTS.inc(stage="ready_wait")
+                    logger.warning("Cursor responsiveness timeout, proceeding anyway...")
+                    await asyncio.sleep(Config.FALLBACK_DELAY)
+            else:
+                report("startup_timeout")
+                metrics.TIMEOUTS.inc(stage="startup_wait")
+                logger.warning("Cursor startup timeout, proceeding anyway...")
+                await asyncio.sleep(1.0)
+
+    @staticmethod
+    async def _wait_for_file(
+        file_path: str,
+        workspace_path: Optional[str],
+        cursor_was_running: bool,
+        report: ProgressReporter
+    ) -> bool:
+        """
+        Wait for Cursor to show the file in its window title.
+
+        Args:
+            file_path: File that was opened
+            workspace_path: Workspace it was opened in (optional)
+            cursor_was_running: Result of cold start detection
+            report: Progress callback
+
+        Returns:
+            bool: True if the file was detected before the timeout
+        """
+        logger.info("Waiting for Cursor to open the file...")
+        report("file_wait", coldStart=not cursor_was_running)
+        # Use longer timeout for workspace+file
+        file_timeout = Config.FILE_LOAD_TIMEOUT_COLD if not cursor_was_running else Config.FILE_LOAD_TIMEOUT_HOT
+        if workspace_path:
+            file_timeout = max(file_timeout, 12.0)  # Longer timeout for workspace
+
+        with metrics.observe_stage("file_load_wait"):
+            file_loaded = await WindowService.wait_for_file_loaded(file_path, timeout=file_timeout, workspace_path=workspace_path)
+        report("file_loaded", loaded=file_loaded)
+
+        if not file_loaded:
+            metrics.TIMEOUTS.inc(stage="file_load_wait")
+            logger.warning("File load timeout, proceeding anyway...")
+            await asyncio.sleep(0.5)
+
+        return file_loaded
@@ -11,8 +11,22 @@
 
 """
 Clipboard operations service.
+
+Clipboard access goes through a pluggable backend. The Win32 backend talks to
+the clipboard in-process through pywin32 instead of going through pyperclip
+for every call, and exposes the clipboard sequence number, so checking that
+our message is still on the clipboard right before pasting needs no read at
+all. pyperclip remains the fallback, and an in-memory backend serves tests.
+
+The user's previous clipboard contents are saved when a message is copied and
+put back after the paste, unless something else was copied in the meantime.
 """
-from typing import Tuple
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+from app.config import Config
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -23,30 +37,371 @@ except Exception:
     pyperclip = None
     logger.warning("pyperclip not installed, clipboard operations will be unavailable")
 
+try:
+    import win32clipboard
+except Exception:
+    win32clipboard = None
+
+CF_UNICODETEXT = 13
+
+# Standard formats holding GDI objects or file lists rather than plain memory;
+# they cannot be copied out and back (bitmaps survive through CF_DIB)
+_HANDLE_FORMATS = frozenset({2, 3, 9, 14, 15, 0x80, 0x82, 0x83, 0x8E})
+
+# Registered formats referring to the source application's live OLE objects
+_OLE_FORMATS = frozenset({'DataObject', 'Ole Private Data', 'OleClipboardPersistOnFlush'})
+
+
+class ClipboardBackend(ABC):
+    """
+    Access to the system clipboard.
+
+    Backends that can tell cheaply whether the clipboard changed return a
+    counter from ``sequence``; for the others the clipboard is read back.
+    Methods raise on failure.
+    """
+
+    @abstractmethod
+    def copy(self, text: str) -> None:
+        """Replace the clipboard contents with text."""
+
+    @abstractmethod
+    def paste(self) -> str:
+        """Get the clipboard text ('' if it holds none)."""
+
+    def sequence(self) -> Optional[int]:
+        """Get a counter that changes with every clipboard change (None if unsupported)."""
+        return None
+
+    def snapshot(self) -> Any:
+        """Capture the clipboard contents for ``restore``."""
+        return self.paste()
+
+    def restore(self, snapshot: Any) -> None:
+        """Put contents captured by ``snapshot`` back on the clipboard."""
+        self.copy(snapshot)
+
+
+class Win32ClipboardBackend(ClipboardBackend):
+    """Clipboard backend using the Win32 clipboard API in-process (pywin32)."""
+
+    def __init__(self, attempts: int = None):
+        self.attempts = attempts if attempts is not None else Config.CLIPBOARD_OPEN_ATTEMPTS
+
+    def copy(self, text: str) -> None:
+        with self._opened():
+            win32clipboard.EmptyClipboard()
+            win32clipboard.SetClipboardText(text, CF_UNICODETEXT)
+
+    def paste(self) -> str:
+        with self._opened():
+            if not win32clipboard.IsClipboardFormatAvailable(CF_UNICODETEXT):
+                return ""
+            return win32clipboard.GetClipboardData(CF_UNICODETEXT)
+
+    def sequence(self) -> Optional[int]:
+        return win32clipboard.GetClipboardSequenceNumber()
+
+    def snapshot(self) -> Dict[int, Any]:
+        """Capture every memory-backed format, up to ``CLIPBOARD_SNAPSHOT_MAX_BYTES`` in total."""
+        formats: Dict[int, Any] = {}
+        size = 0
+        with self._opened():
+            fmt = win32clipboard.EnumClipboardFormats(0)
+            while fmt:
+                data = self._read_format(fmt)
+                if data is not None:
+                    if size + len(data) <= Config.CLIPBOARD_SNAPSHOT_MAX_BYTES:
+                        formats[fmt] = data
+                        size += len(data)
+                    else:
+                        logger.info("Clipboard format %s too large to save (%s bytes)", fmt, len(data))
+                fmt = win32clipboard.EnumClipboardFormats(fmt)
+        return formats
+
+    def restore(self, snapshot: Dict[int, Any]) -> None:
+        with self._opened():
+            win32clipboard.EmptyClipboard()
+            for fmt, data in snapshot.items():
+                try:
+                    win32clipboard.SetClipboardData(fmt, data)
+                except Exception as e:
+                    logger.debug("Could not restore clipboard format %s: %s", fmt, e)
+
+    @staticmethod
+    def _read_format(fmt: int) -> Optional[Any]:
+        # Caller holds the clipboard open
+        if fmt in _HANDLE_FORMATS:
+            return None
+        try:
+            if fmt >= 0xC000 and win32clipboard.GetClipboardFormatName(fmt) in _OLE_FORMATS:
+                return None
+            data = win32clipboard.GetClipboardData(fmt)
+        except Exception:
+            return None
+        return data if isinstance(data, (str, bytes)) else None
+
+    @contextmanager
+    def _opened(self) -> Iterator[None]:
+        # Another application may hold the clipboard open for a moment
+        for attempt in range(self.attempts):
+            try:
+                win32clipboard.OpenClipboard()
+                break
+            except Exception:
+                if attempt == self.attempts - 1:
+                    raise
+                time.sleep(0.01 * (attempt + 1))
+        try:
+            yield
+        finally:
+            win32clipboard.CloseClipboard()
+
+
+class PyperclipBackend(ClipboardBackend):
+    """Clipboard backend using pyperclip (text only)."""
+
+    def copy(self, text: str) -> None:
+        pyperclip.copy(text)
+
+    def paste(self) -> str:
+        return pyperclip.paste() or ""
+
+
+class FakeClipboardBackend(ClipboardBackend):
+    """
+    In-memory clipboard for tests.
+
+    Changes are counted like the Win32 sequence number; ``reads`` counts
+    ``paste`` calls, so tests can check that verification did not read.
+    """
+
+    def __init__(self, text: str = ""):
+        self._lock = threading.Lock()
+        self._text = text
+        self._sequence = 0
+        self.reads = 0
+
+    def copy(self, text: str) -> None:
+        with self._lock:
+            self._text = text
+            self._sequence += 1
+
+    def paste(self) -> str:
+        with self._lock:
+            self.reads += 1
+            return self._text
+
+    def sequence(self) -> Optional[int]:
+        with self._lock:
+            return self._sequence
+
+
+class _ClipboardState:
+    """What we last put on the clipboard, and the contents it replaced."""
+
+    NOTHING = object()
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.text: Optional[str] = None  # Message we copied
+        self.sequence: Optional[int] = None  # Backend sequence right after copying it
+        self.saved: Any = self.NOTHING  # User's contents from before our first copy
+        self.generation = 0  # Bumped by every copy, so a pending restore gives way
+
+    def holds_ours(self, backend: ClipboardBackend) -> bool:
+        # Caller holds self.lock
+        if self.text is None:
+            return False
+        if self.sequence is not None and backend.sequence() == self.sequence:
+            return True
+        return backend.paste() == self.text
+
+
+_state = _ClipboardState()
+_backend = None
+_backend_chosen = False
+_backend_lock = threading.Lock()
+
+
+def _create_backend() -> Optional[ClipboardBackend]:
+    name = Config.CLIPBOARD_BACKEND
+    if name == 'fake':
+        return FakeClipboardBackend()
+    if name in ('auto', 'win32') and win32clipboard is not None:
+        return Win32ClipboardBackend()
+    if name in ('auto', 'pyperclip') and pyperclip is not None:
+        return PyperclipBackend()
+    if name not in ('auto', 'win32', 'pyperclip'):
+        logger.warning("Unknown CLIPBOARD_BACKEND '%s'", name)
+    return PyperclipBackend() if pyperclip is not None else None
+
+
+def get_clipboard_backend() -> Optional[ClipboardBackend]:
+    """
+    Get the shared clipboard backend, chosen by ``CLIPBOARD_BACKEND``.
+
+    Returns:
+        Optional[ClipboardBackend]: The process-wide backend, or None if no
+            clipboard library is installed
+    """
+    global _backend, _backend_chosen
+    with _backend_lock:
+        if not _backend_chosen:
+            _backend = _create_backend()
+            _backend_chosen = True
+            logger.info("Clipboard backend: %s", type(_backend).__name__ if _backend else 'none')
+        return _backend
+
+
+def set_clipboard_backend(backend: Optional[ClipboardBackend]) -> Optional[ClipboardBackend]:
+    """
+    Replace the shared clipboard backend (e.g. with a fake one).
+
+    Args:
+        backend: Backend to install, or None to choose one again on next use
+
+    Returns:
+        Optional[ClipboardBackend]: The previously installed backend
+    """
+    global _backend, _backend_chosen
+    with _backend_lock:
+        previous, _backend = _backend, backend
+        _backend_chosen = backend is not None
+    with _state.lock:
+        # Saved contents belong to the previous clipboard
+        _state.text = _state.sequence = None
+        _state.saved = _ClipboardState.NOTHING
+        _state.generation += 1
+    return previous
+
 
 class ClipboardService:
     """Service for clipboard operations."""
-    
+
     @staticmethod
-    def copy(message: str) -> Tuple[bool, str]:
+    def copy(message: str, save_previous: bool = False) -> Tuple[bool, str]:
         """
         Copy message to clipboard.
-        
+
         Args:
             message: Text to copy to clipboard
-            
+            save_previous: If True, save the current contents for ``restore``
+                first (unless they are a message of ours still awaiting it)
+
         Returns:
             Tuple[bool, str]: (success, error_message)
         """
-        if pyperclip is None:
+        backend = get_clipboard_backend()
+        if backend is None:
             return False, "pyperclip not installed"
-        
+
+        message = message or ""
         try:
-            pyperclip.copy(message or "")
+            with _state.lock:
+                # Any pending restore would overwrite this message
+                _state.generation += 1
+                if save_previous and (_state.saved is _ClipboardState.NOTHING or not _state.holds_ours(backend)):
+                    try:
+                        _state.saved = backend.snapshot()
+                    except Exception as e:
+                        _state.saved = _ClipboardState.NOTHING
+                        logger.warning("Could not save clipboard contents: %s", e)
+                backend.copy(message)
+                _state.text = message
+                _state.sequence = backend.sequence()
             logger.info("Message copied to clipboard")
             return True, ""
         except Exception as e:
             error_msg = str(e)
-            logger.warning(f"Failed to copy to clipboard: {error_msg}")
+            logger.warning("Failed to copy to clipboard: %s", error_msg)
             return False, error_msg
 
+    @staticmethod
+    def verify(message: str) -> Optional[bool]:
+        """
+        Check that the clipboard still holds a message.
+
+        If the backend's sequence number has not moved since we copied this
+        message, nothing is read; otherwise the clipboard is read back.
+
+        Args:
+            message: Message that should be on the clipboard
+
+        Returns:
+            Optional[bool]: Whether it is there, or None if the clipboard
+                cannot be read
+        """
+        backend = get_clipboard_backend()
+        if backend is None:
+            return None
+
+        try:
+            with _state.lock:
+                if _state.text == (message or "") and _state.sequence is not None:
+                    if backend.sequence() == _state.sequence:
+                        return True
+            return backend.paste() == (message or "")
+        except Exception as e:
+            logger.warning("Failed to read clipboard: %s", e)
+            return None
+
+    @staticmethod
+    def restore(delay: float = 0.0) -> None:
+        """
+        Put the contents saved by ``copy`` back on the clipboard.
+
+        Nothing is restored if the clipboard no longer holds our message (the
+        user copied something since) or if another message is copied before
+        the delay is up; that copy keeps the saved contents for its own
+        restore.
+
+        Args:
+            delay: Seconds to wait first, so the target application has read
+                the pasted message
+        """
+        with _state.lock:
+            if _state.saved is _ClipboardState.NOTHING:
+                return
+            generation = _state.generation
+        if delay <= 0:
+            ClipboardService._restore(generation)
+            return
+        timer = threading.Timer(delay, ClipboardService._restore, (generation,))
+        timer.daemon = True
+        timer.start()
+
+    @staticmethod
+    def _restore(generation: int) -> None:
+        backend = get_clipboard_backend()
+        with _state.lock:
+            if backend is None or generation != _state.generation or _state.saved is _ClipboardState.NOTHING:
+                return
+            saved, _state.saved = _state.saved, _ClipboardState.NOTHING
+            try:
+                if not _state.holds_ours(backend):
+                    logger.info("Clipboard changed since the paste, previous contents not restored")
+                    return
+                backend.restore(saved)
+                _state.text = _state.sequence = None
+                logger.info("Previous clipboard contents restored")
+            except Exception as e:
+                logger.warning("Failed to restore clipboard contents: %s", e)
+
+    @staticmethod
+    def read() -> Optional[str]:
+        """
+        Read the clipboard text.
+
+        Returns:
+            Optional[str]: Clipboard text, or None if it cannot be read
+        """
+        backend = get_clipboard_backend()
+        if backend is None:
+            return None
+
+        try:
+            return backend.paste()
+        except Exception as e:
+            logger.warning("Failed to read clipboard: %s", e)
+            return None
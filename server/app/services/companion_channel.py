@@ -0,0 +1,384 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/companion_channel.py
+# Purpose: Local channel publishing messages to editor-side companions
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Companion channel.
+
+An editor-side companion (an extension running inside a Cursor window) can
+subscribe to messages over a local socket and insert them into chat itself,
+so ``/open`` needs neither the clipboard nor focus changes and synthetic
+keystrokes. The clipboard/keystroke path remains the fallback whenever no
+subscriber serves the request's workspace or a delivery is not acknowledged.
+
+The protocol is newline-delimited UTF-8 JSON over TCP on the loopback
+interface. The port and a per-run token are published in
+``COMPANION_INFO_PATH``::
+
+    companion -> server  {"type": "hello", "token": "...", "name": "...", "workspaces": ["C:\\\\repo"]}
+    server -> companion  {"type": "welcome", "version": 1}
+    server -> companion  {"type": "insert", "id": 1, "workspace": "...", "file": "...", "line": 42,
+                          "autoSubmit": false, "text": "..."}
+    companion -> server  {"type": "ack", "id": 1, "ok": true}    (or "ok": false, "error": "...")
+
+Messages larger than ``COMPANION_INLINE_MAX_BYTES`` are not serialized into
+the frame: ``insert`` carries ``messageId``, ``path`` and ``size`` of the
+message store file instead (``text`` is absent), which the companion reads
+or memory-maps. A companion without ``workspaces`` serves any request no
+other subscriber claims.
+"""
+import asyncio
+import itertools
+import json
+import os
+import secrets
+import socket
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import Config
+from app.utils.logger import get_logger
+from app.services.async_runtime import get_automation_loop, run_blocking
+from app.services.message_store import StoredMessage, get_message_store
+from app.services.notices import get_notice_board
+
+logger = get_logger(__name__)
+
+PROTOCOL_VERSION = 1
+
+
+def _normalize(path: str) -> str:
+    return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+
+class _Subscriber:
+    """A connected companion."""
+
+    def __init__(self, writer: asyncio.StreamWriter, name: str, workspaces: List[str]):
+        self.writer = writer
+        self.name = name
+        self.roots = [_normalize(path) for path in workspaces if isinstance(path, str) and path]
+        self.pending: Dict[int, asyncio.Future] = {}  # insert id -> ack future
+
+    def rank(self, workspace_path: Optional[str], file_path: str) -> int:
+        """
+        Rank how well this companion serves a request.
+
+        Returns:
+            int: Length of the matching root (longest wins), 0 for a companion
+                serving any workspace, -1 if it does not serve the request
+        """
+        if not self.roots:
+            return 0
+        target = _normalize(workspace_path) if workspace_path else None
+        file_path = _normalize(file_path)
+        best = -1
+        for root in self.roots:
+            if root == target or file_path.startswith(root.rstrip(os.sep) + os.sep):
+                best = max(best, len(root))
+        return best
+
+    async def send(self, frame: Dict[str, Any]) -> None:
+        self.writer.write(json.dumps(frame).encode('utf-8') + b'\n')
+        await self.writer.drain()
+
+
+class CompanionChannel:
+    """Loopback server that companions subscribe to; runs on the automation loop."""
+
+    def __init__(self, host: str = None, port: int = None, info_path: str = None):
+        self.host = host or Config.COMPANION_HOST
+        self.port = port if port is not None else Config.COMPANION_PORT
+        self.info_path = info_path if info_path is not None else Config.COMPANION_INFO_PATH
+        self.token = secrets.token_hex(16)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._subscribers: List[_Subscriber] = []
+        self._ids = itertools.count(1)
+
+    def start(self) -> bool:
+        """
+        Start listening and publish the port and token (blocks until listening).
+
+        The channel is optional: if its port cannot be bound (another
+        instance or application holds it), it stays off and messages go
+        through the clipboard and keystrokes.
+
+        Returns:
+            bool: True if the channel is listening
+        """
+        return get_automation_loop().run(self._start())
+
+    def stop(self) -> None:
+        """Disconnect all companions and stop listening."""
+        if self._server is not None:
+            get_automation_loop().run(self._stop())
+
+    @property
+    def address(self) -> Optional[Tuple[str, int]]:
+        """(host, port) being listened on, or None if not started."""
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[:2]
+
+    def subscribers(self) -> List[Dict[str, Any]]:
+        """Describe the connected companions."""
+        return [{"name": s.name, "workspaces": list(s.roots)} for s in list(self._subscribers)]
+
+    def subscriber_for(self, workspace_path: Optional[str], file_path: str) -> Optional[_Subscriber]:
+        """
+        Find the companion serving a request (call on the automation loop).
+
+        Args:
+            workspace_path: Workspace of the request (optional)
+            file_path: File being opened
+
+        Returns:
+            Optional[_Subscriber]: Best matching companion, or None
+        """
+        best, best_rank = None, -1
+        for subscriber in self._subscribers:
+            rank = subscriber.rank(workspace_path, file_path)
+            if rank > best_rank:
+                best, best_rank = subscriber, rank
+        return best
+
+    async def deliver(
+        self,
+        workspace_path: Optional[str],
+        file_path: str,
+        line: Optional[int],
+        message: str,
+        stored: StoredMessage,
+        auto_submit: bool
+    ) -> Tuple[bool, str]:
+        """
+        Hand a message to the companion serving the request and wait for its ack.
+
+        Args:
+            workspace_path: Workspace of the request (optional)
+            file_path: File that was opened
+            line: Line it was opened at (optional)
+            message: Message to insert into chat
+            stored: The message's entry in the message store
+            auto_submit: If True, the companion also submits the message
+
+        Returns:
+            Tuple[bool, str]: (delivered, error_message)
+        """
+        subscriber = self.subscriber_for(workspace_path, file_path)
+        if subscriber is None:
+            return False, "No companion connected"
+
+        frame = {
+            "type": "insert",
+            "id": next(self._ids),
+            "workspace": workspace_path,
+            "file": file_path,
+            "line": line,
+            "autoSubmit": auto_submit,
+        }
+        if stored.size <= Config.COMPANION_INLINE_MAX_BYTES:
+            frame["text"] = message
+        else:
+            # The companion reads the message store file; make sure it is written
+            await run_blocking(get_message_store().flush, Config.COMPANION_ACK_TIMEOUT)
+            frame.update(messageId=stored.id, path=stored.path, size=stored.size)
+
+        ack = asyncio.get_running_loop().create_future()
+        subscriber.pending[frame["id"]] = ack
+        try:
+            await subscriber.send(frame)
+            ok, error = await asyncio.wait_for(ack, Config.COMPANION_ACK_TIMEOUT)
+        except asyncio.TimeoutError:
+            ok, error = False, f"Companion '{subscriber.name}' did not acknowledge in time"
+        except (ConnectionError, OSError) as e:
+            ok, error = False, f"Companion '{subscriber.name}' unreachable: {e}"
+        finally:
+            subscriber.pending.pop(frame["id"], None)
+        if ok:
+            logger.info("Message delivered to companion '%s'", subscriber.name)
+        else:
+            logger.warning("Companion delivery failed: %s", error)
+        return ok, error
+
+    async def _start(self) -> bool:
+        if self._server is not None:
+            return True
+        try:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        except OSError as e:
+            logger.warning(
+                "Companion channel disabled, cannot listen on %s:%s: %s. "
+                "Messages will be delivered by clipboard and keystrokes",
+                self.host, self.port, e
+            )
+            return False
+        host, port = self.address
+        self._publish({"version": PROTOCOL_VERSION, "host": host, "port": port, "token": self.token, "pid": os.getpid()})
+        logger.info("Companion channel listening on %s:%s", host, port)
+        return True
+
+    async def _stop(self) -> None:
+        self._server.close()
+        for subscriber in list(self._subscribers):
+            subscriber.writer.close()
+        await self._server.wait_closed()
+        self._server = None
+        if self.info_path:
+            try:
+                os.remove(self.info_path)
+            except OSError:
+                pass
+
+    def _publish(self, info: Dict[str, Any]) -> None:
+        if not self.info_path:
+            return
+        tmp_path = self.info_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(info, f)
+            os.replace(tmp_path, self.info_path)
+        except OSError as e:
+            logger.warning("Could not publish companion channel info to %s: %s", self.info_path, e)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        subscriber = None
+        try:
+            hello = _parse(await asyncio.wait_for(reader.readline(), Config.COMPANION_HELLO_TIMEOUT))
+            if hello.get("type") != "hello" or not secrets.compare_digest(str(hello.get("token", "")), self.token):
+                logger.warning("Companion connection rejected (bad hello or token)")
+                return
+            workspaces = hello.get("workspaces")
+            subscriber = _Subscriber(
+                writer,
+                str(hello.get("name") or "companion"),
+                workspaces if isinstance(workspaces, list) else []
+            )
+            # Subscribed before the welcome, so requests after it are delivered
+            self._subscribers.append(subscriber)
+            await subscriber.send({"type": "welcome", "version": PROTOCOL_VERSION})
+            logger.info("Companion '%s' connected (%s workspace(s))", subscriber.name, len(subscriber.roots))
+            get_notice_board().publish(
+                'companion', f"Editor companion '{subscriber.name}' connected", connected=True, workspaces=subscriber.roots
+            )
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                frame = _parse(line)
+                if frame.get("type") == "ack":
+                    ack = subscriber.pending.get(frame.get("id"))
+                    if ack is not None and not ack.done():
+                        ack.set_result((bool(frame.get("ok")), str(frame.get("error") or "")))
+        except (asyncio.TimeoutError, ValueError, ConnectionError, OSError) as e:
+            logger.warning("Companion connection closed: %s", e)
+        finally:
+            if subscriber is not None:
+                self._subscribers.remove(subscriber)
+                for ack in subscriber.pending.values():
+                    if not ack.done():
+                        ack.set_result((False, f"Companion '{subscriber.name}' disconnected"))
+                logger.info("Companion '%s' disconnected", subscriber.name)
+                get_notice_board().publish(
+                    'companion', f"Editor companion '{subscriber.name}' disconnected", connected=False,
+                    workspaces=subscriber.roots
+                )
+            writer.close()
+
+
+def _parse(line: bytes) -> Dict[str, Any]:
+    frame = json.loads(line.decode('utf-8')) if line.strip() else {}
+    if not isinstance(frame, dict):
+        raise ValueError("frame is not a JSON object")
+    return frame
+
+
+class StandInCompanion:
+    """
+    Minimal companion for tests and benchmarks.
+
+    Connects with the published token, records every inserted message
+    (reading large ones from their message store file) and acknowledges it.
+    """
+
+    def __init__(self, address: Tuple[str, int], token: str, workspaces: List[str] = None, name: str = 'stand-in'):
+        self.inserted: List[str] = []
+        self.frames: List[Dict[str, Any]] = []
+        self._sock = socket.create_connection(address)
+        self._file = self._sock.makefile('rwb')
+        self._send({"type": "hello", "token": token, "name": name, "workspaces": workspaces or []})
+        welcome = _parse(self._file.readline())
+        if welcome.get("type") != "welcome":
+            raise ConnectionError("Companion channel did not welcome us")
+        self._thread = threading.Thread(target=self._run, name='stand-in-companion', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Disconnect."""
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        self._thread.join(timeout=1.0)
+
+    def _send(self, frame: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(frame).encode('utf-8') + b'\n')
+        self._file.flush()
+
+    def _run(self) -> None:
+        try:
+            for line in self._file:
+                frame = _parse(line)
+                if frame.get("type") != "insert":
+                    continue
+                self.frames.append(frame)
+                text = frame.get("text")
+                if text is None:
+                    with open(frame["path"], 'r', encoding='utf-8') as f:
+                        text = f.read()
+                self.inserted.append(text)
+                self._send({"type": "ack", "id": frame["id"], "ok": True})
+        except (OSError, ValueError):
+            pass
+
+
+_channel = None
+_channel_lock = threading.Lock()
+
+
+def get_companion_channel() -> CompanionChannel:
+    """
+    Get the shared companion channel (not started until ``start`` is called).
+
+    Returns:
+        CompanionChannel: The process-wide channel
+    """
+    global _channel
+    with _channel_lock:
+        if _channel is None:
+            _channel = CompanionChannel()
+        return _channel
+
+
+def set_companion_channel(channel: Optional[CompanionChannel]) -> Optional[CompanionChannel]:
+    """
+    Replace the shared companion channel.
+
+    Args:
+        channel: Channel to install, or None to reset
+
+    Returns:
+        Optional[CompanionChannel]: The previously installed channel
+    """
+    global _channel
+    with _channel_lock:
+        previous, _channel = _channel, channel
+        return previous
@@ -0,0 +1,187 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/cursor_launcher.py
+# Purpose: Cursor launcher - cached executable resolution and direct exec
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Cursor launcher.
+
+Resolves the real Cursor executable once (looking through the `cursor.cmd`
+CLI wrapper on Windows) and execs it directly, without a shell.
+"""
+import os
+import shutil
+import subprocess
+import threading
+from typing import List, NamedTuple, Optional
+from app.config import Config
+from app.utils.logger import get_logger
+from app.services.window_service import WindowService
+from app.services.process_tracker import get_process_tracker
+from app.services.window_index import get_window_index
+
+logger = get_logger(__name__)
+
+
+class LaunchResult(NamedTuple):
+    """Outcome of asking Cursor to open a file."""
+    ok: bool
+    note: str
+    was_running: bool
+    pid: Optional[int] = None
+
+
+class CursorLauncher:
+    """Launches Cursor through a cached, directly executed command."""
+
+    _lock = threading.Lock()
+    _command: Optional[List[str]] = None
+
+    @staticmethod
+    def resolve() -> Optional[List[str]]:
+        """
+        Resolve the command used to launch Cursor, once.
+
+        On Windows `cursor` is a `.cmd` wrapper in `resources/app/bin` that
+        starts the CLI, which in turn starts `Cursor.exe`; we exec the GUI
+        executable directly instead. Elsewhere symlinks are resolved.
+
+        Returns:
+            Optional[List[str]]: Command prefix, or None if Cursor cannot be found
+        """
+        with CursorLauncher._lock:
+            if CursorLauncher._command is None:
+                CursorLauncher._command = CursorLauncher._resolve_uncached()
+                if CursorLauncher._command:
+                    logger.info("Resolved Cursor executable: %s", CursorLauncher._command[0])
+            return CursorLauncher._command
+
+    @staticmethod
+    def invalidate() -> None:
+        """Forget the resolved executable (e.g. after Cursor was reinstalled)."""
+        with CursorLauncher._lock:
+            CursorLauncher._command = None
+
+    @staticmethod
+    def launch(workspace_path: Optional[str], file_path: str, line: Optional[int] = None) -> LaunchResult:
+        """
+        Open a file (and its workspace) in Cursor.
+
+        Whether Cursor was running is captured *before* spawning, so cold and
+        hot starts are told apart correctly.
+
+        Args:
+            workspace_path: Path to the workspace/repo root (optional)
+            file_path: Path to the file to open
+            line: 1-based line to open the file at (optional)
+
+        Returns:
+            LaunchResult: Launch outcome and the pre-launch running state
+        """
+        was_running = WindowService.is_cursor_running()
+        args = CursorLauncher._build_args(workspace_path, file_path, was_running, line)
+
+        try:
+            pid = CursorLauncher._spawn(args)
+        except Exception as e:
+            CursorLauncher.invalidate()
+            logger.warning("cursor command failed: %s, falling back to os.startfile", e)
+            try:
+                os.startfile(file_path)
+                logger.info("Opened file via os.startfile")
+                return LaunchResult(True, "(opened via os.startfile; 'cursor' command may not be on PATH)", was_running)
+            except Exception as e2:
+                logger.error("Failed to open file: %s", e2)
+                return LaunchResult(False, f"Failed to open file: {e2}", was_running)
+
+        note = f"workspace: {workspace_path}" if workspace_path and os.path.exists(workspace_path) else ""
+        return LaunchResult(True, note, was_running, pid)
+
+    @staticmethod
+    def open_workspace(workspace_path: str) -> LaunchResult:
+        """
+        Open a workspace in its own Cursor window without opening a file.
+
+        Used to pre-warm windows for workspaces that are likely to be
+        requested next.
+
+        Args:
+            workspace_path: Path to the workspace/repo root
+
+        Returns:
+            LaunchResult: Launch outcome and the pre-launch running state
+        """
+        was_running = WindowService.is_cursor_running()
+        get_window_index().expect(workspace_path)
+        try:
+            pid = CursorLauncher._spawn([workspace_path])
+        except Exception as e:
+            CursorLauncher.invalidate()
+            logger.warning("Failed to open workspace %s: %s", workspace_path, e)
+            return LaunchResult(False, f"Failed to open workspace: {e}", was_running)
+        return LaunchResult(True, f"workspace: {workspace_path}", was_running, pid)
+
+    @staticmethod
+    def _spawn(args: List[str]) -> int:
+        command = CursorLauncher.resolve()
+        if command is None:
+            raise FileNotFoundError(f"'{Config.CURSOR_EXECUTABLE_NAME}' not found")
+        process = subprocess.Popen(
+            command + args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True
+        )
+        get_process_tracker().register(process.pid)
+        logger.info("Spawned cursor (pid %s): %s", process.pid, ' '.join(args))
+        return process.pid
+
+    @staticmethod
+    def _build_args(
+        workspace_path: Optional[str],
+        file_path: str,
+        was_running: bool,
+        line: Optional[int] = None
+    ) -> List[str]:
+        # Cursor's goto form opens the file scrolled to the line
+        target = ["--goto", f"{file_path}:{line}"] if line else [file_path]
+        if workspace_path and os.path.exists(workspace_path):
+            # An already open folder is focused and the file opens in its window
+            if get_window_index().lookup(workspace_path) is not None:
+                logger.info("Reusing open workspace window: %s", workspace_path)
+            else:
+                logger.info("Opening workspace: %s", workspace_path)
+                get_window_index().expect(workspace_path)
+            logger.info("Then opening file: %s%s", file_path, f" at line {line}" if line else "")
+            return [workspace_path] + target
+
+        logger.info("No workspace provided, opening file directly: %s", file_path)
+        if was_running:
+            # Open in the running instance instead of spawning a new window
+            return ["--reuse-window"] + target
+        return target
+
+    @staticmethod
+    def _resolve_uncached() -> Optional[List[str]]:
+        configured = Config.CURSOR_EXECUTABLE_NAME
+        path = configured if os.path.isfile(configured) else shutil.which(configured)
+        if not path:
+            return None
+
+        if os.name == 'nt' and path.lower().endswith(('.cmd', '.bat')):
+            # <install>/resources/app/bin/cursor.cmd -> <install>/Cursor.exe
+            install_dir = os.path.abspath(os.path.join(os.path.dirname(path), '..', '..', '..'))
+            executable = os.path.join(install_dir, Config.CURSOR_PROCESS_NAME)
+            if os.path.isfile(executable):
+                return [executable]
+            logger.warning("Could not find %s next to %s, using the wrapper", Config.CURSOR_PROCESS_NAME, path)
+            return [os.environ.get('COMSPEC', 'cmd.exe'), '/c', path]
+
+        return [os.path.realpath(path)]
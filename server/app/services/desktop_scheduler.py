@@ -0,0 +1,156 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/desktop_scheduler.py
+# Purpose: Leases over the shared desktop for concurrently running jobs
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Cross-request scheduling of desktop automation.
+
+The automation queue runs several jobs at once on the automation loop. The
+stages that only concern their own request (locating the snippet, storing
+the message, spawning Cursor, waiting for its window and the file) overlap
+freely; what requests share is leased:
+
+- A window lease per workspace. A Cursor window shows one active editor, so
+  requests for the same workspace hold it from opening their file until the
+  message has been delivered into that window.
+- The desktop lease, exclusive across all requests, for the foreground
+  window, the clipboard and the keyboard. It is taken only for the copy,
+  focus and keystroke stages and released as soon as the paste is done.
+
+Leases are always taken in that order (window, then desktop), so they cannot
+deadlock. Both are asyncio locks and must be used on the automation loop.
+"""
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from app.utils.logger import get_logger
+from app.services import metrics
+
+logger = get_logger(__name__)
+
+
+def _key(workspace_path: Optional[str]) -> str:
+    # Without a workspace, files open in the running instance's window
+    if not workspace_path:
+        return ''
+    return os.path.normcase(os.path.normpath(os.path.abspath(workspace_path)))
+
+
+class DesktopScheduler:
+    """Window and desktop leases for jobs running on the automation loop."""
+
+    def __init__(self):
+        self._desktop: Optional[asyncio.Lock] = None  # Created on the loop at first use
+        self._windows: Dict[str, asyncio.Lock] = {}
+        self._window_users: Dict[str, int] = {}
+        self._holder: Optional[str] = None
+        self.leases = 0
+        self.held_seconds = 0.0
+
+    @asynccontextmanager
+    async def window(self, workspace_path: Optional[str]) -> AsyncIterator[None]:
+        """
+        Hold the window lease of a workspace.
+
+        Args:
+            workspace_path: Workspace whose window the request uses (optional)
+        """
+        key = _key(workspace_path)
+        lock = self._windows.get(key)
+        if lock is None:
+            lock = self._windows[key] = asyncio.Lock()
+        self._window_users[key] = self._window_users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._window_users[key] -= 1
+            if not self._window_users[key]:
+                del self._window_users[key]
+                del self._windows[key]
+
+    @asynccontextmanager
+    async def desktop(self, holder: str = "") -> AsyncIterator[None]:
+        """
+        Hold the exclusive desktop lease (foreground, clipboard, keyboard).
+
+        Time spent waiting for it and holding it is observed as the
+        ``desktop_wait`` and ``desktop_lease`` stages.
+
+        Args:
+            holder: Description of the holder, for logs and the snapshot
+        """
+        if self._desktop is None:
+            self._desktop = asyncio.Lock()
+        with metrics.observe_stage("desktop_wait"):
+            await self._desktop.acquire()
+        self._holder = holder
+        start = time.monotonic()
+        try:
+            with metrics.observe_stage("desktop_lease"):
+                yield
+        finally:
+            held = time.monotonic() - start
+            self._holder = None
+            self.leases += 1
+            self.held_seconds += held
+            self._desktop.release()
+            logger.debug("Desktop lease held %.3fs by %s", held, holder or 'a job')
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current leases.
+
+        Returns:
+            Dict[str, Any]: Desktop holder, leased windows and lease totals
+        """
+        return {
+            "desktopHeldBy": self._holder,
+            "windowsLeased": len(self._windows),
+            "leases": self.leases,
+            "heldSeconds": round(self.held_seconds, 3),
+        }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_desktop_scheduler() -> DesktopScheduler:
+    """
+    Get the shared desktop scheduler.
+
+    Returns:
+        DesktopScheduler: The process-wide scheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = DesktopScheduler()
+        return _scheduler
+
+
+def set_desktop_scheduler(scheduler: Optional[DesktopScheduler]) -> Optional[DesktopScheduler]:
+    """
+    Replace the shared desktop scheduler.
+
+    Args:
+        scheduler: Scheduler to install, or None to reset
+
+    Returns:
+        Optional[DesktopScheduler]: The previously installed scheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        previous, _scheduler = _scheduler, scheduler
+        return previous
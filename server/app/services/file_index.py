@@ -0,0 +1,341 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/file_index.py
+# Purpose: Per-workspace file index for resolving moved or renamed PR paths
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Per-workspace file index.
+
+A PR names files by their path on the PR branch, which may not exist locally:
+the checkout is on an older branch, the file moved, or the workspace is a
+subfolder of a monorepo. Each workspace gets an index of its files keyed by
+lower-cased basename and by ``parent/basename`` suffix, so a missing path is
+resolved to the local file sharing the longest path suffix with it (or to
+the only file with its name) without touching the disk.
+
+Indexes are built on a background thread the first time a workspace is seen
+and refreshed incrementally: only directories whose mtime changed are listed
+again.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SEPARATORS = re.compile(r'[\\/]+')
+
+
+def _segments(path: str) -> List[str]:
+    return [segment for segment in _SEPARATORS.split(path.lower()) if segment]
+
+
+def _common_suffix(a: List[str], b: List[str]) -> int:
+    n = 0
+    for x, y in zip(reversed(a), reversed(b)):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+def _list_directory(directory: str) -> Tuple[List[str], List[str]]:
+    files, subdirs = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in Config.FILE_INDEX_SKIP:
+                            subdirs.append(entry.name)
+                    elif entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subdirs
+
+
+class WorkspaceFileIndex:
+    """Basename and suffix index of the files below one workspace root."""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._dirs: Dict[str, Tuple[float, List[str], List[str]]] = {}  # rel dir -> (mtime, files, subdirs)
+        self._by_name: Dict[str, Set[str]] = {}  # basename -> rel paths
+        self._by_suffix: Dict[str, Set[str]] = {}  # "parent/basename" -> rel paths
+        self._ready = threading.Event()
+        self._refresh_done: Optional[threading.Event] = None  # Set when the pending refresh ends
+        self._refreshed_at = 0.0
+        self.files = 0
+
+    def refresh(self) -> None:
+        """
+        Bring the index up to date with the disk.
+
+        Every directory is stat'ed, but only those whose mtime changed since
+        the last refresh are listed again; the first refresh lists them all.
+        """
+        with self._refresh_lock:
+            start = time.monotonic()
+            with self._lock:
+                previous = self._dirs
+            dirs: Dict[str, Tuple[float, List[str], List[str]]] = {}
+            added: List[str] = []
+            removed: List[str] = []
+            listed = 0
+            stack = ['']
+            while stack:
+                rel = stack.pop()
+                directory = os.path.join(self.root, rel) if rel else self.root
+                try:
+                    mtime = os.stat(directory).st_mtime
+                except OSError:
+                    continue
+                old = previous.get(rel)
+                if old is not None and old[0] == mtime:
+                    files, subdirs = old[1], old[2]
+                else:
+                    files, subdirs = _list_directory(directory)
+                    listed += 1
+                    old_files = set(old[1]) if old is not None else set()
+                    new_files = set(files)
+                    added.extend(_join(rel, name) for name in new_files - old_files)
+                    removed.extend(_join(rel, name) for name in old_files - new_files)
+                dirs[rel] = (mtime, files, subdirs)
+                stack.extend(_join(rel, name) for name in subdirs)
+
+            for rel, (_, files, _) in previous.items():
+                if rel not in dirs:
+                    removed.extend(_join(rel, name) for name in files)
+
+            with self._lock:
+                for path in removed:
+                    self._discard(path)
+                for path in added:
+                    self._add(path)
+                self._dirs = dirs
+                self.files += len(added) - len(removed)
+                self._refreshed_at = time.monotonic()
+        self._ready.set()
+        logger.info(
+            "File index of %s: %d file(s), %d director(ies) listed in %.3fs",
+            self.root, self.files, listed, time.monotonic() - start
+        )
+
+    def refresh_in_background(self) -> threading.Event:
+        """
+        Start a refresh on a daemon thread unless one is already running.
+
+        Returns:
+            threading.Event: Set once the running (or started) refresh ends
+        """
+        with self._lock:
+            if self._refresh_done is not None:
+                return self._refresh_done
+            done = self._refresh_done = threading.Event()
+        threading.Thread(target=self._refresh_logged, args=(done,), name='file-index', daemon=True).start()
+        return done
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """
+        Wait for the first refresh to complete.
+
+        Args:
+            timeout: Maximum time to wait in seconds (None for no limit)
+
+        Returns:
+            bool: True if the index has been built
+        """
+        return self._ready.wait(timeout)
+
+    def age(self) -> float:
+        """Seconds since the last completed refresh."""
+        return time.monotonic() - self._refreshed_at
+
+    def resolve(self, path: str) -> Optional[str]:
+        """
+        Find the local file best matching a path that does not exist.
+
+        Candidates sharing the path's ``parent/basename`` suffix are ranked
+        by the longest trailing run of shared path segments; a file sharing
+        only the basename is considered only if none shares the suffix. The
+        single best candidate wins. When several tie (``src/index.ts`` in
+        every package of a monorepo, for a package added by the PR) nothing
+        says which one the PR meant, so the path is left unresolved rather
+        than opening an unrelated file.
+
+        Args:
+            path: Missing path (absolute, or relative to the repository root)
+
+        Returns:
+            Optional[str]: Absolute path of the best candidate, or None
+        """
+        segments = _segments(path)
+        if not segments:
+            return None
+        with self._lock:
+            candidates = self._by_suffix.get('/'.join(segments[-2:])) if len(segments) > 1 else None
+            if not candidates:
+                candidates = self._by_name.get(segments[-1])
+            if not candidates:
+                return None
+            candidates = list(candidates)
+        shared = {rel: _common_suffix(_segments(rel), segments) for rel in candidates}
+        longest = max(shared.values())
+        best = [rel for rel, n in shared.items() if n == longest]
+        if len(best) > 1:
+            logger.info(
+                "%d files share the last %d path segment(s) of %s, not guessing: %s",
+                len(best), longest, path, ', '.join(sorted(best)[:5])
+            )
+            return None
+        return os.path.join(self.root, *best[0].split('/'))
+
+    def _add(self, rel: str) -> None:
+        # Caller holds self._lock
+        for key in _keys(rel):
+            bucket = self._by_name if '/' not in key else self._by_suffix
+            bucket.setdefault(key, set()).add(rel)
+
+    def _discard(self, rel: str) -> None:
+        # Caller holds self._lock
+        for key in _keys(rel):
+            bucket = self._by_name if '/' not in key else self._by_suffix
+            paths = bucket.get(key)
+            if paths is not None:
+                paths.discard(rel)
+                if not paths:
+                    del bucket[key]
+
+    def _refresh_logged(self, done: threading.Event) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error("File index refresh of %s failed: %s", self.root, e)
+        finally:
+            with self._lock:
+                self._refresh_done = None
+            done.set()
+
+
+def _join(rel: str, name: str) -> str:
+    return f"{rel}/{name}" if rel else name
+
+
+def _keys(rel: str) -> Iterable[str]:
+    segments = rel.lower().split('/')
+    yield segments[-1]
+    if len(segments) > 1:
+        yield '/'.join(segments[-2:])
+
+
+class FileIndexes:
+    """The file indexes of the most recently used workspaces."""
+
+    def __init__(self, max_workspaces: int = None):
+        self.max_workspaces = max_workspaces if max_workspaces is not None else Config.FILE_INDEX_MAX_WORKSPACES
+        self._lock = threading.Lock()
+        self._indexes: "OrderedDict[str, WorkspaceFileIndex]" = OrderedDict()
+
+    def get(self, workspace_path: str) -> WorkspaceFileIndex:
+        """
+        Get a workspace's index, building or refreshing it in the background.
+
+        A new index starts its first build; an index older than
+        ``FILE_INDEX_REFRESH_SECONDS`` starts an incremental refresh. The
+        least recently used index is dropped beyond ``max_workspaces``.
+
+        Args:
+            workspace_path: Workspace/repo root
+
+        Returns:
+            WorkspaceFileIndex: The workspace's index (possibly still building)
+        """
+        key = os.path.normcase(os.path.abspath(workspace_path))
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+            else:
+                index = self._indexes[key] = WorkspaceFileIndex(workspace_path)
+                while len(self._indexes) > self.max_workspaces:
+                    self._indexes.popitem(last=False)
+        if not index.wait_ready(0) or index.age() >= Config.FILE_INDEX_REFRESH_SECONDS:
+            index.refresh_in_background()
+        return index
+
+    def resolve(self, workspace_path: str, file_path: str) -> Optional[str]:
+        """
+        Resolve a file path that does not exist within a workspace.
+
+        Waits up to ``FILE_INDEX_BUILD_WAIT`` for a first build. A miss on an
+        index that was not refreshed in the last ``FILE_INDEX_MIN_REFRESH``
+        seconds starts a background refresh, for files created since, and
+        retries if it completes within ``FILE_INDEX_MISS_WAIT``; the request
+        thread never walks the tree itself.
+
+        Args:
+            workspace_path: Workspace/repo root
+            file_path: Missing file path
+
+        Returns:
+            Optional[str]: Existing file path, or None if nothing matches
+        """
+        index = self.get(workspace_path)
+        if not index.wait_ready(Config.FILE_INDEX_BUILD_WAIT):
+            logger.warning("File index of %s is still building", workspace_path)
+            return None
+        found = index.resolve(file_path)
+        if found is None and index.age() >= Config.FILE_INDEX_MIN_REFRESH:
+            if index.refresh_in_background().wait(Config.FILE_INDEX_MISS_WAIT):
+                found = index.resolve(file_path)
+        return found
+
+
+_indexes = None
+_indexes_lock = threading.Lock()
+
+
+def get_file_indexes() -> FileIndexes:
+    """
+    Get the shared workspace file indexes.
+
+    Returns:
+        FileIndexes: The process-wide indexes
+    """
+    global _indexes
+    with _indexes_lock:
+        if _indexes is None:
+            _indexes = FileIndexes()
+        return _indexes
+
+
+def set_file_indexes(indexes: Optional[FileIndexes]) -> Optional[FileIndexes]:
+    """
+    Replace the shared workspace file indexes.
+
+    Args:
+        indexes: Indexes to install, or None to reset
+
+    Returns:
+        Optional[FileIndexes]: The previously installed indexes
+    """
+    global _indexes
+    with _indexes_lock:
+        previous, _indexes = _indexes, indexes
+        return previous
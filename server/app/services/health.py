@@ -0,0 +1,197 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/health.py
+# Purpose: Cached health/readiness state maintained in the background
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Health and readiness state.
+
+A background refresher checks what ``/open`` depends on (pywin32, a
+clipboard backend, a resolvable Cursor executable) every
+``HEALTH_REFRESH_INTERVAL`` seconds and keeps the result. Answering a health
+request only reads that state plus a few counters that are already kept in
+memory (queue depth, the window monitor's snapshot), so it never enumerates
+windows, touches the clipboard or spawns a process.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from app import __version__
+from app.config import Config
+from app.utils.logger import get_logger
+from app.services import window_service
+from app.services.clipboard_service import get_clipboard_backend
+from app.services.cursor_launcher import CursorLauncher
+from app.services.companion_channel import get_companion_channel
+from app.services.job_queue import get_automation_queue
+from app.services.desktop_scheduler import get_desktop_scheduler
+from app.services.window_monitor import WindowMonitor, get_window_monitor
+
+logger = get_logger(__name__)
+
+
+class HealthMonitor:
+    """Keeps the server's health state fresh on a daemon thread."""
+
+    def __init__(self, interval: float = None):
+        self.interval = interval if interval is not None else Config.HEALTH_REFRESH_INTERVAL
+        self._lock = threading.Lock()
+        self._checks: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._monitor: Optional[WindowMonitor] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the refresher (no-op if running)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the refresher."""
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=2.0)
+
+    def refresh(self) -> Dict[str, Any]:
+        """
+        Run the checks now and keep the result.
+
+        Returns:
+            Dict[str, Any]: The new checks
+        """
+        problems: List[str] = []
+
+        pywin32 = window_service.win32gui is not None
+        if not pywin32:
+            problems.append("pywin32 is not installed (pip install pywin32)")
+
+        backend = get_clipboard_backend()
+        if backend is None:
+            problems.append("No clipboard backend available (pip install pywin32 or pyperclip)")
+
+        command = CursorLauncher.resolve()
+        if command and not os.path.isfile(command[0]):
+            # Uninstalled or moved since it was resolved
+            CursorLauncher.invalidate()
+            command = CursorLauncher.resolve()
+        if not command:
+            problems.append(
+                f"Cursor executable '{Config.CURSOR_EXECUTABLE_NAME}' not found (set CURSOR_EXECUTABLE)"
+            )
+
+        checks = {
+            "pywin32": pywin32,
+            "clipboard": {"ok": backend is not None, "backend": type(backend).__name__ if backend else None},
+            "cursorExecutable": {"ok": bool(command), "path": command[-1] if command else None},
+        }
+        # Obtained here rather than on a request: its first use enumerates windows
+        monitor = get_window_monitor() if pywin32 else None
+        with self._lock:
+            self._checks = {"checks": checks, "problems": problems}
+            self._checked_at = time.time()
+            self._monitor = monitor
+        return checks
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the health state without running any check.
+
+        Returns:
+            Dict[str, Any]: Cached checks plus live queue, window and companion counts
+        """
+        with self._lock:
+            cached, checked_at, monitor = self._checks, self._checked_at, self._monitor
+        queue = get_automation_queue()
+        companions = len(get_companion_channel().subscribers())
+        windows = len(monitor.windows()) if monitor is not None else None
+
+        if cached is None:
+            return {
+                "status": "starting",
+                "ready": False,
+                "version": __version__,
+                "problems": ["Health checks have not run yet"],
+                "queue": {"depth": queue.depth()},
+            }
+
+        checks = cached["checks"]
+        # A connected companion delivers messages without the clipboard
+        ready = (
+            checks["pywin32"] and checks["cursorExecutable"]["ok"]
+            and (checks["clipboard"]["ok"] or companions > 0)
+        )
+        return {
+            "status": "ok" if not cached["problems"] else "degraded",
+            "ready": ready,
+            "version": __version__,
+            "serverMode": Config.SERVER_MODE,
+            "checks": checks,
+            "problems": cached["problems"],
+            "cursor": {"running": bool(windows), "windows": windows},
+            "companions": companions,
+            "queue": {
+                "depth": queue.depth(),
+                "running": queue.running(),
+                "idleSeconds": round(queue.idle_seconds(), 1),
+            },
+            "desktopHeldBy": get_desktop_scheduler().snapshot()["desktopHeldBy"],
+            "checkedAt": checked_at,
+            "age": round(time.time() - checked_at, 3),
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("Health check failed: %s", e)
+            self._stop.wait(self.interval)
+
+
+_health = None
+_health_lock = threading.Lock()
+
+
+def get_health_monitor() -> HealthMonitor:
+    """
+    Get the shared health monitor, starting its refresher on first use.
+
+    Returns:
+        HealthMonitor: The process-wide monitor
+    """
+    global _health
+    with _health_lock:
+        if _health is None:
+            _health = HealthMonitor()
+            _health.start()
+        return _health
+
+
+def set_health_monitor(monitor: Optional[HealthMonitor]) -> Optional[HealthMonitor]:
+    """
+    Replace the shared health monitor.
+
+    Args:
+        monitor: Monitor to install, or None to reset
+
+    Returns:
+        Optional[HealthMonitor]: The previously installed monitor
+    """
+    global _health
+    with _health_lock:
+        previous, _health = _health, monitor
+        return previous
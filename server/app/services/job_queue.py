@@ -0,0 +1,468 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/job_queue.py
+# Purpose: Bounded priority queue for desktop automation jobs
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Automation job queue.
+
+Requests are turned into jobs and run by ``JOB_CONCURRENCY`` workers, so
+their launches and waits overlap; the stages that need window focus, the
+clipboard or the keyboard take turns through the desktop scheduler. The
+queue is bounded: when it is full new jobs are rejected immediately instead
+of piling up blocked threads. Jobs may carry a de-duplication key: a
+submission whose key matches a job that is still queued or running, or that
+succeeded within the de-duplication window, is attached to that job instead
+of running again. Each job keeps a timestamped log of the pipeline stages it
+has passed, which clients can follow as a stream.
+"""
+import asyncio
+import itertools
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class JobStatus:
+    """Lifecycle states of a job."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted to a full queue."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Automation queue is full")
+        self.retry_after = retry_after
+
+
+class AutomationError(Exception):
+    """Raised by a job to report a failure with a user-facing error."""
+
+    def __init__(self, error: str, detail: str = ""):
+        super().__init__(error)
+        self.error = error
+        self.detail = detail
+
+
+class JobCancelled(Exception):
+    """Raised at a stage boundary when the client has cancelled the job."""
+
+
+class Job:
+    """A queued unit of automation work, its timing and its stage events."""
+
+    def __init__(self, kind: str, func: Callable[["Job"], Dict[str, Any]], priority: int):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.priority = priority
+        self.status = JobStatus.QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.detail: Optional[str] = None
+        self.events: List[Dict[str, Any]] = []
+        self._func = func
+        self._cond = threading.Condition()
+        self._wakers: List[Callable[[], None]] = []
+        self._cancel_requested = False
+
+    @property
+    def finished(self) -> bool:
+        """True once the job has succeeded, failed or been cancelled."""
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+    def report(self, stage: str, **data) -> None:
+        """
+        Record that the pipeline reached a stage.
+
+        Called by pipelines at their stage boundaries; doubles as the point
+        where a cancelled job stops.
+
+        Args:
+            stage: Stage name, e.g. "launch" or "file_loaded"
+            **data: Extra JSON-compatible details for the event
+
+        Raises:
+            JobCancelled: If the client cancelled the job
+        """
+        if self._cancel_requested:
+            raise JobCancelled()
+        self._emit(stage, data)
+
+    def events_since(self, seq: int, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Get events after ``seq``, blocking until one arrives or the job ends.
+
+        Args:
+            seq: Number of events the caller has already seen
+            timeout: Maximum time to block in seconds
+
+        Returns:
+            List[Dict[str, Any]]: New events (empty on timeout)
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: len(self.events) > seq or self.finished, timeout)
+            return self.events[seq:]
+
+    async def wait_events(self, seq: int, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Coroutine version of ``events_since`` that suspends instead of blocking.
+
+        Args:
+            seq: Number of events the caller has already seen
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            List[Dict[str, Any]]: New events (empty on timeout)
+        """
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+
+        def wake():
+            loop.call_soon_threadsafe(event.set)
+
+        with self._cond:
+            if len(self.events) > seq or self.finished:
+                return self.events[seq:]
+            self._wakers.append(wake)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._cond:
+                if wake in self._wakers:
+                    self._wakers.remove(wake)
+        with self._cond:
+            return self.events[seq:]
+
+    def cancel(self) -> bool:
+        """
+        Ask the job to stop.
+
+        Queued jobs are dropped; running jobs stop at their next stage.
+
+        Returns:
+            bool: False if the job had already finished
+        """
+        with self._cond:
+            if self.finished:
+                return False
+            self._cancel_requested = True
+            if self.status == JobStatus.QUEUED:
+                self.finished_at = time.time()
+                self._finish(JobStatus.CANCELLED)
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the job for the status endpoint.
+
+        Returns:
+            Dict[str, Any]: JSON-compatible job status and timing
+        """
+        data = {
+            "jobId": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "queuedSeconds": round((self.started_at or time.time()) - self.created_at, 3),
+        }
+        if self.started_at is not None:
+            data["runSeconds"] = round((self.finished_at or time.time()) - self.started_at, 3)
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+            data["detail"] = self.detail
+        return data
+
+    def run(self) -> None:
+        """Execute the job, recording its outcome."""
+        with self._cond:
+            if self.finished:
+                return
+            self.status = JobStatus.RUNNING
+            self.started_at = time.time()
+        self._emit(JobStatus.RUNNING, {})
+        try:
+            result = self._func(self)
+            status = JobStatus.SUCCEEDED
+        except JobCancelled:
+            status = JobStatus.CANCELLED
+        except AutomationError as e:
+            self.error, self.detail = e.error, e.detail
+            status = JobStatus.FAILED
+        except Exception as e:
+            logger.error("Job %s crashed: %s", self.id, e, exc_info=True)
+            self.error, self.detail = "Automation failed", str(e)
+            status = JobStatus.FAILED
+        else:
+            self.result = result
+        with self._cond:
+            self.finished_at = time.time()
+            self._func = None
+            self._finish(status)
+
+    def _emit(self, stage: str, data: Dict[str, Any]) -> None:
+        with self._cond:
+            now = time.time()
+            self.events.append({
+                "seq": len(self.events) + 1,
+                "stage": stage,
+                "at": now,
+                "elapsed": round(now - self.created_at, 3),
+                **data
+            })
+            self._cond.notify_all()
+            for wake in self._wakers:
+                try:
+                    wake()
+                except RuntimeError:
+                    # Waiter's loop has closed
+                    pass
+
+    def _finish(self, status: str) -> None:
+        # Caller holds self._cond
+        self.status = status
+        data = {}
+        if self.result is not None:
+            data = {"result": self.result}
+        if self.error is not None:
+            data = {"error": self.error, "detail": self.detail}
+        self._emit(status, data)
+
+
+def sse_message(event: Dict[str, Any]) -> str:
+    """
+    Format a job event as a Server-Sent Events message.
+
+    Args:
+        event: Event from ``Job.events``
+
+    Returns:
+        str: SSE message (id, event name and JSON data)
+    """
+    return f"id: {event['seq']}\nevent: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+
+
+class AutomationQueue:
+    """
+    Bounded priority queue with a pool of worker threads.
+
+    Lower priority values start first; jobs of equal priority start in
+    submission order. Finished jobs are kept for status lookups for
+    ``Config.JOB_RETENTION_SECONDS``.
+    """
+
+    def __init__(
+        self,
+        max_size: int = None,
+        retention: float = None,
+        dedup_window: float = None,
+        concurrency: int = None
+    ):
+        self.max_size = max_size if max_size is not None else Config.JOB_QUEUE_MAX_SIZE
+        self.retention = retention if retention is not None else Config.JOB_RETENTION_SECONDS
+        self.dedup_window = dedup_window if dedup_window is not None else Config.DEDUP_WINDOW_SECONDS
+        self._queue = queue.PriorityQueue(maxsize=self.max_size)
+        self._sequence = itertools.count()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._by_key: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self.concurrency = max(1, concurrency if concurrency is not None else Config.JOB_CONCURRENCY)
+        self._average_run = Config.JOB_RETRY_AFTER
+        self._running = 0
+        self._last_active = time.monotonic()
+        self._workers = [
+            threading.Thread(target=self._run, name=f'automation-worker-{i}', daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, kind: str, func: Callable[[Job], Dict[str, Any]], priority: int) -> Job:
+        """
+        Enqueue a job.
+
+        Args:
+            kind: Job kind, e.g. "open" or "open-file"
+            func: Work to run, called with the job (for ``job.report``);
+                returns the result payload
+            priority: Lower runs first
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            QueueFullError: If the queue is at capacity
+        """
+        with self._lock:
+            return self._enqueue(kind, func, priority)
+
+    def submit_once(
+        self,
+        kind: str,
+        func: Callable[[Job], Dict[str, Any]],
+        priority: int,
+        key: str
+    ) -> Tuple[Job, bool]:
+        """
+        Enqueue a job unless an equivalent one is in flight or recently succeeded.
+
+        Args:
+            kind: Job kind, e.g. "open" or "open-file"
+            func: Work to run, called with the job (for ``job.report``)
+            priority: Lower runs first
+            key: De-duplication key (request fingerprint or idempotency key)
+
+        Returns:
+            Tuple[Job, bool]: The job, and True if it was newly queued
+                (False if the submission was attached to an existing job)
+
+        Raises:
+            QueueFullError: If a new job is needed and the queue is at capacity
+        """
+        with self._lock:
+            existing = self._by_key.get(key)
+            if existing is not None and self._attachable(existing):
+                logger.info("Duplicate %s request attached to job %s", kind, existing.id)
+                return existing, False
+            job = self._enqueue(kind, func, priority)
+            self._by_key[key] = job
+            return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job by id.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Optional[Job]: The job, or None if unknown or expired
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def depth(self) -> int:
+        """Number of jobs waiting to run."""
+        return self._queue.qsize()
+
+    def running(self) -> int:
+        """Number of jobs running."""
+        return self._running
+
+    def idle_seconds(self) -> float:
+        """
+        Time since the queue last had work.
+
+        Returns:
+            float: Seconds since the last job finished or was submitted
+                (0 while a job is queued or running)
+        """
+        if self._running or self.depth():
+            return 0.0
+        return time.monotonic() - self._last_active
+
+    def retry_after(self) -> int:
+        """
+        Estimate how long until a slot frees up.
+
+        Returns:
+            int: Seconds, suitable for a ``Retry-After`` header
+        """
+        return max(1, int(round(self._average_run / self.concurrency)))
+
+    def _run(self) -> None:
+        while True:
+            _, _, job = self._queue.get()
+            if job.finished:
+                # Cancelled while queued
+                self._queue.task_done()
+                continue
+            logger.info("Running %s job %s", job.kind, job.id)
+            with self._lock:
+                self._running += 1
+            try:
+                job.run()
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._last_active = time.monotonic()
+            run_seconds = job.finished_at - job.started_at
+            with self._lock:
+                self._average_run = 0.8 * self._average_run + 0.2 * run_seconds
+            logger.info("Job %s %s in %.1fs", job.id, job.status, run_seconds)
+            self._queue.task_done()
+
+    def _enqueue(self, kind: str, func: Callable[[Job], Dict[str, Any]], priority: int) -> Job:
+        # Caller holds self._lock
+        job = Job(kind, func, priority)
+        job.report(JobStatus.QUEUED)
+        try:
+            self._queue.put_nowait((priority, next(self._sequence), job))
+        except queue.Full:
+            raise QueueFullError(self.retry_after())
+        self._prune()
+        self._jobs[job.id] = job
+        self._last_active = time.monotonic()
+        logger.info("Queued %s job %s (depth %d)", kind, job.id, self.depth())
+        return job
+
+    def _attachable(self, job: Job) -> bool:
+        # Failed and cancelled jobs are retried; successes count for the window
+        if not job.finished:
+            return True
+        return job.status == JobStatus.SUCCEEDED and time.time() - job.finished_at < self.dedup_window
+
+    def _prune(self) -> None:
+        # Caller holds self._lock
+        cutoff = time.time() - self.retention
+        for job_id, job in list(self._jobs.items()):
+            if job.finished and job.finished_at < cutoff:
+                del self._jobs[job_id]
+        for key, job in list(self._by_key.items()):
+            if job.finished and not self._attachable(job):
+                del self._by_key[key]
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_automation_queue() -> AutomationQueue:
+    """
+    Get the shared automation queue, starting its worker on first use.
+
+    Returns:
+        AutomationQueue: The process-wide queue
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = AutomationQueue()
+        return _queue
@@ -0,0 +1,402 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/keystrokes.py
+# Purpose: Keystroke engine - declarative key sequences replayed as batched input
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Keystroke sequencing engine.
+
+Key sequences are written like VS Code keybindings: a chord is keys joined by
+``+`` (``ctrl+shift+l``), chords are separated by spaces (``ctrl+k ctrl+l``)
+and a token such as ``50ms`` or ``0.2s`` is an explicit pause. A sequence is
+compiled once into batches of key events - one batch per chord, injected
+with a single ``SendInput`` call so no other input can interleave - and the
+pauses between them, then replayed through a pluggable keyboard backend.
+
+The sequences the paste pipeline sends are named (``dismiss``, ``open_chat``,
+``paste``, ``submit``) and configured through ``KEYS_<NAME>``, so they can
+follow custom Cursor keybindings. A recording backend keeps the exact event
+stream and the time spent pausing, for tests and the simulated desktop.
+"""
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import win32api
+except Exception:
+    win32api = None
+
+try:
+    import ctypes
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+except Exception:
+    ctypes = None
+    wintypes = None
+    user32 = None
+
+INPUT_KEYBOARD = 1
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+
+MODIFIERS = {'ctrl': 0x11, 'shift': 0x10, 'alt': 0x12, 'win': 0x5B}
+KEY_NAMES = {
+    **MODIFIERS,
+    'control': 0x11, 'meta': 0x5B, 'cmd': 0x5B,
+    'esc': 0x1B, 'escape': 0x1B, 'enter': 0x0D, 'return': 0x0D, 'tab': 0x09, 'space': 0x20,
+    'backspace': 0x08, 'delete': 0x2E, 'insert': 0x2D, 'home': 0x24, 'end': 0x23,
+    'pageup': 0x21, 'pagedown': 0x22, 'left': 0x25, 'up': 0x26, 'right': 0x27, 'down': 0x28,
+    ';': 0xBA, '=': 0xBB, 'plus': 0xBB, ',': 0xBC, '-': 0xBD, '.': 0xBE, '/': 0xBF, '`': 0xC0,
+    '[': 0xDB, '\\': 0xDC, ']': 0xDD, "'": 0xDE,
+    **{chr(c).lower(): c for c in range(ord('A'), ord('Z') + 1)},
+    **{chr(c): c for c in range(ord('0'), ord('9') + 1)},
+    **{f'f{n}': 0x6F + n for n in range(1, 25)},
+}
+# Keys SendInput must flag as extended, or they arrive as their numpad twins
+EXTENDED_KEYS = frozenset({0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28, 0x2D, 0x2E, 0x5B})
+
+_PAUSE = re.compile(r'^(\d+(?:\.\d+)?)(ms|s)$')
+
+
+class KeyEvent(NamedTuple):
+    """A single key transition."""
+    vk: int  # Virtual-key code
+    up: bool = False  # Key release rather than press
+
+
+class KeyBatch(NamedTuple):
+    """Key events injected together, and the pause that follows them."""
+    events: Tuple[KeyEvent, ...]
+    pause: float = 0.0  # Seconds
+
+
+class KeySequence:
+    """
+    A compiled key sequence.
+
+    Build one with ``KeySequence.parse``; ``replay`` sends it.
+    """
+
+    def __init__(self, spec: str, batches: List[KeyBatch]):
+        self.spec = spec
+        self.batches = batches
+
+    @classmethod
+    def parse(cls, spec: str, chord_gap: float = None) -> "KeySequence":
+        """
+        Compile a sequence such as ``"esc"``, ``"ctrl+l"`` or ``"ctrl+k 50ms ctrl+l"``.
+
+        Args:
+            spec: Chords separated by spaces, optionally with pauses
+            chord_gap: Pause between consecutive chords without an explicit
+                pause (defaults to ``KEY_CHORD_GAP``)
+
+        Returns:
+            KeySequence: The compiled sequence
+
+        Raises:
+            ValueError: If a key name is unknown or a chord is malformed
+        """
+        gap = chord_gap if chord_gap is not None else Config.KEY_CHORD_GAP
+        batches: List[KeyBatch] = []
+        paused = False
+        for token in spec.lower().split():
+            match = _PAUSE.match(token)
+            if match:
+                seconds = float(match.group(1)) / (1000.0 if match.group(2) == 'ms' else 1.0)
+                if batches:
+                    previous = batches[-1]
+                    batches[-1] = previous._replace(pause=(previous.pause if paused else 0.0) + seconds)
+                else:
+                    batches.append(KeyBatch((), seconds))
+                paused = True
+                continue
+            if batches and not paused:
+                batches[-1] = batches[-1]._replace(pause=gap)
+            batches.append(KeyBatch(cls._chord_events(token)))
+            paused = False
+        if not any(batch.events for batch in batches):
+            raise ValueError(f"Key sequence '{spec}' presses no keys")
+        return cls(spec, batches)
+
+    @staticmethod
+    def _chord_events(chord: str) -> Tuple[KeyEvent, ...]:
+        names = chord.split('+')
+        if '' in names:
+            raise ValueError(f"Malformed chord '{chord}' (use 'plus' for the + key)")
+        unknown = [name for name in names if name not in KEY_NAMES]
+        if unknown:
+            raise ValueError(f"Unknown key '{unknown[0]}' in chord '{chord}'")
+        codes = [KEY_NAMES[name] for name in names]
+        modifiers = [vk for vk in codes if vk in MODIFIERS.values()]
+        keys = [vk for vk in codes if vk not in modifiers]
+        if len(keys) > 1:
+            raise ValueError(f"Chord '{chord}' has more than one non-modifier key")
+        # Modifiers go down in order and come up in reverse around the key
+        pressed = modifiers + keys
+        return tuple(KeyEvent(vk) for vk in pressed) + tuple(KeyEvent(vk, up=True) for vk in reversed(pressed))
+
+    def followed_by(self, other: "KeySequence", pause: float) -> "KeySequence":
+        """
+        Chain another sequence after this one.
+
+        Args:
+            other: Sequence sent next
+            pause: Seconds between the two (replaces this sequence's trailing pause)
+
+        Returns:
+            KeySequence: The combined sequence
+        """
+        batches = list(self.batches)
+        batches[-1] = batches[-1]._replace(pause=pause)
+        return KeySequence(f"{self.spec} {pause * 1000:g}ms {other.spec}", batches + other.batches)
+
+    @property
+    def events(self) -> List[KeyEvent]:
+        """Every key event in order."""
+        return [event for batch in self.batches for event in batch.events]
+
+    @property
+    def sends(self) -> int:
+        """Number of input batches (``SendInput`` calls) a replay makes."""
+        return sum(1 for batch in self.batches if batch.events)
+
+    @property
+    def cost(self) -> float:
+        """Seconds a replay spends pausing."""
+        return sum(batch.pause for batch in self.batches)
+
+    def replay(self, backend: "KeyboardBackend" = None) -> None:
+        """
+        Send the sequence (blocking for its pauses).
+
+        Args:
+            backend: Backend to send through (defaults to the shared one)
+
+        Raises:
+            RuntimeError: If no keyboard backend is available
+        """
+        backend = backend or get_keyboard_backend()
+        if backend is None:
+            raise RuntimeError("No keyboard backend available (pywin32 not installed)")
+        for batch in self.batches:
+            if batch.events:
+                backend.send(batch.events)
+            if batch.pause > 0:
+                backend.wait(batch.pause)
+
+    def __repr__(self) -> str:
+        return f"KeySequence({self.spec!r}, sends={self.sends}, cost={self.cost:.3f}s)"
+
+
+class KeyboardBackend(ABC):
+    """Injects key events into the system input stream."""
+
+    @abstractmethod
+    def send(self, events: Tuple[KeyEvent, ...]) -> None:
+        """Inject events as one batch (raises on failure)."""
+
+    def wait(self, seconds: float) -> None:
+        """Pause between batches."""
+        time.sleep(seconds)
+
+
+if user32 is not None:
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = [
+            ('wVk', wintypes.WORD),
+            ('wScan', wintypes.WORD),
+            ('dwFlags', wintypes.DWORD),
+            ('time', wintypes.DWORD),
+            ('dwExtraInfo', ctypes.c_size_t),
+        ]
+
+    class _MOUSEINPUT(ctypes.Structure):
+        # Only here so the INPUT union has its real size
+        _fields_ = [
+            ('dx', wintypes.LONG),
+            ('dy', wintypes.LONG),
+            ('mouseData', wintypes.DWORD),
+            ('dwFlags', wintypes.DWORD),
+            ('time', wintypes.DWORD),
+            ('dwExtraInfo', ctypes.c_size_t),
+        ]
+
+    class _INPUT(ctypes.Structure):
+        class _UNION(ctypes.Union):
+            _fields_ = [('ki', _KEYBDINPUT), ('mi', _MOUSEINPUT)]
+
+        _anonymous_ = ('u',)
+        _fields_ = [('type', wintypes.DWORD), ('u', _UNION)]
+
+
+class SendInputBackend(KeyboardBackend):
+    """Keyboard backend injecting each batch with a single ``SendInput`` call."""
+
+    def send(self, events: Tuple[KeyEvent, ...]) -> None:
+        inputs = (_INPUT * len(events))()
+        for item, event in zip(inputs, events):
+            item.type = INPUT_KEYBOARD
+            item.ki.wVk = event.vk
+            item.ki.dwFlags = (KEYEVENTF_KEYUP if event.up else 0) | (
+                KEYEVENTF_EXTENDEDKEY if event.vk in EXTENDED_KEYS else 0
+            )
+        sent = user32.SendInput(len(events), inputs, ctypes.sizeof(_INPUT))
+        if sent != len(events):
+            # Blocked, e.g. by a higher-integrity foreground window
+            raise OSError(f"SendInput injected {sent} of {len(events)} key events")
+
+
+class KeybdEventBackend(KeyboardBackend):
+    """Keyboard backend calling ``keybd_event`` per event, back to back (pywin32)."""
+
+    def send(self, events: Tuple[KeyEvent, ...]) -> None:
+        for event in events:
+            flags = (KEYEVENTF_KEYUP if event.up else 0) | (KEYEVENTF_EXTENDEDKEY if event.vk in EXTENDED_KEYS else 0)
+            win32api.keybd_event(event.vk, 0, flags, 0)
+
+
+class RecordingKeyboardBackend(KeyboardBackend):
+    """
+    Records key events instead of (or before) delivering them.
+
+    ``batches`` holds every batch sent and ``waited`` the total pause time,
+    so tests can assert on the exact event stream and its timing cost.
+
+    Args:
+        sink: Optional callable receiving each event (e.g. a simulated application)
+        real_time: If True, pauses really sleep; otherwise they are only counted
+    """
+
+    def __init__(self, sink: Optional[Callable[[KeyEvent], None]] = None, real_time: bool = False):
+        self.sink = sink
+        self.real_time = real_time
+        self._lock = threading.Lock()
+        self.batches: List[Tuple[KeyEvent, ...]] = []
+        self.waited = 0.0
+
+    def send(self, events: Tuple[KeyEvent, ...]) -> None:
+        with self._lock:
+            self.batches.append(tuple(events))
+        if self.sink:
+            for event in events:
+                self.sink(event)
+
+    def wait(self, seconds: float) -> None:
+        with self._lock:
+            self.waited += seconds
+        if self.real_time:
+            time.sleep(seconds)
+
+    @property
+    def events(self) -> List[KeyEvent]:
+        """Every recorded event in order."""
+        with self._lock:
+            return [event for batch in self.batches for event in batch]
+
+    def clear(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self.batches.clear()
+            self.waited = 0.0
+
+
+_backend = None
+_backend_chosen = False
+_backend_lock = threading.Lock()
+
+
+def _create_backend() -> Optional[KeyboardBackend]:
+    name = Config.KEYBOARD_BACKEND
+    if name == 'recording':
+        return RecordingKeyboardBackend()
+    if name in ('auto', 'sendinput') and user32 is not None:
+        return SendInputBackend()
+    if name not in ('auto', 'sendinput', 'keybd_event'):
+        logger.warning("Unknown KEYBOARD_BACKEND '%s'", name)
+    return KeybdEventBackend() if win32api is not None else None
+
+
+def get_keyboard_backend() -> Optional[KeyboardBackend]:
+    """
+    Get the shared keyboard backend, chosen by ``KEYBOARD_BACKEND``.
+
+    Returns:
+        Optional[KeyboardBackend]: The process-wide backend, or None if keys
+            cannot be injected on this system
+    """
+    global _backend, _backend_chosen
+    with _backend_lock:
+        if not _backend_chosen:
+            _backend = _create_backend()
+            _backend_chosen = True
+            logger.info("Keyboard backend: %s", type(_backend).__name__ if _backend else 'none')
+        return _backend
+
+
+def set_keyboard_backend(backend: Optional[KeyboardBackend]) -> Optional[KeyboardBackend]:
+    """
+    Replace the shared keyboard backend (e.g. with a recording one).
+
+    Args:
+        backend: Backend to install, or None to choose one again on next use
+
+    Returns:
+        Optional[KeyboardBackend]: The previously installed backend
+    """
+    global _backend, _backend_chosen
+    with _backend_lock:
+        previous, _backend = _backend, backend
+        _backend_chosen = backend is not None
+        return previous
+
+
+_sequences: Dict[str, KeySequence] = {}
+_sequences_lock = threading.Lock()
+
+
+def get_key_sequence(name: str) -> KeySequence:
+    """
+    Get a named sequence, compiled from ``KEYS_<NAME>`` on first use.
+
+    An invalid configured sequence is logged and replaced by the default.
+
+    Args:
+        name: Sequence name, e.g. "open_chat"
+
+    Returns:
+        KeySequence: The compiled sequence
+    """
+    with _sequences_lock:
+        sequence = _sequences.get(name)
+        if sequence is None:
+            try:
+                sequence = KeySequence.parse(Config.KEY_SEQUENCES[name])
+            except ValueError as e:
+                logger.error("Invalid KEYS_%s: %s; using '%s'", name.upper(), e, Config.KEY_SEQUENCE_DEFAULTS[name])
+                sequence = KeySequence.parse(Config.KEY_SEQUENCE_DEFAULTS[name])
+            _sequences[name] = sequence
+        return sequence
+
+
+def press(name: str) -> None:
+    """
+    Send a named sequence (blocking; runs on the executor).
+
+    Args:
+        name: Sequence name, e.g. "paste"
+    """
+    get_key_sequence(name).replay()
@@ -12,12 +12,7 @@
 """
 Message handling service for combining and storing messages.
 """
-import os
-import tempfile
-from app.config import Config
-from app.utils.logger import get_logger
-
-logger = get_logger(__name__)
+from app.services.message_store import StoredMessage, get_message_store
 
 
 class MessageService:
@@ -28,6 +23,10 @@ class MessageService:
         """
         Create a readable combined message from comment and code snippet.
         
+        The result is allocated once, at its final size, and shared by the
+        message store, companion and clipboard stages. (The job also keeps the
+        code snippet itself, for locating its line.)
+        
         Args:
             comment: Comment text
             code_snippet: Code snippet text
@@ -37,27 +36,24 @@ class MessageService:
         """
         parts = []
         if comment is not None and comment:
-            parts.append(str(comment))
-        if code_snippet is not None and code_snippet.strip():
+            parts.append(comment if isinstance(comment, str) else str(comment))
+        if code_snippet and not code_snippet.isspace():
             parts.append("\n--- CODE SNIPPET ---\n")
-            parts.append(str(code_snippet))
+            parts.append(code_snippet)
         return "\n".join(parts)
     
     @staticmethod
-    def save_to_temp(message: str) -> str:
+    def store(message: str) -> StoredMessage:
         """
-        Save message to a temporary file.
+        Save message to the content-addressed message store.
+        
+        The file is written in the background; storing a message that is
+        already in the store does not write it again.
         
         Args:
             message: Message content to save
             
         Returns:
-            str: Path to the saved file
+            StoredMessage: Id and file path of the stored message
         """
-        tmpdir = tempfile.gettempdir()
-        path = os.path.join(tmpdir, Config.TMP_MESSAGE_FILENAME)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(message or "")
-        logger.info(f"Saved message to: {path}")
-        return path
-
+        return get_message_store().put(message)
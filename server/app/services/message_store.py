@@ -0,0 +1,275 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/message_store.py
+# Purpose: Content-addressed message store with write-behind and eviction
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Content-addressed store for pasted messages.
+
+Every message is kept in its own file named after the SHA-256 of its text, so
+concurrent requests never overwrite each other and a repeated message maps to
+the entry that already exists. Files are written by a background writer
+(``put`` only hashes and enqueues), the most recent messages are also kept in
+memory for cheap lookups, and the oldest entries are evicted once the store
+exceeds its entry or byte limits.
+"""
+import hashlib
+import os
+import queue
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SUFFIX = '.txt'
+
+
+class StoredMessage(NamedTuple):
+    """A message's identity in the store."""
+    id: str
+    path: str
+    size: int  # UTF-8 bytes
+
+
+class MessageStore:
+    """
+    Content-addressed message files with an in-memory LRU of recent texts.
+
+    Index entries are ordered from least to most recently used; eviction
+    removes from the front until both limits hold again.
+    """
+
+    def __init__(
+        self,
+        directory: str = None,
+        max_entries: int = None,
+        max_bytes: int = None,
+        cache_bytes: int = None
+    ):
+        self.directory = directory or Config.MESSAGE_STORE_DIR
+        self.max_entries = max_entries if max_entries is not None else Config.MESSAGE_STORE_MAX_ENTRIES
+        self.max_bytes = max_bytes if max_bytes is not None else Config.MESSAGE_STORE_MAX_BYTES
+        self.cache_bytes = cache_bytes if cache_bytes is not None else Config.MESSAGE_CACHE_BYTES
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # id -> size
+        self._total_bytes = 0
+        self._cache: "OrderedDict[str, str]" = OrderedDict()  # id -> text
+        self._cache_total = 0
+        self._pending: Dict[str, str] = {}  # id -> text not yet on disk
+        self._lock = threading.Lock()
+        self._writes: "queue.Queue[Tuple[str, str, Any]]" = queue.Queue()  # (op, id, text or flush event)
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+        self._writer = threading.Thread(target=self._write_loop, name='message-store-writer', daemon=True)
+        self._writer.start()
+
+    def put(self, message: str) -> StoredMessage:
+        """
+        Store a message.
+
+        Hashing happens on the caller; the file is written in the background.
+        Storing a message that is already present only marks it as recently
+        used.
+
+        Args:
+            message: Message text
+
+        Returns:
+            StoredMessage: The message's id, file path and size
+        """
+        message = message or ""
+        digest = hashlib.sha256()
+        size = 0
+        # Hash in chunks rather than encoding the whole message at once
+        for start in range(0, len(message), Config.MESSAGE_WRITE_CHUNK):
+            chunk = message[start:start + Config.MESSAGE_WRITE_CHUNK].encode('utf-8')
+            digest.update(chunk)
+            size += len(chunk)
+        message_id = digest.hexdigest()
+        stored = StoredMessage(message_id, self.path_for(message_id), size)
+
+        with self._lock:
+            if message_id in self._index:
+                self._index.move_to_end(message_id)
+                self._remember(message_id, message)
+                logger.info("Message %s already stored", message_id[:12])
+                return stored
+            self._index[message_id] = size
+            self._total_bytes += size
+            self._remember(message_id, message)
+            self._pending[message_id] = message
+            self._writes.put(('write', message_id, message))
+            self._evict()
+
+        logger.info("Storing message %s (%d bytes) at %s", message_id[:12], size, stored.path)
+        return stored
+
+    def get(self, message_id: str) -> Optional[str]:
+        """
+        Fetch a stored message by id.
+
+        Recent messages are served from memory; older ones are read from disk.
+
+        Args:
+            message_id: Id returned by ``put``
+
+        Returns:
+            Optional[str]: Message text, or None if unknown or evicted
+        """
+        with self._lock:
+            if message_id not in self._index:
+                return None
+            self._index.move_to_end(message_id)
+            text = self._cache.get(message_id)
+            if text is not None:
+                self._cache.move_to_end(message_id)
+                return text
+            text = self._pending.get(message_id)
+            if text is not None:
+                return text
+        try:
+            with open(self.path_for(message_id), 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            # Removed behind our back
+            return None
+
+    def path_for(self, message_id: str) -> str:
+        """
+        Get the file path of a message id.
+
+        Args:
+            message_id: Message id (hex SHA-256)
+
+        Returns:
+            str: Path of the message file
+        """
+        return os.path.join(self.directory, message_id + _SUFFIX)
+
+    def flush(self, timeout: float = None) -> None:
+        """
+        Wait until queued writes and deletions have reached the disk.
+
+        Args:
+            timeout: Maximum time to wait in seconds (None for no limit)
+        """
+        done = threading.Event()
+        self._writes.put(('flush', '', done))
+        done.wait(timeout)
+
+    def _remember(self, message_id: str, message: str) -> None:
+        # Caller holds self._lock
+        if message_id in self._cache:
+            self._cache.move_to_end(message_id)
+            return
+        if len(message) > self.cache_bytes:
+            return
+        self._cache[message_id] = message
+        self._cache_total += len(message)
+        while self._cache_total > self.cache_bytes:
+            _, text = self._cache.popitem(last=False)
+            self._cache_total -= len(text)
+
+    def _evict(self) -> None:
+        # Caller holds self._lock; the newest entry is never evicted
+        while len(self._index) > 1 and (
+            len(self._index) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            message_id, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            text = self._cache.pop(message_id, None)
+            if text is not None:
+                self._cache_total -= len(text)
+            self._pending.pop(message_id, None)
+            self._writes.put(('delete', message_id, None))
+
+    def _load_index(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-len(_SUFFIX)], stat.st_size))
+        for _, message_id, size in sorted(entries):
+            self._index[message_id] = size
+            self._total_bytes += size
+        with self._lock:
+            self._evict()
+        if entries:
+            logger.info("Message store: %s message(s) in %s", len(self._index), self.directory)
+
+    def _write_loop(self) -> None:
+        while True:
+            op, message_id, arg = self._writes.get()
+            try:
+                if op == 'write':
+                    self._write(message_id, arg)
+                elif op == 'delete':
+                    os.remove(self.path_for(message_id))
+                elif op == 'flush':
+                    arg.set()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.error("Message store %s failed for %s: %s", op, message_id[:12], e)
+
+    def _write(self, message_id: str, message: str) -> None:
+        path = self.path_for(message_id)
+        with self._lock:
+            if message_id not in self._index:
+                # Evicted before it was written
+                return
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            # Encode in chunks rather than materializing the whole message as bytes
+            for start in range(0, len(message), Config.MESSAGE_WRITE_CHUNK):
+                f.write(message[start:start + Config.MESSAGE_WRITE_CHUNK])
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._pending.pop(message_id, None)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_message_store() -> MessageStore:
+    """
+    Get the shared message store, loading its index on first use.
+
+    Returns:
+        MessageStore: The process-wide store
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MessageStore()
+        return _store
+
+
+def set_message_store(store: Optional[MessageStore]) -> Optional[MessageStore]:
+    """
+    Replace the shared message store.
+
+    Args:
+        store: Store to install, or None to reset
+
+    Returns:
+        Optional[MessageStore]: The previously installed store
+    """
+    global _store
+    with _store_lock:
+        previous, _store = _store, store
+        return previous
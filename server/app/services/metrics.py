@@ -0,0 +1,293 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/metrics.py
+# Purpose: Prometheus-style metrics - latency histograms and event counters
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Pipelines record stage latencies and notable events (cold starts, timeouts,
+fallbacks) without knowing which endpoint they serve: the job wrapper sets
+the current endpoint for the duration of the job and every metric recorded
+meanwhile is labelled with it.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Endpoint of the request whose automation is currently running
+_current_endpoint = contextvars.ContextVar('cursit_endpoint', default='none')
+
+# Seconds; covers keystroke-level stages up to cold starts
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0, 60.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if 'endpoint' in self.labelnames and 'endpoint' not in labels:
+            labels = dict(labels, endpoint=_current_endpoint.get())
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """
+        Increment the counter.
+
+        Args:
+            amount: Increment
+            **labels: Label values; ``endpoint`` defaults to the current one
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Get the current count for a label set."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value sampled from a callback when metrics are rendered."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]):
+        super().__init__(name, documentation)
+        self._callback = callback
+
+    def _samples(self) -> List[str]:
+        try:
+            value = self._callback()
+        except Exception:
+            return []
+        return [f"{self.name} {_format_value(value)}"]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # bucket counts..., sum, count
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value (seconds for latencies)
+            **labels: Label values; ``endpoint`` defaults to the current one
+        """
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the ``with`` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        """Get the number of observations for a label set."""
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return series[-1] if series else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            for bound, count in zip(self.buckets, series):
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric (replacing one with the same name) and return it."""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'cursit_http_request_duration_seconds',
+    'Time to answer an HTTP request.',
+    ['endpoint', 'method', 'status']
+))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'cursit_request_duration_seconds',
+    'Total latency of an automation request, from acceptance until its job finished.',
+    ['endpoint', 'outcome']
+))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'cursit_stage_duration_seconds',
+    'Latency of each automation stage.',
+    ['endpoint', 'stage']
+))
+CURSOR_STARTS = REGISTRY.register(Counter(
+    'cursit_cursor_starts_total',
+    'Requests that found Cursor not running (cold) or running (hot).',
+    ['endpoint', 'start']
+))
+TIMEOUTS = REGISTRY.register(Counter(
+    'cursit_timeouts_total',
+    'Waits that timed out and proceeded anyway.',
+    ['endpoint', 'stage']
+))
+FOCUS_FALLBACKS = REGISTRY.register(Counter(
+    'cursit_focus_fallbacks_total',
+    'Times SetForegroundWindow failed and BringWindowToTop was used instead.',
+    ['endpoint']
+))
+DUPLICATE_REQUESTS = REGISTRY.register(Counter(
+    'cursit_duplicate_requests_total',
+    'Requests attached to an identical in-flight or recently completed job.',
+    ['endpoint']
+))
+CLIPBOARD_FAILURES = REGISTRY.register(Counter(
+    'cursit_clipboard_failures_total',
+    'Failed clipboard copies.',
+    ['endpoint']
+))
+
+COMPANION_DELIVERIES = REGISTRY.register(Counter(
+    'cursit_companion_deliveries_total',
+    'Messages handed to an editor companion, delivered or fallen back to keystrokes.',
+    ['endpoint', 'outcome']
+))
+
+
+def observe_stage(stage: str):
+    """
+    Time a stage of the current request.
+
+    Args:
+        stage: Stage name, e.g. "spawn" or "file_load_wait"
+
+    Returns:
+        Context manager observing the block's duration
+    """
+    return STAGE_SECONDS.time(stage=stage)
+
+
+@contextmanager
+def request_context(endpoint: str, started_at: float = None) -> Iterator[None]:
+    """
+    Label metrics recorded inside the block with an endpoint, and observe the
+    request's total latency when the block exits.
+
+    Args:
+        endpoint: Endpoint path, e.g. "/open"
+        started_at: ``time.time()`` when the request was accepted (defaults to now)
+    """
+    started_at = started_at if started_at is not None else time.time()
+    token = _current_endpoint.set(endpoint)
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        REQUEST_SECONDS.observe(time.time() - started_at, outcome=outcome)
+        _current_endpoint.reset(token)
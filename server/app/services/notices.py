@@ -0,0 +1,107 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/notices.py
+# Purpose: Server-initiated notices pushed to connected clients
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Server-initiated notices.
+
+Services publish short notices (the server is shutting down, an editor
+companion connected) that are not the answer to any request; the WebSocket
+channel pushes them to every connected extension.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+Notice = Dict[str, Any]
+
+
+class NoticeBoard:
+    """Fan-out of notices to listeners, callable from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Notice], None]] = []
+
+    def add_listener(self, listener: Callable[[Notice], None]) -> None:
+        """
+        Register a listener.
+
+        Args:
+            listener: Called with every notice on the publishing thread; must not block
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Notice], None]) -> None:
+        """Unregister a listener (no-op if it is not registered)."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def publish(self, kind: str, message: str, level: str = 'info', **data) -> Notice:
+        """
+        Publish a notice to all listeners.
+
+        Args:
+            kind: Machine-readable kind, e.g. "shutdown"
+            message: Human-readable text
+            level: "info", "warning" or "error"
+            **data: Extra fields
+
+        Returns:
+            Notice: The published notice
+        """
+        notice = {"type": "notice", "kind": kind, "level": level, "message": message, "at": time.time(), **data}
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(notice)
+            except Exception as e:
+                logger.warning("Notice listener failed: %s", e)
+        return notice
+
+
+_board = None
+_board_lock = threading.Lock()
+
+
+def get_notice_board() -> NoticeBoard:
+    """
+    Get the shared notice board.
+
+    Returns:
+        NoticeBoard: The process-wide board
+    """
+    global _board
+    with _board_lock:
+        if _board is None:
+            _board = NoticeBoard()
+        return _board
+
+
+def set_notice_board(board: Optional[NoticeBoard]) -> Optional[NoticeBoard]:
+    """
+    Replace the shared notice board.
+
+    Args:
+        board: Board to install, or None to reset
+
+    Returns:
+        Optional[NoticeBoard]: The previously installed board
+    """
+    global _board
+    with _board_lock:
+        previous, _board = _board, board
+        return previous
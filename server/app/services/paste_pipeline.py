@@ -0,0 +1,95 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/paste_pipeline.py
+# Purpose: Probe-gated state machine for the focus/open-chat/paste sequence
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Readiness-probe state machine for the paste sequence.
+
+The sequence is a list of states. Each state performs an action (send a key
+chord, raise a window) and then waits for a readiness probe, advancing the
+moment it passes. The probe deadline comes from the timing model; states
+without a probe wait the model's delay instead. Actions and probes are
+blocking (pywin32, clipboard) and run on the bounded executor; the waits in
+between are coroutine sleeps. A state whose probe keeps
+failing is retried per its policy and then either fails the pipeline
+(``required``) or is passed over with a warning.
+"""
+from typing import Callable, List, NamedTuple, Optional, Tuple
+from app.utils.logger import get_logger
+from app.services.timing_model import TimingModel, get_timing_model
+from app.services.async_runtime import run_blocking
+from app.services import metrics
+
+logger = get_logger(__name__)
+
+
+class PasteState(NamedTuple):
+    """One state of the paste sequence."""
+    name: str  # Timing model stage, also used in log messages
+    action: Optional[Callable[[], None]]  # Performed on entry
+    probe: Optional[Callable[[], bool]] = None  # True once the state is complete
+    attempts: int = 1  # How many times the action is performed before giving up
+    required: bool = False  # Abort the pipeline if the probe never passes
+    failure: str = ""  # Error message when a required state fails
+    report: Optional[str] = None  # Progress stage reported on entry
+    prepare: Optional[Callable[[], None]] = None  # Runs once before the first action (e.g. probe baselines)
+    retry: Optional[Callable[[], None]] = None  # Performed before a retry; defaults to ``action``
+
+
+class PastePipeline:
+    """Runs paste states in order, gating each transition on its probe."""
+
+    def __init__(
+        self,
+        states: List[PasteState],
+        report: Optional[Callable[..., None]] = None,
+        timing: Optional[TimingModel] = None
+    ):
+        self.states = states
+        self.report = report or (lambda stage, **data: None)
+        self.timing = timing or get_timing_model()
+
+    async def run(self) -> Tuple[bool, str]:
+        """
+        Run every state in order.
+
+        Returns:
+            Tuple[bool, str]: (success, error_message) - the error names the
+                state whose probe failed
+        """
+        for state in self.states:
+            if state.report:
+                self.report(state.report)
+            if state.prepare:
+                await run_blocking(state.prepare)
+            if not await self._run_state(state):
+                if state.required:
+                    logger.error("Paste pipeline failed in state '%s': %s", state.name, state.failure)
+                    return False, state.failure or f"State '{state.name}' did not complete"
+                metrics.TIMEOUTS.inc(stage=state.name)
+                logger.warning("State '%s' was not confirmed, continuing", state.name)
+        return True, ""
+
+    async def _run_state(self, state: PasteState) -> bool:
+        for attempt in range(1, max(1, state.attempts) + 1):
+            action = state.action if attempt == 1 else (state.retry or state.action)
+            if action:
+                await run_blocking(action)
+            if state.probe is None:
+                await self.timing.sleep(state.name)
+                return True
+            # Retries allow the stage's full ceiling rather than the learned delay
+            deadline = None if attempt == 1 else self.timing.ceiling(state.name)
+            probe = state.probe
+            if await self.timing.wait_until(state.name, lambda: run_blocking(probe), deadline=deadline):
+                return True
+            if attempt < state.attempts:
+                logger.info("State '%s' not ready, retrying (%s/%s)", state.name, attempt + 1, state.attempts)
+        return False
@@ -0,0 +1,235 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/process_tracker.py
+# Purpose: Cursor process tracking - PID set from launches and process scans
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Cursor process tracker.
+
+Knows which PIDs belong to Cursor so that window enumeration can be scoped
+to those processes instead of walking every window on the desktop.
+"""
+import csv
+import io
+import os
+import subprocess
+import threading
+import time
+from typing import Dict, FrozenSet, Optional, Set
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+
+class ProcessTracker:
+    """
+    Cached set of Cursor process IDs.
+
+    The set is seeded from processes we launch and from a process-table scan
+    that is cached for ``Config.PROCESS_SCAN_TTL`` seconds. Exited processes
+    are dropped as soon as they are noticed.
+    """
+
+    def __init__(self, process_name: str = None, scan_ttl: float = None):
+        self.process_name = (process_name or Config.CURSOR_PROCESS_NAME).lower()
+        self.scan_ttl = scan_ttl if scan_ttl is not None else Config.PROCESS_SCAN_TTL
+        self._lock = threading.Lock()
+        self._pids: Set[int] = set()
+        self._launched: Set[int] = set()
+        self._scanned_at = 0.0
+        self._expect_until = 0.0
+        self._rejected: Dict[int, float] = {}
+
+    def pids(self) -> FrozenSet[int]:
+        """
+        Get the PIDs of the running Cursor processes.
+
+        Returns:
+            FrozenSet[int]: Cursor PIDs, rescanned when the cache is stale
+        """
+        with self._lock:
+            now = time.monotonic()
+            ttl = self.scan_ttl
+            if not self._pids and now < self._expect_until:
+                # A launch is in flight: look for the new instance more often
+                ttl = Config.POLL_INTERVAL
+            if now - self._scanned_at < ttl:
+                return frozenset(self._pids)
+        self.refresh()
+        with self._lock:
+            return frozenset(self._pids)
+
+    def refresh(self) -> None:
+        """Rescan the process table now."""
+        scanned = self._scan()
+        with self._lock:
+            if scanned is not None:
+                alive_launched = {pid for pid in self._launched if self._is_alive(pid)}
+                self._launched = alive_launched
+                self._pids = scanned | alive_launched
+            self._scanned_at = time.monotonic()
+            self._rejected.clear()
+
+    def invalidate(self) -> None:
+        """Force the next ``pids()`` call to rescan."""
+        with self._lock:
+            self._scanned_at = 0.0
+
+    def register(self, pid: int) -> None:
+        """
+        Record a process we launched ourselves.
+
+        Args:
+            pid: PID returned by the launcher
+        """
+        with self._lock:
+            self._expect_until = time.monotonic() + Config.CURSOR_STARTUP_TIMEOUT
+        name = self._process_name(pid)
+        if name is not None and name != self.process_name:
+            # e.g. a shell or CLI wrapper; the real instance shows up on rescan
+            self.invalidate()
+            return
+        with self._lock:
+            self._launched.add(pid)
+            self._pids.add(pid)
+            self._rejected.pop(pid, None)
+
+    def is_cursor_pid(self, pid: int) -> bool:
+        """
+        Check whether a PID belongs to Cursor.
+
+        Unknown PIDs are looked up once and negative answers are cached until
+        the next scan, so this is cheap to call for every window event.
+
+        Args:
+            pid: Process ID to check
+
+        Returns:
+            bool: True if the process is a Cursor process
+        """
+        if not pid:
+            return False
+        with self._lock:
+            if pid in self._pids:
+                return True
+            if pid in self._rejected:
+                return False
+
+        name = self._process_name(pid)
+        if name is None:
+            # No per-process lookup available: fall back to a (cached) scan
+            return pid in self.pids()
+
+        with self._lock:
+            if name == self.process_name:
+                self._pids.add(pid)
+                return True
+            self._rejected[pid] = time.monotonic()
+            return False
+
+    def forget_if_exited(self, pid: int) -> None:
+        """
+        Drop a PID if its process is gone.
+
+        Args:
+            pid: Process ID whose last window just closed
+        """
+        if pid and not self._is_alive(pid):
+            with self._lock:
+                self._pids.discard(pid)
+                self._launched.discard(pid)
+            logger.info("Cursor process %s exited", pid)
+
+    def _scan(self) -> Optional[Set[int]]:
+        if psutil is not None:
+            try:
+                return {
+                    proc.info['pid'] for proc in psutil.process_iter(['pid', 'name'])
+                    if (proc.info['name'] or '').lower() == self.process_name
+                }
+            except Exception as e:
+                logger.warning("Process scan via psutil failed: %s", e)
+                return None
+
+        if os.name == 'nt':
+            try:
+                output = subprocess.run(
+                    ['tasklist', '/FO', 'CSV', '/NH', '/FI', f'IMAGENAME eq {self.process_name}'],
+                    capture_output=True, text=True, timeout=5,
+                    creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+                ).stdout
+                return {
+                    int(row[1]) for row in csv.reader(io.StringIO(output))
+                    if len(row) > 1 and row[0].lower() == self.process_name
+                }
+            except Exception as e:
+                logger.warning("Process scan via tasklist failed: %s", e)
+        return None
+
+    @staticmethod
+    def _process_name(pid: int) -> Optional[str]:
+        if psutil is None:
+            return None
+        try:
+            return psutil.Process(pid).name().lower()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        if psutil is not None:
+            return psutil.pid_exists(pid)
+        if os.name == 'nt':
+            # os.kill with signal 0 would terminate the process on Windows
+            return True
+        try:
+            os.kill(pid, 0)
+            return True
+        except OSError:
+            return False
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_process_tracker() -> ProcessTracker:
+    """
+    Get the shared Cursor process tracker.
+
+    Returns:
+        ProcessTracker: The process-wide tracker
+    """
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = ProcessTracker()
+        return _tracker
+
+
+def set_process_tracker(tracker: Optional[ProcessTracker]) -> Optional[ProcessTracker]:
+    """
+    Replace the shared tracker.
+
+    Args:
+        tracker: Tracker to install, or None to reset
+
+    Returns:
+        Optional[ProcessTracker]: The previously installed tracker
+    """
+    global _tracker
+    with _tracker_lock:
+        previous, _tracker = _tracker, tracker
+        return previous
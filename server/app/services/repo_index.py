@@ -0,0 +1,396 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/repo_index.py
+# Purpose: Repository discovery index - git remote URLs to local checkouts
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Repository discovery index.
+
+Scans the configured root directories (``REPO_ROOTS``) for git checkouts and
+reads their remotes straight from ``.git/config`` (no git process), building
+a map from normalized remote URL to checkout path. Rescans are incremental:
+a directory whose mtime has not changed reuses its cached subdirectory list,
+and a checkout's config is only re-read when the config file changed. The
+scan state is persisted so lookups work immediately after a restart.
+"""
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+from typing import Any, Dict, List, Optional
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCP_URL = re.compile(r'^(?:[^@/]+@)?(?P<host>[^:/]+):(?P<path>[^/].*)$')
+_REMOTE_SECTION = re.compile(r'^\[\s*remote\s+"(?P<name>[^"]*)"\s*\]', re.IGNORECASE)
+
+
+def normalize_remote_url(url: str) -> Optional[str]:
+    """
+    Normalize a git remote or repository page URL to a lookup key.
+
+    HTTPS, ``ssh://`` and scp-like (``git@host:owner/repo.git``) remotes of
+    the same repository map to the same ``host/path`` key: credentials, port,
+    ``.git`` suffix, trailing slashes and case are dropped, and Azure DevOps
+    SSH and legacy ``*.visualstudio.com`` URLs are rewritten to their
+    ``dev.azure.com/org/project/_git/repo`` form.
+
+    Args:
+        url: Remote URL (from ``.git/config``) or repository page URL
+
+    Returns:
+        Optional[str]: Lookup key, or None for local-path remotes
+    """
+    url = (url or "").strip()
+    if '://' in url:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme == 'file':
+            return None
+        host, path = parts.hostname or "", parts.path
+    else:
+        match = _SCP_URL.match(url)
+        if not match or len(match.group('host')) == 1:
+            # Local path (a one-letter "host" is a Windows drive)
+            return None
+        host, path = match.group('host'), match.group('path')
+
+    host = host.lower()
+    path = urllib.parse.unquote(path).strip('/')
+    if path.endswith('.git'):
+        path = path[:-4]
+    if not host or not path:
+        return None
+
+    segments = path.split('/')
+    if host in ('ssh.dev.azure.com', 'vs-ssh.visualstudio.com') and segments[0] == 'v3' and len(segments) == 4:
+        # v3/org/project/repo
+        host, segments = 'dev.azure.com', [segments[1], segments[2], '_git', segments[3]]
+    elif host.endswith('.visualstudio.com'):
+        if segments[0].lower() == 'defaultcollection':
+            segments = segments[1:]
+        host, segments = 'dev.azure.com', [host[:-len('.visualstudio.com')]] + segments
+    return f"{host}/{'/'.join(segments)}".lower()
+
+
+def read_remote_urls(config_path: str) -> List[str]:
+    """
+    Read the remote URLs of a git config file.
+
+    Args:
+        config_path: Path to a ``.git/config`` file
+
+    Returns:
+        List[str]: URLs of every ``[remote "..."]`` section, in file order
+    """
+    urls = []
+    in_remote = False
+    with open(config_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] in '#;':
+                continue
+            if line.startswith('['):
+                in_remote = _REMOTE_SECTION.match(line) is not None
+                continue
+            if in_remote:
+                key, sep, value = line.partition('=')
+                if sep and key.strip().lower() == 'url':
+                    urls.append(value.strip().strip('"'))
+    return urls
+
+
+def _git_config_path(directory: str) -> Optional[str]:
+    """Get the config file of a checkout, or None if the directory is not one."""
+    dot_git = os.path.join(directory, '.git')
+    if os.path.isdir(dot_git):
+        return os.path.join(dot_git, 'config')
+    if not os.path.isfile(dot_git):
+        return None
+    # Worktree or submodule: ".git" is a file pointing at the real git dir
+    try:
+        with open(dot_git, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+    except OSError:
+        return None
+    if not content.startswith('gitdir:'):
+        return None
+    git_dir = os.path.join(directory, content[len('gitdir:'):].strip())
+    try:
+        with open(os.path.join(git_dir, 'commondir'), 'r', encoding='utf-8') as f:
+            git_dir = os.path.join(git_dir, f.read().strip())
+    except OSError:
+        pass
+    return os.path.normpath(os.path.join(git_dir, 'config'))
+
+
+def _subdirectories(directory: str) -> List[str]:
+    names = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') or entry.name in Config.REPO_SCAN_SKIP:
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        names.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        return []
+    return sorted(names)
+
+
+class RepoIndex:
+    """Remote URL -> local checkout index over the configured roots."""
+
+    def __init__(self, path: Optional[str] = None, roots: List[str] = None, max_depth: int = None):
+        self.path = path
+        self.roots = [os.path.abspath(root) for root in (roots if roots is not None else Config.REPO_ROOTS)]
+        self.max_depth = max_depth if max_depth is not None else Config.REPO_SCAN_MAX_DEPTH
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        # directory -> {"mtime", "subdirs"} for plain directories,
+        # {"mtime", "configMtime", "remotes"} for checkouts
+        self._dirs: Dict[str, Dict[str, Any]] = {}
+        self._by_url: Dict[str, List[str]] = {}
+        self._scanned_at = 0.0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if path:
+            self.load()
+
+    def resolve(self, url: str) -> Optional[str]:
+        """
+        Get the local checkout of a repository.
+
+        Args:
+            url: Remote or repository page URL
+
+        Returns:
+            Optional[str]: Checkout path (the first found if there are
+                several), or None if no checkout has that remote
+        """
+        paths = self.lookup(url)
+        return paths[0] if paths else None
+
+    def lookup(self, url: str) -> List[str]:
+        """
+        Get every local checkout of a repository.
+
+        A miss wakes the background scanner, so a freshly cloned repository
+        is found on a retry.
+
+        Args:
+            url: Remote or repository page URL
+
+        Returns:
+            List[str]: Checkout paths (empty if none is known)
+        """
+        key = normalize_remote_url(url)
+        with self._lock:
+            paths = list(self._by_url.get(key, ())) if key else []
+        if not paths and key:
+            self._wake.set()
+        return paths
+
+    def scan(self) -> Dict[str, Any]:
+        """
+        Rescan the roots, reusing everything whose mtime did not change.
+
+        Returns:
+            Dict[str, Any]: Repository count, directories listed, configs
+                read and the scan duration
+        """
+        with self._scan_lock:
+            start = time.monotonic()
+            with self._lock:
+                previous = self._dirs
+            dirs: Dict[str, Dict[str, Any]] = {}
+            listed = parsed = 0
+            stack = [(root, 0) for root in reversed(self.roots)]
+            while stack:
+                directory, depth = stack.pop()
+                try:
+                    mtime = os.stat(directory).st_mtime
+                except OSError:
+                    continue
+                old = previous.get(directory)
+                unchanged = old is not None and old["mtime"] == mtime
+
+                if unchanged and "subdirs" in old:
+                    # Adding .git (or anything else) would have changed the mtime
+                    subdirs = old["subdirs"]
+                else:
+                    config_path = _git_config_path(directory)
+                    if config_path is not None:
+                        entry = self._read_checkout(config_path, old)
+                        if entry is not None:
+                            parsed += entry.pop("parsed")
+                            dirs[directory] = dict(entry, mtime=mtime)
+                        continue
+                    subdirs = _subdirectories(directory)
+                    listed += 1
+
+                dirs[directory] = {"mtime": mtime, "subdirs": subdirs}
+                if depth < self.max_depth:
+                    stack.extend((os.path.join(directory, name), depth + 1) for name in reversed(subdirs))
+
+            by_url = self._build(dirs)
+            with self._lock:
+                self._dirs = dirs
+                self._by_url = by_url
+                self._scanned_at = time.time()
+            self.save()
+
+        stats = {
+            "repositories": sum(1 for entry in dirs.values() if "remotes" in entry),
+            "directoriesListed": listed,
+            "configsRead": parsed,
+            "seconds": round(time.monotonic() - start, 3),
+        }
+        logger.info(
+            "Repository scan: %d checkout(s), %d director(ies) listed, %d config(s) read in %.3fs",
+            stats["repositories"], listed, parsed, stats["seconds"]
+        )
+        return stats
+
+    def start(self) -> None:
+        """Scan now and then every ``REPO_SCAN_INTERVAL`` seconds or after a lookup miss."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='repo-index', daemon=True)
+        self._thread.start()
+        logger.info("Repository index watching: %s", ', '.join(self.roots) or '(no roots)')
+
+    def stop(self) -> None:
+        """Stop the background scanner."""
+        self._stop.set()
+        self._wake.set()
+
+    def load(self) -> None:
+        """Load the persisted scan state, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Ignoring unreadable repository index %s: %s", self.path, e)
+            return
+        dirs = data.get("dirs", {})
+        by_url = self._build(dirs)
+        with self._lock:
+            self._dirs = dirs
+            self._by_url = by_url
+            self._scanned_at = float(data.get("scannedAt", 0.0))
+
+    def save(self) -> None:
+        """Persist the scan state."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {"scannedAt": self._scanned_at, "dirs": self._dirs}
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning("Failed to save repository index: %s", e)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Describe the index.
+
+        Returns:
+            Dict[str, Any]: Roots, last scan time and normalized URL -> paths
+        """
+        with self._lock:
+            return {
+                "roots": list(self.roots),
+                "scannedAt": self._scanned_at,
+                "repositories": {key: list(paths) for key, paths in sorted(self._by_url.items())},
+            }
+
+    def _read_checkout(self, config_path: str, old: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        try:
+            config_mtime = os.stat(config_path).st_mtime
+        except OSError:
+            return None
+        if old is not None and old.get("configMtime") == config_mtime:
+            return {"configMtime": config_mtime, "remotes": old["remotes"], "parsed": 0}
+        try:
+            urls = read_remote_urls(config_path)
+        except OSError as e:
+            logger.warning("Could not read %s: %s", config_path, e)
+            return None
+        remotes = []
+        for url in urls:
+            key = normalize_remote_url(url)
+            if key and key not in remotes:
+                remotes.append(key)
+        return {"configMtime": config_mtime, "remotes": remotes, "parsed": 1}
+
+    @staticmethod
+    def _build(dirs: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+        by_url: Dict[str, List[str]] = {}
+        for directory in sorted(dirs):
+            for key in dirs[directory].get("remotes", ()):
+                by_url.setdefault(key, []).append(directory)
+        return by_url
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.scan()
+            except Exception as e:
+                logger.error("Repository scan failed: %s", e)
+            self._wake.wait(Config.REPO_SCAN_INTERVAL)
+            # Coalesce bursts of lookup misses into one rescan
+            self._stop.wait(Config.REPO_SCAN_MIN_INTERVAL)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_repo_index() -> RepoIndex:
+    """
+    Get the shared repository index, loading the persisted state on first use.
+
+    Returns:
+        RepoIndex: The process-wide index
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = RepoIndex(Config.REPO_INDEX_PATH)
+        return _index
+
+
+def set_repo_index(index: Optional[RepoIndex]) -> Optional[RepoIndex]:
+    """
+    Replace the shared repository index.
+
+    Args:
+        index: Index to install, or None to reset
+
+    Returns:
+        Optional[RepoIndex]: The previously installed index
+    """
+    global _index
+    with _index_lock:
+        previous, _index = _index, index
+        return previous
@@ -0,0 +1,408 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/simulated_desktop.py
+# Purpose: Simulated desktop - stands in for Windows, the clipboard and Cursor
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Simulated desktop for exercising the server without Windows or Cursor.
+
+While installed, the simulation replaces pywin32 (``win32gui``,
+``win32process``, ``win32api``, ``win32con``) and the Cursor launcher inside
+the services, installs a ``FakeClipboardBackend`` and a
+``RecordingKeyboardBackend`` feeding the simulated Cursor, and drives the window
+monitor through a ``FakeWindowBackend``. A simulated Cursor reacts to launches and keystrokes
+after scriptable delays: windows appear, titles change, focus and the chat
+caret move, and pasted text is recorded.
+
+Usage:
+    with SimulatedDesktop(DesktopTimings(cold_start=2.0)) as desktop:
+        client = create_app().test_client()
+        ...
+"""
+import os
+import random
+import tempfile
+import threading
+from types import SimpleNamespace
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+from app.utils.logger import get_logger
+from app.services import window_monitor as window_monitor_module
+from app.services import window_index as window_index_module
+from app.services import process_tracker as process_tracker_module
+from app.services import timing_model as timing_model_module
+from app.services import message_store as message_store_module
+from app.services import workspace_pool as workspace_pool_module
+from app.services import window_service, cursor_service
+from app.services.clipboard_service import FakeClipboardBackend, set_clipboard_backend
+from app.services.keystrokes import KeyEvent, RecordingKeyboardBackend, set_keyboard_backend
+from app.services.window_monitor import FakeWindowBackend, WindowMonitor
+from app.services.process_tracker import ProcessTracker
+from app.services.timing_model import TimingModel
+from app.services.message_store import MessageStore
+from app.services.workspace_pool import WorkspacePool
+from app.services.window_index import get_window_index
+from app.services.cursor_launcher import CursorLauncher, LaunchResult
+
+logger = get_logger(__name__)
+
+VK_ESCAPE = 0x1B
+VK_CONTROL = 0x11
+VK_L = 0x4C
+VK_V = 0x56
+VK_RETURN = 0x0D
+KEYEVENTF_KEYUP = 0x0002
+
+
+class DesktopTimings(NamedTuple):
+    """Delays (seconds) of the simulated Cursor."""
+    cold_start: float = 1.5  # Launch until the first window appears (Cursor not running)
+    window_appear: float = 0.2  # Launch until a new workspace window appears (Cursor running)
+    title_change: float = 0.3  # Window shown until its title names the opened file
+    focus: float = 0.03  # SetForegroundWindow until the window is foreground
+    chat_open: float = 0.08  # Ctrl+L until the chat input has the caret
+    paste: float = 0.02  # Ctrl+V until the pasted text moves the caret
+    jitter: float = 0.1  # Random +/- fraction applied to every delay
+
+
+class SimulatedCursor:
+    """State of the simulated Cursor instance and desktop."""
+
+    PID = 4242
+    THREAD_ID = 4243
+
+    def __init__(self, timings: DesktopTimings, seed: Optional[int] = None):
+        self.timings = timings
+        self.backend = FakeWindowBackend()
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+        self.running = False
+        self.starting = False
+        self.folders: Dict[str, int] = {}  # folder name -> hwnd
+        self.foreground: int = 0
+        self.caret = 0  # Bumped whenever the caret moves
+        self.chat_focused = False
+        self.ctrl_down = False
+        self.clipboard = FakeClipboardBackend()
+        self.pasted: List[str] = []
+        self.pasted_into: List[int] = []  # Foreground window of each paste
+        self.submitted: List[str] = []
+        self.keys: List[int] = []
+        self._timers: Set[threading.Timer] = set()
+
+    def delay(self, name: str) -> float:
+        """Get a delay with jitter applied."""
+        base = getattr(self.timings, name)
+        jitter = self.timings.jitter
+        with self.lock:
+            return max(0.0, base * (1 + self.random.uniform(-jitter, jitter)))
+
+    def later(self, name: str, func, *args) -> None:
+        """Run ``func`` after the named delay."""
+        timer = threading.Timer(self.delay(name), self._fire, (func, args))
+        timer.daemon = True
+        with self.lock:
+            self._timers.add(timer)
+        timer.start()
+
+    def cancel_all(self) -> None:
+        """Cancel every pending simulated reaction."""
+        with self.lock:
+            timers, self._timers = self._timers, set()
+        for timer in timers:
+            timer.cancel()
+
+    def _fire(self, func, args) -> None:
+        with self.lock:
+            self._timers = {t for t in self._timers if t.is_alive() and t is not threading.current_thread()}
+        func(*args)
+
+    # -- Cursor --------------------------------------------------------------
+
+    def open(self, workspace_path: Optional[str], file_path: Optional[str]) -> bool:
+        """
+        React to a launch request like Cursor does.
+
+        Without a file only the workspace window is opened.
+
+        Returns:
+            bool: True if Cursor was running before the launch
+        """
+        folder = os.path.basename(os.path.normpath(workspace_path)) if workspace_path else None
+        file_name = os.path.basename(file_path) if file_path else None
+        with self.lock:
+            was_running = self.running
+            starting = self.starting
+            hwnd = self.folders.get(folder) if folder else None
+            if hwnd is None and not folder and self.folders:
+                hwnd = next(iter(self.folders.values()))
+            if not was_running:
+                self.starting = True
+
+        if hwnd is not None:
+            self.later('title_change', self._show_file, hwnd, file_name, folder)
+        elif not was_running and starting:
+            # A cold start is already in flight; open in its window once it is up
+            self.later('cold_start', self._open_window, folder, file_name)
+        else:
+            self.later('window_appear' if was_running else 'cold_start', self._open_window, folder, file_name)
+        return was_running
+
+    def _open_window(self, folder: Optional[str], file_name: Optional[str]) -> None:
+        with self.lock:
+            hwnd = self.folders.get(folder) if folder else None
+        if hwnd is None:
+            hwnd = self.backend.create_window(f"{folder or 'Welcome'} - Cursor", pid=self.PID)
+            with self.lock:
+                self.running = True
+                self.starting = False
+                self.folders[folder or file_name] = hwnd
+                # New windows are activated, taking the chat focus with them
+                self._activate(hwnd)
+        self.later('title_change', self._show_file, hwnd, file_name, folder)
+
+    def _show_file(self, hwnd: int, file_name: Optional[str], folder: Optional[str]) -> None:
+        if not file_name or self.backend.describe(hwnd) is None:
+            return
+        # Loose files (no folder open) are titled "<file> - Cursor"
+        title = f"{file_name} - {folder} - Cursor" if folder else f"{file_name} - Cursor"
+        self.backend.set_title(hwnd, title)
+
+    def close(self, hwnd: int) -> bool:
+        """Close one window, exiting Cursor with its last window."""
+        with self.lock:
+            folders = [folder for folder, h in self.folders.items() if h == hwnd]
+            if not folders:
+                return False
+            for folder in folders:
+                del self.folders[folder]
+            if self.foreground == hwnd:
+                self.foreground = 0
+            if not self.folders:
+                self.running = False
+        self.backend.destroy_window(hwnd)
+        return True
+
+    def quit(self) -> None:
+        """Close every window, as if Cursor exited."""
+        with self.lock:
+            hwnds = list(self.folders.values())
+            self.folders.clear()
+            self.running = False
+            self.starting = False
+            self.foreground = 0
+        for hwnd in hwnds:
+            self.backend.destroy_window(hwnd)
+
+    # -- Input ---------------------------------------------------------------
+
+    def set_foreground(self, hwnd: int) -> None:
+        if self.backend.describe(hwnd) is not None:
+            self.later('focus', self._focus, hwnd)
+
+    def _focus(self, hwnd: int) -> None:
+        with self.lock:
+            self._activate(hwnd)
+
+    def _activate(self, hwnd: int) -> None:
+        # Caller holds self.lock; the chat input focus belongs to one window
+        if hwnd != self.foreground:
+            self.chat_focused = False
+        self.foreground = hwnd
+
+    def key(self, vk: int, flags: int) -> None:
+        with self.lock:
+            self.keys.append(vk if not flags & KEYEVENTF_KEYUP else -vk)
+            if vk == VK_CONTROL:
+                self.ctrl_down = not flags & KEYEVENTF_KEYUP
+                return
+            if flags & KEYEVENTF_KEYUP:
+                return
+            ctrl = self.ctrl_down
+            focused = self.foreground != 0
+
+        if not focused:
+            return
+        if vk == VK_ESCAPE:
+            with self.lock:
+                if self.chat_focused:
+                    self.chat_focused = False
+                    self.caret += 1
+        elif vk == VK_L and ctrl:
+            self.later('chat_open', self._focus_chat)
+        elif vk == VK_V and ctrl:
+            with self.lock:
+                text = self.clipboard.paste()
+                target = self.foreground
+            self.later('paste', self._paste, text, target)
+        elif vk == VK_RETURN:
+            with self.lock:
+                if self.chat_focused and self.pasted:
+                    self.submitted.append(self.pasted[-1])
+
+    def _focus_chat(self) -> None:
+        with self.lock:
+            self.chat_focused = True
+            self.caret += 1
+
+    def _paste(self, text: str, target: int) -> None:
+        with self.lock:
+            if self.chat_focused and self.foreground == target:
+                self.pasted.append(text)
+                self.pasted_into.append(target)
+                self.caret += 1
+
+
+class _SimulatedProcessTracker(ProcessTracker):
+    """Process tracker that sees exactly the simulated Cursor process."""
+
+    def __init__(self, cursor: SimulatedCursor):
+        super().__init__()
+        self._cursor = cursor
+
+    def _scan(self):
+        return {SimulatedCursor.PID} if self._cursor.running else set()
+
+    def _process_name(self, pid: int):
+        return self.process_name if pid == SimulatedCursor.PID else None
+
+    def _is_alive(self, pid: int) -> bool:
+        return pid == SimulatedCursor.PID and self._cursor.running
+
+
+class _SimulatedCaretProbe:
+    """Caret probe reading the simulated chat caret."""
+
+    cursor: SimulatedCursor = None
+
+    def __init__(self, hwnd: int):
+        self.hwnd = hwnd
+        self.baseline = None
+
+    @staticmethod
+    def supported() -> bool:
+        return True
+
+    def mark(self) -> None:
+        self.baseline = self.cursor.caret
+
+    def moved(self) -> bool:
+        return self.cursor.chat_focused and self.cursor.caret != self.baseline
+
+
+class SimulatedDesktop:
+    """
+    Installs the simulated Cursor into the services.
+
+    Use as a context manager; the real modules, singletons and launcher are
+    restored on exit.
+    """
+
+    def __init__(self, timings: DesktopTimings = None, seed: Optional[int] = None):
+        self.cursor = SimulatedCursor(timings or DesktopTimings(), seed)
+        # Pauses really sleep, so sequences cost what they would on Windows
+        self.keyboard = RecordingKeyboardBackend(sink=self._key, real_time=True)
+        self._saved: List[Any] = []
+
+    def __enter__(self) -> "SimulatedDesktop":
+        self.install()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.uninstall()
+
+    def install(self) -> None:
+        """Patch the services and install simulated singletons."""
+        cursor = self.cursor
+        win32gui = SimpleNamespace(
+            GetForegroundWindow=lambda: cursor.foreground,
+            SetForegroundWindow=cursor.set_foreground,
+            BringWindowToTop=cursor.set_foreground,
+            SetActiveWindow=lambda hwnd: None,
+            ShowWindow=lambda hwnd, cmd: True,
+            GetWindowText=lambda hwnd: (cursor.backend.describe(hwnd) or SimpleNamespace(title="")).title,
+            IsWindowVisible=lambda hwnd: cursor.backend.describe(hwnd) is not None,
+            PostMessage=lambda hwnd, msg, wparam, lparam: cursor.close(hwnd),
+        )
+        win32process = SimpleNamespace(
+            GetWindowThreadProcessId=lambda hwnd: (SimulatedCursor.THREAD_ID, SimulatedCursor.PID),
+            AttachThreadInput=lambda a, b, attach: None,
+        )
+        win32api = SimpleNamespace(
+            GetCurrentThreadId=lambda: threading.get_ident() & 0xFFFF,
+        )
+        win32con = SimpleNamespace(SW_RESTORE=9, SW_MAXIMIZE=3, WM_CLOSE=0x0010)
+        _SimulatedCaretProbe.cursor = cursor
+
+        def launch(workspace_path, file_path, line=None):
+            was_running = cursor.open(workspace_path, file_path)
+            # Reuse the real argument logic so workspace expectations are recorded
+            CursorLauncher._build_args(workspace_path, file_path, was_running, line)
+            get_tracker().register(SimulatedCursor.PID)
+            return LaunchResult(True, "", was_running, SimulatedCursor.PID)
+
+        def open_workspace(workspace_path):
+            get_window_index().expect(workspace_path)
+            was_running = cursor.open(workspace_path, None)
+            get_tracker().register(SimulatedCursor.PID)
+            return LaunchResult(True, "", was_running, SimulatedCursor.PID)
+
+        get_tracker = process_tracker_module.get_process_tracker
+        patches = [
+            (window_service, 'win32gui', win32gui),
+            (window_service, 'win32con', win32con),
+            (window_service, 'win32api', win32api),
+            (window_service, 'win32process', win32process),
+            (cursor_service, 'win32gui', win32gui),
+            (cursor_service, 'win32con', win32con),
+            (cursor_service, 'win32api', win32api),
+            (cursor_service, 'win32process', win32process),
+            (cursor_service, '_CaretProbe', _SimulatedCaretProbe),
+            (CursorLauncher, 'launch', staticmethod(launch)),
+            (CursorLauncher, 'open_workspace', staticmethod(open_workspace)),
+        ]
+        for target, name, value in patches:
+            self._saved.append((target, name, target.__dict__.get(name)))
+            setattr(target, name, value)
+
+        tracker = _SimulatedProcessTracker(cursor)
+        monitor = WindowMonitor(cursor.backend, accept=lambda info: tracker.is_cursor_pid(info.pid), scope=tracker.pids)
+        monitor.start()
+        self._previous = (
+            process_tracker_module.set_process_tracker(tracker),
+            window_monitor_module.set_window_monitor(monitor),
+            window_index_module.set_window_index(None),
+            timing_model_module.set_timing_model(TimingModel()),
+            message_store_module.set_message_store(MessageStore(tempfile.mkdtemp(prefix='cursit-sim-messages-'))),
+            workspace_pool_module.set_workspace_pool(WorkspacePool()),
+            set_clipboard_backend(cursor.clipboard),
+            set_keyboard_backend(self.keyboard),
+        )
+        self._monitor = monitor
+        logger.info("Simulated desktop installed")
+
+    def uninstall(self) -> None:
+        """Restore the real modules and singletons."""
+        self.cursor.cancel_all()
+        self._monitor.stop()
+        for target, name, value in reversed(self._saved):
+            setattr(target, name, value)
+        self._saved.clear()
+        tracker, monitor, index, timing, store, pool, clipboard, keyboard = self._previous
+        process_tracker_module.set_process_tracker(tracker)
+        window_monitor_module.set_window_monitor(monitor)
+        window_index_module.set_window_index(index)
+        timing_model_module.set_timing_model(timing)
+        message_store_module.set_message_store(store)
+        workspace_pool_module.set_workspace_pool(pool)
+        set_clipboard_backend(clipboard)
+        set_keyboard_backend(keyboard)
+        logger.info("Simulated desktop removed")
+
+    def _key(self, event: KeyEvent) -> None:
+        self.cursor.key(event.vk, KEYEVENTF_KEYUP if event.up else 0)
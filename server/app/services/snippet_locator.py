@@ -0,0 +1,261 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/snippet_locator.py
+# Purpose: Locate a PR code snippet inside a local file
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Snippet-to-line locator.
+
+Finds the line a PR comment's code snippet is on, so the file can be opened
+there. Matching is whitespace-normalized and tolerates drift: the longest
+snippet lines are searched for as anchors (a regex scan over the memory-mapped
+file, so nothing is read into Python), and the lines around every hit are
+compared with the whole snippet; the best window wins if enough of the
+snippet's lines are found in it.
+
+Byte offsets are turned into line numbers with a sparse line-offset index
+(newline counts per fixed-size block, counted on demand), cached per file and
+invalidated by mtime and size, so repeated lookups in the same file only count
+newlines within one block.
+"""
+import difflib
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SnippetMatch(NamedTuple):
+    """Where a snippet was found."""
+    line: int  # 1-based line of the last snippet line found (the commented line)
+    start_line: int  # 1-based line of the first snippet line found
+    score: float  # Fraction of the snippet's lines found there
+
+
+class _LineIndex:
+    """
+    Sparse line-offset index of one version of a file.
+
+    ``counts[b]`` is the number of newlines before block ``b``. Blocks are
+    counted on demand, so a lookup near the top of a large file does not pay
+    for the rest of it.
+    """
+
+    __slots__ = ('mtime_ns', 'size', 'block', 'counts', 'lock')
+
+    def __init__(self, mtime_ns: int, size: int, block: int):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.block = block
+        self.counts = array('q', [0])
+        self.lock = threading.Lock()
+
+    def line_of(self, mm: mmap.mmap, offset: int) -> int:
+        """Get the 1-based line number of a byte offset."""
+        block = offset // self.block
+        with self.lock:
+            while len(self.counts) <= block:
+                start = (len(self.counts) - 1) * self.block
+                self.counts.append(self.counts[-1] + mm[start:start + self.block].count(b'\n'))
+            before = self.counts[block]
+        return before + mm[block * self.block:offset].count(b'\n') + 1
+
+
+def _normalize(line: str) -> str:
+    return ' '.join(line.split())
+
+
+def snippet_lines(snippet: str) -> List[str]:
+    """
+    Get the whitespace-normalized, non-empty lines of a snippet.
+
+    A snippet in unified diff form (``@@`` hunk headers, every other line
+    starting with ``+``, ``-`` or a space) is reduced to the lines of the new
+    version.
+
+    Args:
+        snippet: Code snippet from the PR
+
+    Returns:
+        List[str]: Normalized lines
+    """
+    raw = [line for line in snippet.splitlines() if not line.startswith('@@')]
+    body = [line for line in raw if line.strip()]
+    if body and all(line[:1] in '+- ' for line in body) and any(line[:1] in '+-' for line in body):
+        raw = [line[1:] for line in raw if not line.startswith('-')]
+    return [text for text in (_normalize(line) for line in raw) if text]
+
+
+def _exact_hits(mm: mmap.mmap, line: str) -> Iterator[int]:
+    """Offsets of a normalized line written with single spaces (the common case)."""
+    needle = line.encode('utf-8')
+    offset = mm.find(needle)
+    while offset != -1:
+        yield offset
+        offset = mm.find(needle, offset + 1)
+
+
+def _spaced_hits(mm: mmap.mmap, line: str) -> Iterator[int]:
+    """Offsets of a normalized line with any runs of spaces and tabs between its tokens."""
+    tokens = [re.escape(token.encode('utf-8')) for token in line.split(' ')]
+    for hit in re.compile(rb'[ \t]+'.join(tokens)).finditer(mm):
+        yield hit.start()
+
+
+def _lines_around(mm: mmap.mmap, offset: int, line: int, before: int, after: int) -> List[Tuple[int, str]]:
+    """Normalized non-empty lines from ``before`` lines above ``offset`` to ``after`` below it."""
+    start = mm.rfind(b'\n', 0, offset) + 1
+    first = line
+    while before > 0 and start > 0:
+        start = mm.rfind(b'\n', 0, start - 1) + 1
+        first -= 1
+        before -= 1
+    end = offset
+    for _ in range(after + 1):
+        newline = mm.find(b'\n', end)
+        if newline == -1:
+            end = len(mm)
+            break
+        end = newline + 1
+    text = mm[start:end].decode('utf-8', 'replace')
+    lines = []
+    for k, raw in enumerate(text.split('\n')):
+        normalized = _normalize(raw)
+        if normalized:
+            lines.append((first + k, normalized))
+    return lines
+
+
+class SnippetLocator:
+    """Snippet search over memory-mapped files with cached line-offset indexes."""
+
+    def __init__(self, cache_size: int = None, block: int = None):
+        self.cache_size = cache_size if cache_size is not None else Config.SNIPPET_INDEX_CACHE_SIZE
+        self.block = block if block is not None else Config.SNIPPET_INDEX_BLOCK
+        self._lock = threading.Lock()
+        self._indexes: "OrderedDict[str, _LineIndex]" = OrderedDict()
+
+    def locate(self, file_path: str, snippet: str) -> Optional[SnippetMatch]:
+        """
+        Find a snippet in a file.
+
+        Args:
+            file_path: File to search
+            snippet: Code snippet from the PR
+
+        Returns:
+            Optional[SnippetMatch]: Best match, or None if the snippet was not
+                found well enough (or the file cannot be read)
+        """
+        lines = snippet_lines(snippet or "")[:Config.SNIPPET_MAX_LINES]
+        if not lines:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        if stat.st_size == 0:
+            return None
+
+        # Longest lines first: they are the least likely to occur elsewhere
+        anchors = [
+            i for i in sorted(range(len(lines)), key=lambda i: len(lines[i]), reverse=True)[:Config.SNIPPET_ANCHORS]
+            if len(lines[i]) >= Config.SNIPPET_MIN_ANCHOR_CHARS
+        ]
+        best = None
+        try:
+            # The mapping is closed right away; holding it would lock the file on Windows
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                index = self._index(file_path, stat)
+                # Exact (single-spaced) anchors are found with a plain byte search;
+                # the slower whitespace-tolerant scan only runs if none matched well
+                for hits in (_exact_hits, _spaced_hits):
+                    for i in anchors:
+                        for k, offset in enumerate(hits(mm, lines[i])):
+                            if k >= Config.SNIPPET_MAX_CANDIDATES:
+                                break
+                            candidate = self._score(mm, offset, index.line_of(mm, offset), lines, i)
+                            if candidate is not None and (best is None or candidate.score > best.score):
+                                best = candidate
+                            if best is not None and best.score >= 1.0:
+                                return best
+                        if best is not None and best.score >= Config.SNIPPET_MIN_SCORE:
+                            # Another anchor would only find the same window again
+                            return best
+        except (OSError, ValueError) as e:
+            logger.warning("Could not search %s: %s", file_path, e)
+        return None
+
+    def _index(self, file_path: str, stat: os.stat_result) -> _LineIndex:
+        key = os.path.normcase(os.path.abspath(file_path))
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None or index.mtime_ns != stat.st_mtime_ns or index.size != stat.st_size:
+                index = self._indexes[key] = _LineIndex(stat.st_mtime_ns, stat.st_size, self.block)
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.cache_size:
+                self._indexes.popitem(last=False)
+            return index
+
+    @staticmethod
+    def _score(mm: mmap.mmap, offset: int, line: int, lines: List[str], anchor: int) -> Optional[SnippetMatch]:
+        drift = Config.SNIPPET_DRIFT_LINES
+        window = _lines_around(mm, offset, line, anchor + drift, len(lines) - anchor - 1 + drift)
+        matcher = difflib.SequenceMatcher(None, lines, [text for _, text in window], autojunk=False)
+        blocks = [block for block in matcher.get_matching_blocks() if block.size]
+        if not blocks:
+            return None
+        matched = sum(block.size for block in blocks)
+        first, last = blocks[0], blocks[-1]
+        return SnippetMatch(
+            line=window[last.b + last.size - 1][0],
+            start_line=window[first.b][0],
+            score=matched / len(lines)
+        )
+
+
+_locator = None
+_locator_lock = threading.Lock()
+
+
+def get_snippet_locator() -> SnippetLocator:
+    """
+    Get the shared snippet locator.
+
+    Returns:
+        SnippetLocator: The process-wide locator
+    """
+    global _locator
+    with _locator_lock:
+        if _locator is None:
+            _locator = SnippetLocator()
+        return _locator
+
+
+def set_snippet_locator(locator: Optional[SnippetLocator]) -> Optional[SnippetLocator]:
+    """
+    Replace the shared snippet locator.
+
+    Args:
+        locator: Locator to install, or None to reset
+
+    Returns:
+        Optional[SnippetLocator]: The previously installed locator
+    """
+    global _locator
+    with _locator_lock:
+        previous, _locator = _locator, locator
+        return previous
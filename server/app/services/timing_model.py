@@ -0,0 +1,232 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/timing_model.py
+# Purpose: Adaptive timing model - delays learned from observed UI latencies
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Adaptive timing model for the keystroke and settle delays.
+
+Every stage of the paste sequence has a default delay and floor/ceiling
+bounds (``Config.TIMING_STAGES``). Whenever a stage's readiness can be
+observed, the latency is recorded; once enough samples exist the stage's
+delay becomes the configured percentile of them, clamped to its bounds.
+Samples are persisted so the model survives restarts.
+"""
+import asyncio
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TimingModel:
+    """Per-stage latency samples and the delays derived from them."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        percentile: float = None,
+        min_samples: int = None,
+        window: int = None
+    ):
+        self.path = path
+        self.percentile = percentile if percentile is not None else Config.TIMING_PERCENTILE
+        self.min_samples = min_samples if min_samples is not None else Config.TIMING_MIN_SAMPLES
+        self.window = window if window is not None else Config.TIMING_SAMPLE_WINDOW
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        if path:
+            self.load()
+
+    def delay(self, stage: str) -> float:
+        """
+        Get the delay (or readiness deadline) for a stage.
+
+        Args:
+            stage: Stage name from ``Config.TIMING_STAGES``
+
+        Returns:
+            float: Percentile of observed latencies clamped to the stage
+                bounds, or the stage default until enough samples exist
+        """
+        default, floor, ceiling = Config.TIMING_STAGES[stage]
+        with self._lock:
+            samples = sorted(self._samples.get(stage, ()))
+        if len(samples) < self.min_samples:
+            return default
+        rank = max(0, math.ceil(self.percentile / 100.0 * len(samples)) - 1)
+        return min(max(samples[rank], floor), ceiling)
+
+    def ceiling(self, stage: str) -> float:
+        """Get the upper bound of a stage's delay."""
+        return Config.TIMING_STAGES[stage][2]
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """
+        Record an observed readiness latency.
+
+        Args:
+            stage: Stage name
+            seconds: Time from the stage's action until it was observed ready
+        """
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append(round(seconds, 4))
+            self._dirty = True
+            due = time.monotonic() - self._saved_at >= Config.TIMING_SAVE_INTERVAL
+        if due:
+            self.save()
+
+    async def sleep(self, stage: str) -> float:
+        """
+        Wait for a stage's delay.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            float: Seconds slept
+        """
+        seconds = self.delay(stage)
+        await asyncio.sleep(seconds)
+        return seconds
+
+    async def wait_until(
+        self,
+        stage: str,
+        probe: Callable[[], Awaitable[bool]],
+        interval: float = None,
+        deadline: float = None
+    ) -> bool:
+        """
+        Wait for a readiness probe, using the stage delay as the deadline.
+
+        The observed latency is recorded when the probe passes; a timeout is
+        recorded at the deadline so slow machines push the delay up.
+
+        Args:
+            stage: Stage name
+            probe: Coroutine function returning True once the stage is ready
+            interval: Probe interval in seconds
+            deadline: Override for the deadline in seconds
+
+        Returns:
+            bool: True if the probe passed before the deadline
+        """
+        interval = interval if interval is not None else Config.PROBE_INTERVAL
+        deadline = deadline if deadline is not None else self.delay(stage)
+        start = time.monotonic()
+        while True:
+            try:
+                ready = await probe()
+            except Exception as e:
+                logger.warning("Readiness probe for %s failed: %s", stage, e)
+                ready = False
+            elapsed = time.monotonic() - start
+            if ready:
+                self.observe(stage, elapsed)
+                return True
+            if elapsed >= deadline:
+                self.observe(stage, self.ceiling(stage))
+                return False
+            await asyncio.sleep(min(interval, deadline - elapsed))
+
+    def load(self) -> None:
+        """Load persisted samples, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Ignoring unreadable timing model %s: %s", self.path, e)
+            return
+        with self._lock:
+            for stage, samples in data.get("samples", {}).items():
+                if stage in Config.TIMING_STAGES:
+                    self._samples[stage] = deque((float(s) for s in samples), maxlen=self.window)
+
+    def save(self) -> None:
+        """Persist samples if they changed since the last save."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"samples": {stage: list(samples) for stage, samples in self._samples.items()}}
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning("Failed to save timing model: %s", e)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Describe the current delay of every stage.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Stage -> delay and sample count
+        """
+        with self._lock:
+            counts = {stage: len(samples) for stage, samples in self._samples.items()}
+        return {
+            stage: {"delay": self.delay(stage), "samples": counts.get(stage, 0)}
+            for stage in Config.TIMING_STAGES
+        }
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_timing_model() -> TimingModel:
+    """
+    Get the shared timing model, loading persisted samples on first use.
+
+    Returns:
+        TimingModel: The process-wide model
+    """
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = TimingModel(Config.TIMING_MODEL_PATH)
+            atexit.register(_model.save)
+        return _model
+
+
+def set_timing_model(model: Optional[TimingModel]) -> Optional[TimingModel]:
+    """
+    Replace the shared timing model.
+
+    Args:
+        model: Model to install, or None to reset
+
+    Returns:
+        Optional[TimingModel]: The previously installed model
+    """
+    global _model
+    with _model_lock:
+        previous, _model = _model, model
+        return previous
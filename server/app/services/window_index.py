@@ -0,0 +1,260 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/window_index.py
+# Purpose: Workspace-to-window index and Cursor window title matching
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Workspace-to-window index.
+
+Cursor titles its windows "<dirty><file> - <folder> - Cursor" (the separator
+may be a hyphen or a dash). The index parses those titles as windows appear,
+retitle or close, and maps each workspace to the window showing it.
+"""
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Set
+from app.utils.logger import get_logger
+from app.services.window_monitor import WindowEvent, WindowInfo, get_window_monitor
+
+logger = get_logger(__name__)
+
+_APP_SUFFIX = re.compile(r'\s+[-–—]\s+Cursor\s*$', re.IGNORECASE)
+_DIRTY_PREFIX = re.compile(r'^\s*[●•*]\s*')
+_SEPARATOR = re.compile(r'\s+[-–—]\s+')
+_FOLDER_DECORATIONS = re.compile(r'\s+(\(Workspace\)|\[[^\]]*\])\s*$', re.IGNORECASE)
+
+
+class CursorTitle(NamedTuple):
+    """Parsed Cursor window title."""
+    file: Optional[str]
+    folder: Optional[str]
+    dirty: bool
+
+
+@lru_cache(maxsize=512)
+def parse_cursor_title(title: str) -> CursorTitle:
+    """
+    Parse a Cursor window title.
+
+    Args:
+        title: Raw window title, e.g. "● index.ts - my-repo - Cursor"
+
+    Returns:
+        CursorTitle: Lower-cased file and folder names plus the dirty marker
+    """
+    body = _APP_SUFFIX.sub('', title)
+    body, dirty = _DIRTY_PREFIX.subn('', body)
+    parts = [part for part in _SEPARATOR.split(body.strip()) if part]
+    if not parts or body.strip().lower() == 'cursor':
+        return CursorTitle(None, None, bool(dirty))
+
+    folder = _FOLDER_DECORATIONS.sub('', parts[-1]).strip().lower()
+    if len(parts) == 1:
+        # Either an empty workspace or a loose file; treat it as the folder
+        return CursorTitle(None, folder, bool(dirty))
+    file = ' - '.join(parts[:-1]).strip().lower()
+    return CursorTitle(file, folder, bool(dirty))
+
+
+def _workspace_key(workspace_path: str) -> str:
+    return os.path.normcase(os.path.normpath(os.path.abspath(workspace_path)))
+
+
+def _folder_name(workspace_path: str) -> str:
+    return os.path.basename(os.path.normpath(workspace_path)).lower()
+
+
+class CursorTitleMatcher:
+    """
+    Precompiled matcher for one file/workspace pair.
+
+    Built once per request so that matching a title is a cached parse plus
+    two string comparisons.
+    """
+
+    def __init__(self, file_path: Optional[str] = None, workspace_path: Optional[str] = None):
+        self.file = os.path.basename(file_path).lower() if file_path else None
+        self.folder = _folder_name(workspace_path) if workspace_path else None
+
+    def matches_file(self, title: str) -> bool:
+        """True if the title shows the target file (ignoring the folder)."""
+        if self.file is None:
+            return False
+        parsed = parse_cursor_title(title)
+        # A loose file without a folder is titled "<file> - Cursor"
+        shown = parsed.file if parsed.file is not None else parsed.folder
+        # Diff and preview editors decorate the name, e.g. "a.py (Working Tree)"
+        return shown is not None and (shown == self.file or shown.startswith(self.file + ' ('))
+
+    def matches_folder(self, title: str) -> bool:
+        """True if the title shows the target workspace folder."""
+        return self.folder is not None and parse_cursor_title(title).folder == self.folder
+
+    def matches(self, title: str) -> bool:
+        """True if the title shows the target file in the target workspace."""
+        if self.file is not None and not self.matches_file(title):
+            return False
+        if self.folder is not None and not self.matches_folder(title):
+            return False
+        return self.file is not None or self.folder is not None
+
+
+class WorkspaceWindowIndex:
+    """
+    Index from workspace path to Cursor window handle.
+
+    Kept current by window monitor events. Windows are grouped by the folder
+    name in their title; a workspace path is bound to a window either when
+    the folder name is unambiguous or when the window appears right after we
+    asked Cursor to open that workspace.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._titles: Dict[int, str] = {}
+        self._folder_of: Dict[int, str] = {}
+        self._by_folder: Dict[str, Set[int]] = {}
+        self._bound: Dict[str, int] = {}
+        self._bound_to: Dict[int, str] = {}
+        self._expected: Dict[str, str] = {}
+
+    def on_window_event(self, event: str, info: WindowInfo) -> None:
+        """
+        Update the index from a window monitor event.
+
+        Args:
+            event: ``WindowEvent`` kind
+            info: Window the event is about
+        """
+        with self._lock:
+            if event == WindowEvent.DESTROYED:
+                self._drop(info.hwnd)
+                return
+
+            self._titles[info.hwnd] = info.title
+            folder = parse_cursor_title(info.title).folder
+            previous = self._folder_of.get(info.hwnd)
+            if folder == previous:
+                return
+
+            if previous is not None:
+                self._by_folder.get(previous, set()).discard(info.hwnd)
+                self._unbind(info.hwnd)
+            if folder is None:
+                self._folder_of.pop(info.hwnd, None)
+                return
+
+            self._folder_of[info.hwnd] = folder
+            self._by_folder.setdefault(folder, set()).add(info.hwnd)
+            expected = self._expected.pop(folder, None)
+            if expected is not None:
+                self._bind(expected, info.hwnd)
+
+    def expect(self, workspace_path: str) -> None:
+        """
+        Note that Cursor was just asked to open a workspace.
+
+        The next window to show that folder is bound to this path, which
+        disambiguates workspaces that share a folder name.
+
+        Args:
+            workspace_path: Workspace being opened
+        """
+        with self._lock:
+            self._expected[_folder_name(workspace_path)] = _workspace_key(workspace_path)
+
+    def lookup(self, workspace_path: str) -> Optional[int]:
+        """
+        Find the window showing a workspace.
+
+        Args:
+            workspace_path: Workspace/repo root
+
+        Returns:
+            Optional[int]: Window handle, or None if not open or ambiguous
+        """
+        key = _workspace_key(workspace_path)
+        with self._lock:
+            hwnd = self._bound.get(key)
+            if hwnd is not None:
+                return hwnd
+            candidates = self._by_folder.get(_folder_name(workspace_path))
+            if not candidates:
+                return None
+            unbound = [hwnd for hwnd in candidates if hwnd not in self._bound_to]
+            if len(unbound) == 1:
+                self._bind(key, unbound[0])
+                return unbound[0]
+            return None
+
+    def title(self, hwnd: int) -> Optional[str]:
+        """Get the last known title of an indexed window."""
+        with self._lock:
+            return self._titles.get(hwnd)
+
+    def _bind(self, key: str, hwnd: int) -> None:
+        self._unbind(hwnd)
+        previous = self._bound.get(key)
+        if previous is not None:
+            self._bound_to.pop(previous, None)
+        self._bound[key] = hwnd
+        self._bound_to[hwnd] = key
+
+    def _unbind(self, hwnd: int) -> None:
+        key = self._bound_to.pop(hwnd, None)
+        if key is not None:
+            self._bound.pop(key, None)
+
+    def _drop(self, hwnd: int) -> None:
+        self._titles.pop(hwnd, None)
+        folder = self._folder_of.pop(hwnd, None)
+        if folder is not None:
+            self._by_folder.get(folder, set()).discard(hwnd)
+        self._unbind(hwnd)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_window_index() -> WorkspaceWindowIndex:
+    """
+    Get the shared workspace index, subscribing it to the window monitor.
+
+    Returns:
+        WorkspaceWindowIndex: The process-wide index
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            index = WorkspaceWindowIndex()
+            monitor = get_window_monitor()
+            monitor.add_listener(index.on_window_event)
+            for info in monitor.windows():
+                index.on_window_event(WindowEvent.CREATED, info)
+            _index = index
+        return _index
+
+
+def set_window_index(index: Optional[WorkspaceWindowIndex]) -> Optional[WorkspaceWindowIndex]:
+    """
+    Replace the shared index.
+
+    Args:
+        index: Index to install, or None to reset
+
+    Returns:
+        Optional[WorkspaceWindowIndex]: The previously installed index
+    """
+    global _index
+    with _index_lock:
+        previous, _index = _index, index
+        return previous
@@ -0,0 +1,635 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/window_monitor.py
+# Purpose: Background window monitor - event-driven window tracking and waiters
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Background window monitor.
+
+A single monitor thread keeps a snapshot of the windows we care about and
+wakes every waiter as soon as that snapshot changes. The snapshot is driven
+by window create/destroy/title-change events when the backend supports them,
+otherwise by one shared poll for all waiters.
+"""
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Collection, Dict, List, NamedTuple, Optional
+from app.config import Config
+from app.utils.logger import get_logger
+from app.services.process_tracker import get_process_tracker
+
+logger = get_logger(__name__)
+
+try:
+    import win32gui
+except Exception:
+    win32gui = None
+
+try:
+    import win32process
+except Exception:
+    win32process = None
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+try:
+    import ctypes
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+except Exception:
+    ctypes = None
+    wintypes = None
+    user32 = None
+
+
+class WindowInfo(NamedTuple):
+    """Snapshot of a single top-level window."""
+    hwnd: int
+    title: str
+    pid: int = 0
+
+
+class WindowEvent:
+    """Kinds of snapshot changes reported to listeners."""
+    CREATED = 'created'
+    RETITLED = 'retitled'
+    DESTROYED = 'destroyed'
+
+
+class WindowBackend(ABC):
+    """
+    Source of window information for the monitor.
+
+    Backends that can deliver change notifications set ``supports_events``
+    and implement ``run_event_loop``; all others are polled.
+    """
+
+    supports_events = False
+
+    @abstractmethod
+    def list_windows(self, pids: Optional[Collection[int]] = None) -> List[WindowInfo]:
+        """
+        Enumerate visible, titled top-level windows.
+
+        Args:
+            pids: Only enumerate windows owned by these processes (all if None)
+
+        Returns:
+            List[WindowInfo]: Current windows
+        """
+
+    def describe(self, hwnd: int) -> Optional[WindowInfo]:
+        """
+        Describe a single window.
+
+        Args:
+            hwnd: Window handle
+
+        Returns:
+            Optional[WindowInfo]: Window info, or None if it is gone or hidden
+        """
+        for info in self.list_windows(None):
+            if info.hwnd == hwnd:
+                return info
+        return None
+
+    def run_event_loop(self, on_event: Callable[[int], None]) -> None:
+        """
+        Block delivering window handles whose state may have changed.
+
+        Args:
+            on_event: Called with the hwnd of every created, destroyed,
+                shown, hidden or retitled window
+        """
+        raise NotImplementedError
+
+    def stop_event_loop(self) -> None:
+        """Make ``run_event_loop`` return."""
+
+
+class Win32WindowBackend(WindowBackend):
+    """Window backend built on pywin32 with WinEvent hooks via ctypes."""
+
+    EVENT_OBJECT_CREATE = 0x8000
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    OBJID_WINDOW = 0
+    CHILDID_SELF = 0
+    GA_ROOT = 2
+    WM_QUIT = 0x0012
+
+    def __init__(self):
+        self.supports_events = win32gui is not None and user32 is not None
+        self._thread_id = None
+        self._hook_proc = None
+
+    def list_windows(self, pids: Optional[Collection[int]] = None) -> List[WindowInfo]:
+        if win32gui is None:
+            return []
+        if pids is not None and not pids:
+            return []
+
+        def callback(hwnd, windows):
+            if win32gui.IsWindowVisible(hwnd):
+                pid = self._get_pid(hwnd)
+                if pids is not None and pid not in pids:
+                    return True
+                title = win32gui.GetWindowText(hwnd)
+                if title:
+                    windows.append(WindowInfo(hwnd, title, pid))
+            return True
+
+        windows = []
+        if pids is not None and psutil is not None:
+            # Walk only the threads of the given processes
+            for pid in pids:
+                try:
+                    threads = psutil.Process(pid).threads()
+                except Exception:
+                    continue
+                for thread in threads:
+                    try:
+                        win32gui.EnumThreadWindows(thread.id, callback, windows)
+                    except Exception:
+                        pass  # Threads without windows report an error
+        else:
+            win32gui.EnumWindows(callback, windows)
+        return windows
+
+    def describe(self, hwnd: int) -> Optional[WindowInfo]:
+        if win32gui is None:
+            return None
+        try:
+            if not win32gui.IsWindow(hwnd) or not win32gui.IsWindowVisible(hwnd):
+                return None
+            title = win32gui.GetWindowText(hwnd)
+        except Exception:
+            return None
+        if not title:
+            return None
+        return WindowInfo(hwnd, title, self._get_pid(hwnd))
+
+    def run_event_loop(self, on_event: Callable[[int], None]) -> None:
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+
+        def hook_proc(hook, event, hwnd, id_object, id_child, thread, timestamp):
+            if not hwnd or id_object != self.OBJID_WINDOW or id_child != self.CHILDID_SELF:
+                return
+            try:
+                if user32.GetAncestor(hwnd, self.GA_ROOT) not in (hwnd, None, 0):
+                    return
+                on_event(hwnd)
+            except Exception as e:
+                logger.error("Error handling window event: %s", e)
+
+        # Keep a reference so the callback is not garbage collected
+        self._hook_proc = WinEventProc(hook_proc)
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        hook = user32.SetWinEventHook(
+            self.EVENT_OBJECT_CREATE, self.EVENT_OBJECT_NAMECHANGE, 0,
+            self._hook_proc, 0, 0,
+            self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS
+        )
+        if not hook:
+            raise OSError("SetWinEventHook failed")
+
+        try:
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            user32.UnhookWinEvent(hook)
+            self._thread_id = None
+
+    def stop_event_loop(self) -> None:
+        if self._thread_id is not None:
+            user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+
+    @staticmethod
+    def _get_pid(hwnd: int) -> int:
+        if win32process is None:
+            return 0
+        try:
+            return win32process.GetWindowThreadProcessId(hwnd)[1]
+        except Exception:
+            return 0
+
+
+class FakeWindowBackend(WindowBackend):
+    """
+    In-memory window backend for tests.
+
+    Windows are created, retitled and destroyed explicitly; every change is
+    delivered to the monitor as an event, exactly like the Win32 hooks.
+    """
+
+    supports_events = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows: Dict[int, WindowInfo] = {}
+        self._next_hwnd = 0x1000
+        self._on_event = None
+        self._stopped = threading.Event()
+
+    def create_window(self, title: str, pid: int = 1, hwnd: Optional[int] = None) -> int:
+        """Create a window and return its handle."""
+        with self._lock:
+            if hwnd is None:
+                self._next_hwnd += 1
+                hwnd = self._next_hwnd
+            self._windows[hwnd] = WindowInfo(hwnd, title, pid)
+        self._emit(hwnd)
+        return hwnd
+
+    def set_title(self, hwnd: int, title: str) -> None:
+        """Change the title of an existing window."""
+        with self._lock:
+            self._windows[hwnd] = self._windows[hwnd]._replace(title=title)
+        self._emit(hwnd)
+
+    def destroy_window(self, hwnd: int) -> None:
+        """Destroy a window."""
+        with self._lock:
+            self._windows.pop(hwnd, None)
+        self._emit(hwnd)
+
+    def list_windows(self, pids: Optional[Collection[int]] = None) -> List[WindowInfo]:
+        with self._lock:
+            return [info for info in self._windows.values() if pids is None or info.pid in pids]
+
+    def describe(self, hwnd: int) -> Optional[WindowInfo]:
+        with self._lock:
+            return self._windows.get(hwnd)
+
+    def run_event_loop(self, on_event: Callable[[int], None]) -> None:
+        self._stopped.clear()
+        self._on_event = on_event
+        self._stopped.wait()
+        self._on_event = None
+
+    def stop_event_loop(self) -> None:
+        self._stopped.set()
+
+    def _emit(self, hwnd: int) -> None:
+        on_event = self._on_event
+        if on_event is not None:
+            on_event(hwnd)
+
+
+class WindowMonitor:
+    """
+    Shared window snapshot with blocking waiters.
+
+    Only windows accepted by the ``accept`` filter are tracked; ``scope``
+    optionally narrows enumeration to a set of process IDs. Any number of
+    threads may block in ``wait_for`` and all of them are woken the moment the
+    snapshot changes.
+    """
+
+    def __init__(
+        self,
+        backend: WindowBackend,
+        accept: Optional[Callable[[WindowInfo], bool]] = None,
+        scope: Optional[Callable[[], Collection[int]]] = None,
+        poll_interval: float = None,
+        idle_poll_interval: float = None,
+        use_events: bool = None
+    ):
+        self.backend = backend
+        self._accept = accept or (lambda info: True)
+        self._scope = scope
+        self._poll_interval = poll_interval if poll_interval is not None else Config.FILE_POLL_INTERVAL
+        self._idle_poll_interval = (
+            idle_poll_interval if idle_poll_interval is not None else Config.WINDOW_IDLE_POLL_INTERVAL
+        )
+        self._use_events = Config.WINDOW_EVENTS_ENABLED if use_events is None else use_events
+
+        self._cond = threading.Condition()
+        self._windows: Dict[int, WindowInfo] = {}
+        self._first_seen: Dict[int, float] = {}
+        self._listeners: List[Callable[[str, WindowInfo], None]] = []
+        self._wakers: List[Callable[[], None]] = []
+        self._waiters = 0
+        self._poke = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def event_driven(self) -> bool:
+        """True if the snapshot is maintained from window events."""
+        return self._use_events and self.backend.supports_events
+
+    def start(self) -> None:
+        """Take an initial snapshot and start the background thread."""
+        if self._thread is not None:
+            return
+        self.refresh()
+        self._stop.clear()
+        target = self._run_events if self.event_driven else self._run_poll
+        self._thread = threading.Thread(target=target, name='window-monitor', daemon=True)
+        self._thread.start()
+        logger.info("Window monitor started (%s)", 'event-driven' if self.event_driven else 'polling')
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._poke.set()
+        if self.event_driven:
+            self.backend.stop_event_loop()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def add_listener(self, listener: Callable[[str, WindowInfo], None]) -> None:
+        """
+        Register a callback for snapshot changes.
+
+        Args:
+            listener: Called as ``listener(event, info)`` with a ``WindowEvent``
+                kind; runs on the monitor thread and must not block
+        """
+        with self._cond:
+            self._listeners.append(listener)
+
+    def windows(self) -> List[WindowInfo]:
+        """
+        Get the current snapshot.
+
+        Returns:
+            List[WindowInfo]: Tracked windows in order of appearance
+        """
+        with self._cond:
+            return list(self._windows.values())
+
+    def first_seen(self, hwnd: int) -> Optional[float]:
+        """
+        Get the monotonic time a window first entered the snapshot.
+
+        Args:
+            hwnd: Window handle
+
+        Returns:
+            Optional[float]: ``time.monotonic()`` timestamp, or None if unknown
+        """
+        with self._cond:
+            return self._first_seen.get(hwnd)
+
+    def wait_for(
+        self,
+        predicate: Callable[[List[WindowInfo]], Any],
+        timeout: float,
+        recheck_interval: float = None
+    ) -> Any:
+        """
+        Block until ``predicate`` returns a truthy value for the snapshot.
+
+        Args:
+            predicate: Called with the current windows after every change
+            timeout: Maximum time to wait in seconds
+            recheck_interval: Re-evaluate at least this often even without
+                changes (for time-based predicates)
+
+        Returns:
+            Any: The predicate's truthy result, or None on timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._waiters += 1
+            self._poke.set()
+            try:
+                while True:
+                    result = predicate(list(self._windows.values()))
+                    if result:
+                        return result
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    if recheck_interval is not None:
+                        remaining = min(remaining, recheck_interval)
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters -= 1
+
+        # One last full scan in case an event was missed
+        self.refresh()
+        with self._cond:
+            return predicate(list(self._windows.values())) or None
+
+    async def wait_for_async(
+        self,
+        predicate: Callable[[List[WindowInfo]], Any],
+        timeout: float,
+        recheck_interval: float = None
+    ) -> Any:
+        """
+        Await until ``predicate`` returns a truthy value for the snapshot.
+
+        Like ``wait_for``, but suspends the calling coroutine instead of
+        blocking a thread; the monitor thread wakes it on every change.
+
+        Args:
+            predicate: Called with the current windows after every change
+            timeout: Maximum time to wait in seconds
+            recheck_interval: Re-evaluate at least this often even without
+                changes (for time-based predicates)
+
+        Returns:
+            Any: The predicate's truthy result, or None on timeout
+        """
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+
+        def wake():
+            loop.call_soon_threadsafe(changed.set)
+
+        deadline = loop.time() + timeout
+        with self._cond:
+            self._waiters += 1
+            self._wakers.append(wake)
+            self._poke.set()
+        try:
+            while True:
+                changed.clear()
+                with self._cond:
+                    result = predicate(list(self._windows.values()))
+                if result:
+                    return result
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                if recheck_interval is not None:
+                    remaining = min(remaining, recheck_interval)
+                try:
+                    await asyncio.wait_for(changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._cond:
+                self._waiters -= 1
+                self._wakers.remove(wake)
+
+        # One last full scan in case an event was missed
+        await loop.run_in_executor(None, self.refresh)
+        with self._cond:
+            return predicate(list(self._windows.values())) or None
+
+    def refresh(self) -> None:
+        """Re-enumerate all windows and reconcile the snapshot."""
+        try:
+            pids = self._scope() if self._scope is not None else None
+            current = {info.hwnd: info for info in self.backend.list_windows(pids) if self._accept(info)}
+        except Exception as e:
+            logger.error("Error enumerating windows: %s", e)
+            return
+
+        events = []
+        with self._cond:
+            for hwnd in list(self._windows):
+                if hwnd not in current:
+                    events.append((WindowEvent.DESTROYED, self._remove(hwnd)))
+            for hwnd, info in current.items():
+                event = self._upsert(info)
+                if event:
+                    events.append((event, info))
+            if events:
+                self._notify()
+            listeners = list(self._listeners)
+        self._dispatch(listeners, events)
+
+    def handle_event(self, hwnd: int) -> None:
+        """
+        Reconcile a single window after a backend event.
+
+        Args:
+            hwnd: Handle of the window that changed
+        """
+        info = self.backend.describe(hwnd)
+        events = []
+        with self._cond:
+            if info is not None and self._accept(info):
+                event = self._upsert(info)
+                if event:
+                    events.append((event, info))
+            elif hwnd in self._windows:
+                events.append((WindowEvent.DESTROYED, self._remove(hwnd)))
+            if events:
+                self._notify()
+            listeners = list(self._listeners)
+        self._dispatch(listeners, events)
+
+    def _notify(self) -> None:
+        # Caller holds self._cond; wakes blocked threads and awaiting coroutines
+        self._cond.notify_all()
+        for wake in self._wakers:
+            try:
+                wake()
+            except RuntimeError:
+                pass  # The waiter's loop is closed
+
+    def _upsert(self, info: WindowInfo) -> Optional[str]:
+        previous = self._windows.get(info.hwnd)
+        if previous == info:
+            return None
+        self._windows[info.hwnd] = info
+        if previous is None:
+            self._first_seen[info.hwnd] = time.monotonic()
+            return WindowEvent.CREATED
+        return WindowEvent.RETITLED
+
+    def _remove(self, hwnd: int) -> WindowInfo:
+        self._first_seen.pop(hwnd, None)
+        return self._windows.pop(hwnd)
+
+    @staticmethod
+    def _dispatch(listeners, events) -> None:
+        for event, info in events:
+            for listener in listeners:
+                try:
+                    listener(event, info)
+                except Exception as e:
+                    logger.error("Window listener failed: %s", e, exc_info=True)
+
+    def _run_events(self) -> None:
+        try:
+            self.backend.run_event_loop(self.handle_event)
+        except Exception as e:
+            if self._stop.is_set():
+                return
+            logger.warning("Window events unavailable, falling back to polling: %s", e)
+            self._use_events = False
+            self._run_poll()
+
+    def _run_poll(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                active = self._waiters > 0
+            self._poke.wait(self._poll_interval if active else self._idle_poll_interval)
+            self._poke.clear()
+            if self._stop.is_set():
+                break
+            self.refresh()
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_window_monitor() -> WindowMonitor:
+    """
+    Get the shared Cursor window monitor, starting it on first use.
+
+    Returns:
+        WindowMonitor: The process-wide monitor
+    """
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            tracker = get_process_tracker()
+            monitor = WindowMonitor(
+                Win32WindowBackend(),
+                accept=lambda info: tracker.is_cursor_pid(info.pid),
+                scope=tracker.pids
+            )
+
+            def on_change(event, info):
+                if event == WindowEvent.DESTROYED:
+                    tracker.forget_if_exited(info.pid)
+
+            monitor.add_listener(on_change)
+            monitor.start()
+            _monitor = monitor
+        return _monitor
+
+
+def set_window_monitor(monitor: Optional[WindowMonitor]) -> Optional[WindowMonitor]:
+    """
+    Replace the shared monitor (e.g. with one driven by a fake backend).
+
+    Args:
+        monitor: Started monitor to install, or None to reset
+
+    Returns:
+        Optional[WindowMonitor]: The previously installed monitor
+    """
+    global _monitor
+    with _monitor_lock:
+        previous, _monitor = _monitor, monitor
+        return previous
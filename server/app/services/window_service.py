@@ -1,7 +1,7 @@
 # ============================================================================
 # Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
 # File: server/app/services/window_service.py
-# Purpose: Window management and polling - Cursor detection and focus
+# Purpose: Window management and waiting - Cursor detection and focus
 #
 # Copyright (c) 2025 Volodymyr Yepishev
 #              All rights reserved.
@@ -10,13 +10,15 @@
 # ============================================================================
 
 """
-Window management and polling service.
+Window management and waiting service.
 """
-import os
 import time
-from typing import List, Tuple, Optional
+from typing import Collection, FrozenSet, List, Tuple, Optional
 from app.config import Config
 from app.utils.logger import get_logger
+from app.services.window_monitor import get_window_monitor
+from app.services.process_tracker import get_process_tracker
+from app.services.window_index import CursorTitleMatcher, get_window_index
 
 logger = get_logger(__name__)
 
@@ -40,26 +42,36 @@ class WindowService:
     """Service for window management and cursor detection."""
     
     @staticmethod
-    def _get_cursor_windows() -> List[Tuple[int, str]]:
+    def cursor_pids() -> FrozenSet[int]:
+        """
+        Get the PIDs of the running Cursor processes.
+        
+        Returns:
+            FrozenSet[int]: Cursor process IDs known to the process tracker
+        """
+        return get_process_tracker().pids()
+    
+    @staticmethod
+    def _get_cursor_windows(pids: Optional[Collection[int]] = None) -> List[Tuple[int, str]]:
         """
         Get all visible Cursor windows.
         
+        Only windows owned by Cursor processes are tracked, so browser tabs
+        or other apps with "Cursor" in their title never match.
+        
+        Args:
+            pids: Restrict to windows of these processes (all Cursor windows if None)
+        
         Returns:
             List[Tuple[int, str]]: List of (hwnd, title) tuples
         """
         if win32gui is None:
             return []
         
-        def callback(hwnd, windows):
-            if win32gui.IsWindowVisible(hwnd):
-                title = win32gui.GetWindowText(hwnd)
-                if title and "cursor" in title.lower():
-                    windows.append((hwnd, title))
-            return True
-        
-        cursor_windows = []
-        win32gui.EnumWindows(callback, cursor_windows)
-        return cursor_windows
+        return [
+            (info.hwnd, info.title) for info in get_window_monitor().windows()
+            if pids is None or info.pid in pids
+        ]
     
     @staticmethod
     def is_cursor_running() -> bool:
@@ -76,11 +88,11 @@ class WindowService:
             cursor_windows = WindowService._get_cursor_windows()
             return len(cursor_windows) > 0
         except Exception as e:
-            logger.error(f"Error checking if Cursor is running: {e}")
+            logger.error("Error checking if Cursor is running: %s", e)
             return False
     
     @staticmethod
-    def wait_for_cursor_startup(timeout: float = None) -> bool:
+    async def wait_for_cursor_startup(timeout: float = None) -> bool:
         """
         Wait for Cursor to start up (at least one window appears).
         
@@ -99,23 +111,26 @@ class WindowService:
         logger.info("Waiting for Cursor to start up...")
         start_time = time.time()
         
-        while time.time() - start_time < timeout:
-            if WindowService.is_cursor_running():
-                elapsed = time.time() - start_time
-                logger.info(f"✓ Cursor started! (took {elapsed:.1f}s)")
-                return True
-            time.sleep(Config.POLL_INTERVAL)
+        window = await get_window_monitor().wait_for_async(lambda windows: windows[0] if windows else None, timeout)
+        if window:
+            elapsed = time.time() - start_time
+            logger.info("✓ Cursor started! (took %.1fs)", elapsed)
+            return True
         
-        logger.warning(f"Timeout waiting for Cursor to start (waited {timeout}s)")
+        logger.warning("Timeout waiting for Cursor to start (waited %ss)", timeout)
         return False
     
     @staticmethod
-    def wait_for_cursor_ready(timeout: float = None) -> bool:
+    async def wait_for_cursor_ready(timeout: float = None, pids: Optional[Collection[int]] = None) -> bool:
         """
         Wait for Cursor to be fully ready and responsive after startup.
         
+        A window counts as ready once it belongs to a tracked Cursor process
+        and has stayed up for ``Config.READY_STABLE_TIME``.
+        
         Args:
             timeout: Maximum time to wait in seconds
+            pids: Cursor PIDs to accept (defaults to the process tracker's set)
             
         Returns:
             bool: True if ready, False if timeout
@@ -128,49 +143,44 @@ class WindowService:
         
         logger.info("Waiting for Cursor to become responsive...")
         start_time = time.time()
-        consecutive_checks = 0
-        required_consecutive = Config.REQUIRED_CONSECUTIVE_CHECKS
-        
-        while time.time() - start_time < timeout:
-            try:
-                cursor_windows = WindowService._get_cursor_windows()
-                
-                if cursor_windows:
-                    hwnd = cursor_windows[0][0]
-                    
-                    try:
-                        thread_id, process_id = win32process.GetWindowThreadProcessId(hwnd)
-                        
-                        if process_id > 0:
-                            consecutive_checks += 1
-                            if consecutive_checks >= required_consecutive:
-                                elapsed = time.time() - start_time
-                                logger.info(f"✓ Cursor is responsive! (took {elapsed:.1f}s)")
-                                return True
-                        else:
-                            consecutive_checks = 0
-                    except:
-                        consecutive_checks = 0
-                else:
-                    consecutive_checks = 0
-                
-                time.sleep(Config.POLL_INTERVAL)
-            except Exception as e:
-                logger.error(f"Error checking if Cursor is ready: {e}")
-                consecutive_checks = 0
-                time.sleep(Config.POLL_INTERVAL)
-        
-        logger.warning(f"Timeout waiting for Cursor to be ready (waited {timeout}s)")
+        monitor = get_window_monitor()
+        tracker = get_process_tracker()
+        
+        def stable_window(windows):
+            now = time.monotonic()
+            cursor_pids = pids if pids is not None else tracker.pids()
+            for info in windows:
+                first_seen = monitor.first_seen(info.hwnd)
+                if info.pid in cursor_pids and first_seen is not None and now - first_seen >= Config.READY_STABLE_TIME:
+                    return info
+            return None
+        
+        window = await monitor.wait_for_async(stable_window, timeout, recheck_interval=Config.FILE_POLL_INTERVAL)
+        if window:
+            elapsed = time.time() - start_time
+            logger.info("✓ Cursor is responsive! (took %.1fs)", elapsed)
+            return True
+        
+        logger.warning("Timeout waiting for Cursor to be ready (waited %ss)", timeout)
         return False
     
     @staticmethod
-    def wait_for_file_loaded(target_filename: str, timeout: float) -> bool:
+    async def wait_for_file_loaded(
+        target_filename: str,
+        timeout: float,
+        workspace_path: Optional[str] = None
+    ) -> bool:
         """
-        Poll Cursor window titles to detect when the target file has been loaded.
+        Wait for a Cursor window title to show that the target file has been loaded.
+        
+        When a workspace is given, only the window showing that workspace
+        counts, so a file with a common name (index.ts, README.md) open in
+        another window does not end the wait early.
         
         Args:
             target_filename: Filename to look for in window titles
             timeout: Maximum time to wait in seconds
+            workspace_path: Workspace the file was opened in (optional)
             
         Returns:
             bool: True if file is detected in window title, False if timeout
@@ -178,54 +188,133 @@ class WindowService:
         if win32gui is None or not target_filename:
             return False
         
-        target_basename = os.path.basename(target_filename).lower()
-        logger.info(f"Polling for file to load: {target_basename}")
+        matcher = CursorTitleMatcher(target_filename, workspace_path)
+        index = get_window_index()
+        logger.info("Waiting for file to load: %s", matcher.file)
+        
+        def matching_window(windows):
+            if workspace_path:
+                # Only the workspace's own window counts; until it appears
+                # (cold open) keep waiting rather than match by file name
+                hwnd = index.lookup(workspace_path)
+                if hwnd is not None:
+                    return next((info for info in windows if info.hwnd == hwnd and matcher.matches_file(info.title)), None)
+                return next((info for info in windows if matcher.matches(info.title)), None)
+            return next((info for info in windows if matcher.matches_file(info.title)), None)
         
         start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                cursor_windows = WindowService._get_cursor_windows()
-                
-                for hwnd, title in cursor_windows:
-                    if target_basename in title.lower():
-                        elapsed = time.time() - start_time
-                        logger.info(f"✓ File loaded! Found in window: {title} (took {elapsed:.1f}s)")
-                        return True
-                
-                time.sleep(Config.FILE_POLL_INTERVAL)
-            except Exception as e:
-                logger.error(f"Error polling for file: {e}")
-                return False
-        
-        logger.warning(f"Timeout waiting for file to load (waited {timeout}s)")
+        try:
+            window = await get_window_monitor().wait_for_async(matching_window, timeout)
+        except Exception as e:
+            logger.error("Error waiting for file: %s", e)
+            return False
+        
+        if window:
+            elapsed = time.time() - start_time
+            logger.info("✓ File loaded! Found in window: %s (took %.1fs)", window.title, elapsed)
+            return True
+        
+        logger.warning("Timeout waiting for file to load (waited %ss)", timeout)
         return False
     
     @staticmethod
-    def find_cursor_window(target_filename: Optional[str] = None) -> Optional[Tuple[int, str]]:
+    def find_cursor_window(
+        target_filename: Optional[str] = None,
+        workspace_path: Optional[str] = None,
+        pids: Optional[Collection[int]] = None
+    ) -> Optional[Tuple[int, str]]:
         """
-        Find a Cursor window, optionally matching by filename.
+        Find a Cursor window, preferring the one showing the given workspace.
+        
+        With a workspace, only its indexed window or a window titled with its
+        folder is returned; a window of another workspace showing a file of
+        the same name never is.
         
         Args:
             target_filename: Optional filename to match in window title
+            workspace_path: Optional workspace to look up in the window index
+            pids: Restrict to windows of these Cursor processes (all if None)
             
         Returns:
             Optional[Tuple[int, str]]: (hwnd, title) or None if not found
         """
-        cursor_windows = WindowService._get_cursor_windows()
+        cursor_windows = WindowService._get_cursor_windows(pids)
         
         if not cursor_windows:
             return None
         
-        logger.info(f"Found {len(cursor_windows)} Cursor window(s)")
+        logger.info("Found %s Cursor window(s)", len(cursor_windows))
         
-        # If target_filename provided, try to find window with that file
-        if target_filename:
-            target_basename = os.path.basename(target_filename)
-            for hwnd, title in cursor_windows:
-                if target_basename.lower() in title.lower():
-                    logger.info(f"Found matching window: {title}")
-                    return (hwnd, title)
+        # Workspace lookup is a single dictionary hit in the window index
+        if workspace_path:
+            hwnd = get_window_index().lookup(workspace_path)
+            for window in cursor_windows:
+                if window[0] == hwnd:
+                    logger.info("Found workspace window: %s", window[1])
+                    return window
+        
+        # Otherwise rank titles: file in workspace, then workspace; the file
+        # name alone only when no workspace was given
+        if target_filename or workspace_path:
+            matcher = CursorTitleMatcher(target_filename, workspace_path)
+            if workspace_path:
+                ranking = (matcher.matches, matcher.matches_folder)
+            else:
+                ranking = (matcher.matches_file,)
+            for matches in ranking:
+                for hwnd, title in cursor_windows:
+                    if matches(title):
+                        logger.info("Found matching window: %s", title)
+                        return (hwnd, title)
+            if workspace_path:
+                logger.warning("No Cursor window shows workspace %s", workspace_path)
+                return None
         
         # Return first window as fallback
         return cursor_windows[0]
-
+    
+    @staticmethod
+    async def wait_for_workspace_window(workspace_path: str, timeout: float = None) -> bool:
+        """
+        Wait for a window showing a workspace to appear.
+        
+        Args:
+            workspace_path: Workspace/repo root
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            bool: True if the workspace window appeared, False if timeout
+        """
+        if win32gui is None:
+            return False
+        
+        if timeout is None:
+            timeout = Config.CURSOR_STARTUP_TIMEOUT
+        
+        index = get_window_index()
+        try:
+            return await get_window_monitor().wait_for_async(lambda windows: index.lookup(workspace_path) is not None, timeout) is not None
+        except Exception as e:
+            logger.error("Error waiting for workspace window: %s", e)
+            return False
+    
+    @staticmethod
+    def close_window(hwnd: int) -> bool:
+        """
+        Ask a window to close (as if its close button was clicked).
+        
+        Args:
+            hwnd: Window handle
+            
+        Returns:
+            bool: True if the close request was posted
+        """
+        if win32gui is None:
+            return False
+        
+        try:
+            win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
+            return True
+        except Exception as e:
+            logger.error("Error closing window %s: %s", hwnd, e)
+            return False
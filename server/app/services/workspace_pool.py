@@ -0,0 +1,357 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/app/services/workspace_pool.py
+# Purpose: Workspace window pool - usage history and pre-warmed windows
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Workspace window pool.
+
+Remembers which workspaces requests were served in, scored by an
+exponentially decaying use count, and keeps windows for the top
+``WORKSPACE_POOL_SIZE`` of them open so most requests find their workspace
+already loaded (the hot path) instead of waiting for a cold start.
+
+Pre-warming runs as a low-priority job on the automation queue, at startup
+and whenever the queue has been idle for ``WORKSPACE_POOL_IDLE_SECONDS``, so
+it never competes with a request for focus. It stays within a window and
+(optionally) memory budget. Windows the pool opened that no request has used
+since are closed again, least recently used first, once their workspace drops
+out of the top N or the window budget is exceeded; windows the user opened,
+or that served a request, are never closed.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from app.config import Config
+from app.utils.logger import get_logger
+from app.services.async_runtime import get_automation_loop, run_blocking
+from app.services.cursor_launcher import CursorLauncher
+from app.services.desktop_scheduler import get_desktop_scheduler
+from app.services.file_index import get_file_indexes
+from app.services.job_queue import QueueFullError, get_automation_queue
+from app.services.process_tracker import get_process_tracker
+from app.services.window_index import get_window_index
+from app.services.window_monitor import get_window_monitor
+from app.services.window_service import WindowService
+
+logger = get_logger(__name__)
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+
+def _key(workspace_path: str) -> str:
+    return os.path.normcase(os.path.abspath(workspace_path))
+
+
+def _no_report(stage: str, **data) -> None:
+    pass
+
+
+class WorkspacePool:
+    """Workspace usage history and the windows pre-opened from it."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        size: int = None,
+        max_windows: int = None,
+        max_memory_mb: int = None,
+        half_life: float = None
+    ):
+        self.path = path
+        self.size = size if size is not None else Config.WORKSPACE_POOL_SIZE
+        self.max_windows = max_windows if max_windows is not None else Config.WORKSPACE_POOL_MAX_WINDOWS
+        self.max_memory_mb = max_memory_mb if max_memory_mb is not None else Config.WORKSPACE_POOL_MAX_MEMORY_MB
+        self.half_life = half_life if half_life is not None else Config.WORKSPACE_POOL_HALF_LIFE
+        self._lock = threading.Lock()
+        self._usage: Dict[str, Dict[str, Any]] = {}  # key -> path, score, count, lastUsed
+        self._prewarmed: Set[str] = set()  # keys of windows we opened that no request has used yet
+        self._dirty = False
+        self._job = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if path:
+            self.load()
+
+    def record(self, workspace_path: str) -> None:
+        """
+        Note that a request was served in a workspace.
+
+        Args:
+            workspace_path: Workspace/repo root of the request
+        """
+        key = _key(workspace_path)
+        now = time.time()
+        with self._lock:
+            entry = self._usage.get(key)
+            if entry is None:
+                entry = self._usage[key] = {"path": workspace_path, "score": 0.0, "count": 0, "lastUsed": now}
+            entry["score"] = self._decayed(entry, now) + 1.0
+            entry["count"] += 1
+            entry["lastUsed"] = now
+            # The window now belongs to the user and is never closed by the pool
+            self._prewarmed.discard(key)
+            if len(self._usage) > Config.WORKSPACE_HISTORY_MAX:
+                stalest = min(self._usage, key=lambda k: self._decayed(self._usage[k], now))
+                del self._usage[stalest]
+            self._dirty = True
+
+    def top(self) -> List[str]:
+        """
+        Get the workspaces to keep open, most used first.
+
+        Returns:
+            List[str]: Up to ``size`` workspace paths that still exist
+        """
+        now = time.time()
+        with self._lock:
+            ranked = sorted(self._usage.values(), key=lambda entry: self._decayed(entry, now), reverse=True)
+        return [entry["path"] for entry in ranked if os.path.isdir(entry["path"])][:self.size]
+
+    async def prewarm(self, report: Callable[..., None] = _no_report) -> Dict[str, Any]:
+        """
+        Close evicted pool windows and open the missing top workspaces.
+
+        Workspaces are opened one at a time, each waiting for its window, and
+        only while the window and memory budgets allow.
+
+        Args:
+            report: Progress callback invoked per workspace
+
+        Returns:
+            Dict[str, Any]: Workspaces opened and closed
+        """
+        # Window leases keep requests for the same workspace out meanwhile
+        scheduler = get_desktop_scheduler()
+        opened, closed = [], []
+        for hwnd, workspace_path in self._evictions():
+            report("evict", workspace=workspace_path)
+            async with scheduler.window(workspace_path):
+                if not await run_blocking(WindowService.close_window, hwnd):
+                    continue
+            with self._lock:
+                self._prewarmed.discard(_key(workspace_path))
+            closed.append(workspace_path)
+            logger.info("Closed pre-warmed window of %s", workspace_path)
+
+        index = get_window_index()
+        for workspace_path in self.top():
+            # Have the file index ready for requests with moved paths
+            get_file_indexes().get(workspace_path)
+            if index.lookup(workspace_path) is not None:
+                continue
+            if not self._within_budget():
+                logger.info("Workspace pool budget reached, not pre-warming further")
+                break
+            report("prewarm", workspace=workspace_path)
+            async with scheduler.window(workspace_path):
+                # A request may have opened it while we waited for the lease
+                if index.lookup(workspace_path) is not None:
+                    continue
+                launch = await run_blocking(CursorLauncher.open_workspace, workspace_path)
+                if not launch.ok:
+                    continue
+                ready = await WindowService.wait_for_workspace_window(workspace_path)
+            if ready:
+                with self._lock:
+                    self._prewarmed.add(_key(workspace_path))
+                opened.append(workspace_path)
+                logger.info("Pre-warmed workspace window: %s", workspace_path)
+            else:
+                logger.warning("Pre-warmed workspace did not open in time: %s", workspace_path)
+
+        return {"status": "ok", "opened": opened, "closed": closed}
+
+    def schedule(self) -> bool:
+        """
+        Queue a pre-warm job unless one is pending or there is nothing to do.
+
+        Returns:
+            bool: True if a job was queued
+        """
+        if self._job is not None and not self._job.finished:
+            return False
+        if not self._needs_work():
+            return False
+        try:
+            self._job = get_automation_queue().submit(
+                "prewarm",
+                lambda job: get_automation_loop().run(self.prewarm(job.report)),
+                Config.JOB_PRIORITY_PREWARM
+            )
+        except QueueFullError:
+            return False
+        return True
+
+    def start(self) -> None:
+        """Start pre-warming at startup and whenever the automation queue is idle."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='workspace-pool', daemon=True)
+        self._thread.start()
+        logger.info("Workspace pool started (top %s, at most %s window(s))", self.size, self.max_windows)
+
+    def stop(self) -> None:
+        """Stop the background scheduler and persist the history."""
+        self._stop.set()
+        self.save()
+
+    def load(self) -> None:
+        """Load the persisted usage history, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Ignoring unreadable workspace history %s: %s", self.path, e)
+            return
+        with self._lock:
+            for entry in data.get("workspaces", []):
+                self._usage[_key(entry["path"])] = {
+                    "path": entry["path"],
+                    "score": float(entry.get("score", 0.0)),
+                    "count": int(entry.get("count", 0)),
+                    "lastUsed": float(entry.get("lastUsed", 0.0)),
+                }
+
+    def save(self) -> None:
+        """Persist the usage history if it changed since the last save."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"workspaces": list(self._usage.values())}
+            self._dirty = False
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning("Failed to save workspace history: %s", e)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Describe the remembered workspaces, most used first.
+
+        Returns:
+            List[Dict[str, Any]]: Path, current score, use count, last use and
+                whether the pool holds an unused window for it
+        """
+        now = time.time()
+        with self._lock:
+            entries = [
+                dict(entry, score=round(self._decayed(entry, now), 3), prewarmed=key in self._prewarmed)
+                for key, entry in self._usage.items()
+            ]
+        return sorted(entries, key=lambda entry: entry["score"], reverse=True)
+
+    def _decayed(self, entry: Dict[str, Any], now: float) -> float:
+        if self.half_life <= 0:
+            return entry["score"]
+        return entry["score"] * 0.5 ** (max(0.0, now - entry["lastUsed"]) / self.half_life)
+
+    def _evictions(self) -> List[Tuple[int, str]]:
+        """Pool-owned windows to close, least recently used first."""
+        top = {_key(path) for path in self.top()}
+        index = get_window_index()
+        excess = len(get_window_monitor().windows()) - self.max_windows
+        with self._lock:
+            owned = sorted(
+                (self._usage[key]["lastUsed"] if key in self._usage else 0.0, key) for key in self._prewarmed
+            )
+            paths = {key: self._usage[key]["path"] if key in self._usage else key for _, key in owned}
+        evictions = []
+        for _, key in owned:
+            hwnd = index.lookup(paths[key])
+            if hwnd is None:
+                # Closed by the user
+                with self._lock:
+                    self._prewarmed.discard(key)
+                continue
+            if key not in top or excess > 0:
+                evictions.append((hwnd, paths[key]))
+                excess -= 1
+        return evictions
+
+    def _within_budget(self) -> bool:
+        if len(get_window_monitor().windows()) >= self.max_windows:
+            return False
+        if self.max_memory_mb and psutil is not None:
+            rss = 0
+            for pid in get_process_tracker().pids():
+                try:
+                    rss += psutil.Process(pid).memory_info().rss
+                except Exception:
+                    pass
+            if rss >= self.max_memory_mb * 1024 * 1024:
+                return False
+        return True
+
+    def _needs_work(self) -> bool:
+        if self._evictions():
+            return True
+        index = get_window_index()
+        missing = [path for path in self.top() if index.lookup(path) is None]
+        return bool(missing) and self._within_budget()
+
+    def _run(self) -> None:
+        if self._stop.wait(Config.WORKSPACE_POOL_STARTUP_DELAY):
+            return
+        self.schedule()
+        while not self._stop.wait(Config.WORKSPACE_POOL_CHECK_INTERVAL):
+            self.save()
+            try:
+                if get_automation_queue().idle_seconds() >= Config.WORKSPACE_POOL_IDLE_SECONDS:
+                    self.schedule()
+            except Exception as e:
+                logger.error("Workspace pool check failed: %s", e)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_workspace_pool() -> WorkspacePool:
+    """
+    Get the shared workspace pool, loading the usage history on first use.
+
+    Returns:
+        WorkspacePool: The process-wide pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkspacePool(Config.WORKSPACE_HISTORY_PATH)
+            atexit.register(_pool.save)
+        return _pool
+
+
+def set_workspace_pool(pool: Optional[WorkspacePool]) -> Optional[WorkspacePool]:
+    """
+    Replace the shared workspace pool.
+
+    Args:
+        pool: Pool to install, or None to reset
+
+    Returns:
+        Optional[WorkspacePool]: The previously installed pool
+    """
+    global _pool
+    with _pool_lock:
+        previous, _pool = _pool, pool
+        return previous
@@ -11,23 +11,116 @@
 
 """
 Logging configuration for the Cursor HTTP Server.
+
+Log calls only put the record on a bounded in-memory queue; a background
+listener formats it and writes it to the console and a size-rotated log file.
+Messages are formatted by the listener, so ``logger.info("x: %s", value)``
+costs the caller no string building. Large request payloads should be wrapped
+with ``payload()``, which defers truncating and hashing them to the writer.
 """
+import atexit
+import hashlib
 import logging
+import logging.handlers
+import queue
+import threading
+from typing import Any, Optional
 from app.config import Config
 
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that hands unformatted records over and drops them when the queue is full."""
+    
+    dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process: the listener formats the record itself
+        return record
+        
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _NonBlockingQueueHandler.dropped += 1
+
+
+class Payload:
+    """
+    Lazily truncated view of a potentially large log value.
+    
+    Nothing is computed until the record is formatted by the log writer.
+    Values longer than the limit are cut and tagged with their full length
+    and a short hash, so identical payloads can still be correlated.
+    """
+    
+    __slots__ = ('value', 'limit')
+    
+    def __init__(self, value: Any, limit: int):
+        self.value = value
+        self.limit = limit
+        
+    def __str__(self) -> str:
+        if self.value is None:
+            return 'None'
+        text = self.value if isinstance(self.value, str) else str(self.value)
+        if len(text) <= self.limit:
+            return text
+        digest = hashlib.sha1(text.encode('utf-8', 'replace')).hexdigest()[:12]
+        return f"{text[:self.limit]}... ({len(text)} chars, sha1 {digest})"
+
+
+def payload(value: Any, limit: int = None) -> Payload:
+    """
+    Wrap a request payload field for logging.
+    
+    Args:
+        value: Value to log (e.g. a comment or code snippet)
+        limit: Maximum characters to log (defaults to ``Config.LOG_PAYLOAD_MAX_CHARS``)
+        
+    Returns:
+        Payload: Object rendering the truncated value when formatted
+    """
+    return Payload(value, limit if limit is not None else Config.LOG_PAYLOAD_MAX_CHARS)
+
 
 def setup_logging():
-    """Configure logging for the application."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s [%(levelname)s] %(message)s',
-        handlers=[
-            logging.FileHandler(Config.LOG_FILE_PATH, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
-    )
+    """
+    Configure logging for the application.
+    
+    The first call starts the background writer; later calls (e.g. from
+    further app factories) reuse it.
+    """
+    global _listener
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging to: {Config.LOG_FILE_PATH}")
+    with _listener_lock:
+        if _listener is not None:
+            return logger
+            
+        formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
+        file_handler = logging.handlers.RotatingFileHandler(
+            Config.LOG_FILE_PATH,
+            maxBytes=Config.LOG_MAX_BYTES,
+            backupCount=Config.LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        console_handler = logging.StreamHandler()
+        for handler in (file_handler, console_handler):
+            handler.setFormatter(formatter)
+            
+        records = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+        _listener = logging.handlers.QueueListener(records, file_handler, console_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        
+        root = logging.getLogger()
+        root.setLevel(logging.INFO)
+        root.addHandler(_NonBlockingQueueHandler(records))
+        
+    logger.info("Logging to: %s (rotating at %d bytes, %d backups)",
+                Config.LOG_FILE_PATH, Config.LOG_MAX_BYTES, Config.LOG_BACKUP_COUNT)
     return logger
 
 
@@ -0,0 +1,593 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/benchmarks/run_benchmarks.py
+# Purpose: Latency/throughput benchmarks against the simulated desktop
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Benchmark suite for the Cursor HTTP Server.
+
+Drives `/open` and `/open-file` through the Flask app while a simulated
+desktop stands in for Windows and Cursor, then reports p50/p95/p99 latency
+and throughput per scenario, plus the server's peak and retained memory for a
+large comment relative to its size. Results are compared with a stored
+baseline and the run fails (exit code 1) when a scenario regressed beyond the
+tolerance.
+The stored baseline was recorded with the default options; compare runs
+with the same ``--requests`` and ``--concurrency``.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --requests 50 --concurrency 8
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+import argparse
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app  # noqa: E402
+from app.services.job_queue import get_automation_queue  # noqa: E402
+from app.services.async_runtime import get_automation_loop  # noqa: E402
+from app.services.simulated_desktop import DesktopTimings, SimulatedDesktop  # noqa: E402
+from app.services.workspace_pool import get_workspace_pool  # noqa: E402
+from app.services.file_index import WorkspaceFileIndex  # noqa: E402
+from app.services.snippet_locator import SnippetLocator  # noqa: E402
+from app.services.companion_channel import CompanionChannel, StandInCompanion, set_companion_channel  # noqa: E402
+from app.services.health import HealthMonitor, set_health_monitor  # noqa: E402
+from app.services.window_monitor import get_window_monitor  # noqa: E402
+from app.services.desktop_scheduler import get_desktop_scheduler  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+JOB_TIMEOUT = 60.0
+PARALLEL_WORKSPACES = 4
+DOUBLE_CLICK_PAIRS = 10
+# A single chat-open retry doubles one sample; these scenarios are gated on
+# their median only, which one retry cannot move
+MEDIAN_GATED = {"double_click"}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+class Workspace:
+    """Temporary workspace with files to open."""
+
+    def __init__(self, count: int):
+        self.root = tempfile.mkdtemp(prefix='cursit-bench-')
+        self.files = []
+        for i in range(count):
+            path = os.path.join(self.root, f'module_{i}.py')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(f'# module {i}\n')
+            self.files.append(path)
+
+
+class Runner:
+    """Submits requests through the Flask test client and waits for their jobs."""
+
+    def __init__(self, client):
+        self.client = client
+        self.rejected = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def request(self, endpoint: str, payload: Dict, on_accepted: Callable[[], None] = None) -> Optional[float]:
+        """
+        Submit one request and wait for its job to finish.
+
+        Args:
+            endpoint: Endpoint path
+            payload: JSON payload, or an already encoded body
+            on_accepted: Called once the request was accepted, before waiting
+
+        Returns:
+            Optional[float]: Latency in seconds (None if the job did not succeed)
+        """
+        start = time.perf_counter()
+        while True:
+            if isinstance(payload, bytes):
+                response = self.client.post(endpoint, data=payload, content_type="application/json")
+            else:
+                response = self.client.post(endpoint, json=payload)
+            if response.status_code != 429:
+                break
+            # Queue full: back off briefly instead of the full Retry-After
+            with self._lock:
+                self.rejected += 1
+            time.sleep(0.05)
+
+        if response.status_code != 202:
+            raise RuntimeError(f"{endpoint} answered {response.status_code}: {response.get_data(as_text=True)}")
+
+        job = get_automation_queue().get(response.get_json()['jobId'])
+        if on_accepted:
+            on_accepted()
+        seen = 0
+        deadline = time.monotonic() + JOB_TIMEOUT
+        while not job.finished and time.monotonic() < deadline:
+            seen += len(job.events_since(seen, timeout=1.0))
+        latency = time.perf_counter() - start
+        if job.status != 'succeeded':
+            with self._lock:
+                self.failed += 1
+            print(f"  job {job.id} {job.status}: {job.error} {job.detail or ''}", file=sys.stderr)
+            return None
+        return latency
+
+
+def run_scenario(
+    name: str,
+    make_request: Callable[[int], Optional[float]],
+    count: int,
+    concurrency: int = 1
+) -> Dict[str, float]:
+    """
+    Run ``count`` requests with the given concurrency and summarize them.
+
+    Returns:
+        Dict[str, float]: Latency percentiles (seconds) and throughput (req/s)
+    """
+    latencies: List[float] = []
+    lock = threading.Lock()
+    counter = iter(range(count))
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            latency = make_request(i)
+            if latency is not None:
+                with lock:
+                    latencies.append(latency)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    result = {
+        "requests": count,
+        "succeeded": len(latencies),
+        "p50": round(percentile(latencies, 50), 4),
+        "p95": round(percentile(latencies, 95), 4),
+        "p99": round(percentile(latencies, 99), 4),
+        "throughput": round(len(latencies) / wall, 3) if wall else 0.0,
+    }
+    print(
+        f"{name:<22} n={count:<4} p50={result['p50']:.3f}s p95={result['p95']:.3f}s "
+        f"p99={result['p99']:.3f}s throughput={result['throughput']:.2f}/s"
+    )
+    return result
+
+
+def run_memory_scenario(name: str, runner: Runner, workspace: Workspace, payload_mb: float) -> Dict[str, float]:
+    """
+    Post one large comment and measure the memory the server allocates for it.
+
+    The request body is encoded before tracing starts, so only server-side
+    allocations count: the peak while the request is parsed, and what is
+    still held after it was accepted while the job runs.
+
+    Returns:
+        Dict[str, float]: Payload size and memory as multiples of it
+    """
+    size = int(payload_mb * 1024 * 1024)
+    body = json.dumps({
+        "filePath": workspace.files[0],
+        "workspacePath": workspace.root,
+        "comment": "x" * size,
+        "codeSnippet": "def f():\n    return 1\n"
+    }).encode("utf-8")
+    retained = {}
+
+    def measure_retained():
+        retained["bytes"] = tracemalloc.get_traced_memory()[0] - start_bytes
+
+    tracemalloc.start()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    try:
+        latency = runner.request("/open", body, on_accepted=measure_retained)
+        peak = tracemalloc.get_traced_memory()[1] - start_bytes
+    finally:
+        tracemalloc.stop()
+    if latency is None:
+        raise SystemExit(f"{name} job failed")
+
+    result = {
+        "payload_bytes": size,
+        "peak_ratio": round(peak / size, 2),
+        "retained_ratio": round(retained.get("bytes", 0) / size, 2),
+    }
+    print(
+        f"{name:<22} payload={payload_mb:g}MB peak={result['peak_ratio']:.2f}x "
+        f"retained={result['retained_ratio']:.2f}x"
+    )
+    return result
+
+
+def run_index_scenario(name: str, files: int, lookups: int = 1000, seed: int = 1) -> Dict[str, float]:
+    """
+    Index a synthetic monorepo and time lookups of paths missing from it.
+
+    Fails when the p99 lookup exceeds one millisecond.
+
+    Returns:
+        Dict[str, float]: Build time and lookup percentiles (seconds)
+    """
+    root = tempfile.mkdtemp(prefix='cursit-bench-tree-')
+    per_dir = 20
+    directories = max(1, files // per_dir)
+    try:
+        for d in range(directories):
+            directory = os.path.join(root, f'pkg_{d // 25}', 'src', f'mod_{d % 25}')
+            os.makedirs(directory)
+            for j in range(per_dir):
+                open(os.path.join(directory, 'index.py' if j == 0 else f'file_{j}.py'), 'w').close()
+
+        index = WorkspaceFileIndex(root)
+        start = time.perf_counter()
+        index.refresh()
+        build = time.perf_counter() - start
+
+        rng = random.Random(seed)
+        timings = []
+        for _ in range(lookups):
+            d = rng.randrange(directories)
+            # Moved out of a renamed top-level folder
+            missing = f'legacy/pkg_{d // 25}/src/mod_{d % 25}/index.py'
+            start = time.perf_counter()
+            found = index.resolve(missing)
+            timings.append(time.perf_counter() - start)
+            if found is None:
+                raise SystemExit(f"{name}: {missing} did not resolve")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    result = {
+        "files": directories * per_dir,
+        "build_seconds": round(build, 3),
+        "lookup_p50": round(percentile(timings, 50), 7),
+        "lookup_p99": round(percentile(timings, 99), 7),
+    }
+    print(
+        f"{name:<22} files={result['files']} build={build:.2f}s "
+        f"lookup p50={result['lookup_p50'] * 1e6:.0f}us p99={result['lookup_p99'] * 1e6:.0f}us"
+    )
+    if result["lookup_p99"] > 0.001:
+        raise SystemExit(f"{name}: p99 lookup above 1ms")
+    return result
+
+
+def run_locator_scenario(name: str, size_mb: float, lookups: int = 20) -> Dict[str, float]:
+    """
+    Locate snippets in a large generated file, cold and with a cached line index.
+
+    Returns:
+        Dict[str, float]: Exact and drifted lookup times (seconds)
+    """
+    line_text = "    result_{0} = transform(source[{0}], weight={1}, label='item-{0}')\n"
+    count = max(10, int(size_mb * 1024 * 1024 / len(line_text.format(0, 0))))
+    path = os.path.join(tempfile.mkdtemp(prefix='cursit-bench-generated-'), 'generated.py')
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            for start in range(0, count, 10000):
+                f.write(''.join(line_text.format(i, i % 13) for i in range(start, min(count, start + 10000))))
+
+        target = count * 9 // 10
+        exact = line_text.format(target, target % 13) + line_text.format(target + 1, (target + 1) % 13)
+        # Re-indented, respaced and with its last line edited since
+        drifted = (
+            "result_{0} =   transform(source[{0}],  weight={1}, label='item-{0}')\n".format(target, target % 13)
+            + line_text.format(target + 1, (target + 1) % 13)
+            + "result_{0} = transform(source[{0}], weight=99)\n".format(target + 2)
+        )
+        locator = SnippetLocator()
+        timings = {}
+        expected = target + 2
+        for label, snippet in (("cold", exact), ("exact", exact), ("drifted", drifted)):
+            samples = []
+            for _ in range(1 if label == "cold" else lookups):
+                start = time.perf_counter()
+                match = locator.locate(path, snippet)
+                samples.append(time.perf_counter() - start)
+                if match is None or match.line != expected:
+                    raise SystemExit(f"{name}: {label} snippet located at {match and match.line}, expected {expected}")
+            timings[label] = percentile(samples, 50)
+    finally:
+        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+
+    result = {f"{label}_seconds": round(seconds, 4) for label, seconds in timings.items()}
+    print(
+        f"{name:<22} file={size_mb:g}MB cold={timings['cold'] * 1000:.1f}ms "
+        f"exact={timings['exact'] * 1000:.1f}ms drifted={timings['drifted'] * 1000:.1f}ms"
+    )
+    return result
+
+
+def run_health_scenario(name: str, client, calls: int = 1000) -> Dict[str, float]:
+    """
+    Time GET /health answered from a refreshed health monitor.
+
+    Fails when the reported window count is not the monitor's, or when the
+    p99 answer exceeds one millisecond.
+
+    Returns:
+        Dict[str, float]: Request and snapshot percentiles (seconds)
+    """
+    monitor = HealthMonitor()
+    monitor.refresh()
+    previous = set_health_monitor(monitor)
+    try:
+        snapshots, requests = [], []
+        for _ in range(calls):
+            start = time.perf_counter()
+            monitor.snapshot()
+            snapshots.append(time.perf_counter() - start)
+        for _ in range(calls):
+            start = time.perf_counter()
+            response = client.get("/health")
+            requests.append(time.perf_counter() - start)
+        health = response.get_json()
+    finally:
+        set_health_monitor(previous)
+
+    windows = len(get_window_monitor().windows())
+    if response.status_code != 200 or health["cursor"]["windows"] != windows:
+        raise SystemExit(f"{name}: reported {health.get('cursor')}, expected {windows} window(s)")
+    result = {
+        "snapshot_p50": round(percentile(snapshots, 50), 7),
+        "request_p50": round(percentile(requests, 50), 7),
+        "request_p99": round(percentile(requests, 99), 7),
+    }
+    print(
+        f"{name:<22} snapshot p50={result['snapshot_p50'] * 1e6:.0f}us "
+        f"request p50={result['request_p50'] * 1e6:.0f}us p99={result['request_p99'] * 1e6:.0f}us"
+    )
+    if result["request_p99"] > 0.001:
+        raise SystemExit(f"{name}: p99 answer above 1ms")
+    return result
+
+
+def check_pasted_windows(name: str, desktop: SimulatedDesktop, since: int, expected: Dict[str, str]) -> None:
+    """
+    Fail unless every message was pasted exactly once, into its workspace's window.
+
+    Args:
+        name: Scenario name, for the error
+        desktop: Simulated desktop the scenario ran against
+        since: Number of pastes before the scenario
+        expected: Comment -> folder name of the window it belongs in
+    """
+    cursor = desktop.cursor
+    landed: Dict[str, List[int]] = {}
+    for text, hwnd in zip(cursor.pasted[since:], cursor.pasted_into[since:]):
+        for comment in expected:
+            if comment in text:
+                landed.setdefault(comment, []).append(hwnd)
+    problems = []
+    for comment, folder in expected.items():
+        hwnds = landed.get(comment, [])
+        if len(hwnds) != 1:
+            problems.append(f"'{comment}' pasted {len(hwnds)} times")
+        elif hwnds[0] != cursor.folders.get(folder):
+            problems.append(f"'{comment}' pasted into the wrong window")
+    if problems:
+        raise SystemExit(f"{name}: " + "; ".join(problems[:5]))
+
+
+def run_suite(
+    requests: int,
+    concurrency: int,
+    seed: int,
+    payload_mb: float,
+    index_files: int,
+    locate_mb: float
+) -> Dict[str, Dict[str, float]]:
+    """
+    Run every scenario against a fresh simulated desktop.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Scenario name -> summary
+    """
+    results = {}
+    workspace = Workspace(max(requests, 1))
+    with SimulatedDesktop(DesktopTimings(), seed=seed) as desktop:
+        runner = Runner(create_app().test_client())
+
+        def open_file(i):
+            return runner.request("/open-file", {
+                "filePath": workspace.files[i % len(workspace.files)],
+                "workspacePath": workspace.root
+            })
+
+        # Unique comments: identical requests would be de-duplicated across scenarios
+        comment_ids = itertools.count()
+
+        def open_and_paste(i):
+            return runner.request("/open", {
+                "filePath": workspace.files[i % len(workspace.files)],
+                "workspacePath": workspace.root,
+                "comment": f"Review comment {next(comment_ids)}",
+                "codeSnippet": "def f():\n    return 1\n"
+            })
+
+        results["cold_open"] = run_scenario("cold_open", open_and_paste, 1)
+        results["open_file_sequential"] = run_scenario("open_file_sequential", open_file, requests)
+        results["open_sequential"] = run_scenario("open_sequential", open_and_paste, requests)
+        results["open_concurrent"] = run_scenario("open_concurrent", open_and_paste, requests, concurrency)
+        results["health"] = run_health_scenario("health", runner.client)
+
+        # Requests spread over several workspaces: their launches and waits
+        # overlap while pastes take turns; each message must land once, in
+        # its own workspace's window
+        workspaces = [Workspace(max(requests // PARALLEL_WORKSPACES, 1)) for _ in range(PARALLEL_WORKSPACES)]
+        expected_windows = {}
+
+        def open_in_workspace(i):
+            target = workspaces[i % len(workspaces)]
+            comment = f"Parallel comment {next(comment_ids)}."
+            expected_windows[comment] = os.path.basename(target.root)
+            return runner.request("/open", {
+                "filePath": target.files[(i // len(workspaces)) % len(target.files)],
+                "workspacePath": target.root,
+                "comment": comment
+            })
+
+        pasted_before = len(desktop.cursor.pasted)
+        results["open_multi_workspace"] = run_scenario("open_multi_workspace", open_in_workspace, requests, concurrency)
+        check_pasted_windows("open_multi_workspace", desktop, pasted_before, expected_windows)
+
+        # An editor companion takes the messages: no clipboard, focus or keystrokes
+        channel = CompanionChannel(port=0, info_path="")
+        channel.start()
+        previous_channel = set_companion_channel(channel)
+        companion = StandInCompanion(channel.address, channel.token, [workspace.root])
+        pasted_before = len(desktop.cursor.pasted)
+        try:
+            results["companion_open"] = run_scenario("companion_open", open_and_paste, requests)
+        finally:
+            companion.close()
+            set_companion_channel(previous_channel)
+            channel.stop()
+        if len(companion.inserted) != requests or len(desktop.cursor.pasted) != pasted_before:
+            raise SystemExit(
+                f"companion_open: companion received {len(companion.inserted)} of {requests} messages, "
+                f"{len(desktop.cursor.pasted) - pasted_before} pasted by keystrokes"
+            )
+
+        results["large_payload"] = run_memory_scenario("large_payload", runner, workspace, payload_mb)
+
+        # Pairs of identical concurrent requests (a double-clicked button) must paste once each
+        pasted_before = len(desktop.cursor.pasted)
+        results["double_click"] = run_scenario("double_click", lambda i: runner.request("/open", {
+            "filePath": workspace.files[0],
+            "workspacePath": workspace.root,
+            "comment": f"Double-clicked comment {i // 2}"
+        }), 2 * DOUBLE_CLICK_PAIRS, 2)
+        double_pastes = len(desktop.cursor.pasted) - pasted_before
+        if double_pastes != DOUBLE_CLICK_PAIRS:
+            raise SystemExit(f"double_click pasted {double_pastes} times, expected {DOUBLE_CLICK_PAIRS}")
+
+        # A PR path from a renamed folder opens the same file found by the index
+        results["moved_path"] = run_scenario("moved_path", lambda i: runner.request("/open-file", {
+            "filePath": os.path.join(workspace.root, "renamed", os.path.basename(workspace.files[1])),
+            "workspacePath": workspace.root
+        }), 1)
+        results["file_index"] = run_index_scenario("file_index", index_files, seed=seed)
+        results["snippet_locate"] = run_locator_scenario("snippet_locate", locate_mb)
+
+        # Restart after use: the pool re-opens the workspace before the next request
+        desktop.cursor.quit()
+        prewarm = get_automation_loop().run(get_workspace_pool().prewarm())
+        if not prewarm["opened"]:
+            raise SystemExit("prewarm did not open the workspace window")
+        results["prewarmed_open"] = run_scenario("prewarmed_open", open_and_paste, 1)
+
+        print(f"rejected (429) submissions: {runner.rejected}, failed jobs: {runner.failed}")
+        print(f"messages pasted by the simulated Cursor: {len(desktop.cursor.pasted)}")
+        leases = get_desktop_scheduler().snapshot()
+        print(f"desktop leases: {leases['leases']} ({leases['heldSeconds']:.2f}s held)")
+        print(f"keystroke batches sent: {len(desktop.keyboard.batches)} ({desktop.keyboard.waited:.2f}s of pauses)")
+        if runner.failed:
+            raise SystemExit("Benchmark jobs failed")
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """
+    Compare results with the baseline.
+
+    Returns:
+        List[str]: Regression descriptions (empty if none)
+    """
+    regressions = []
+    for scenario, expected in baseline.items():
+        actual = results.get(scenario)
+        if actual is None:
+            continue
+        keys = ("p50",) if scenario in MEDIAN_GATED else ("p50", "p95", "p99", "peak_ratio", "retained_ratio")
+        for key in keys:
+            if expected.get(key) and actual.get(key, 0) > expected[key] * (1 + tolerance):
+                regressions.append(f"{scenario}.{key}: {actual[key]:.3f} > baseline {expected[key]:.3f}")
+        if scenario in MEDIAN_GATED:
+            continue
+        if expected.get("throughput") and actual.get("throughput", 0) < expected["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{scenario}.throughput: {actual['throughput']:.2f}/s < baseline {expected['throughput']:.2f}/s"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10, help="Requests per scenario (default: 10)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Client threads in concurrent scenarios (default: 4)")
+    parser.add_argument("--payload-mb", type=float, default=4.0, help="Comment size in the large_payload scenario (default: 4)")
+    parser.add_argument("--index-files", type=int, default=20000, help="Files in the file_index scenario (default: 20000)")
+    parser.add_argument("--locate-mb", type=float, default=50.0, help="File size in the snippet_locate scenario (default: 50)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the simulated delays' jitter")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression as a fraction (default: 0.25)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--verbose", action="store_true", help="Show server logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    results = run_suite(args.requests, args.concurrency, args.seed, args.payload_mb, args.index_files, args.locate_mb)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("REGRESSIONS:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 # ============================================================================
 # Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
 # File: server/run.py
-# Purpose: Server entry point - starts the Flask application
+# Purpose: Server entry point - starts the Flask or ASGI application
 #
 # Copyright (c) 2025 Volodymyr Yepishev
 #              All rights reserved.
@@ -13,12 +13,18 @@
 Entry point for the Cursor HTTP Server.
 
 Usage:
-    python run.py
+    python run.py                      # threaded Flask server
+    SERVER_MODE=asyncio python run.py  # ASGI app on uvicorn
 """
+import importlib.util
 import os
 from app import create_app
 from app.config import Config
 from app.utils.logger import get_logger
+from app.services.workspace_pool import get_workspace_pool
+from app.services.repo_index import get_repo_index
+from app.services.companion_channel import get_companion_channel
+from app.services.health import get_health_monitor
 
 # Create the Flask application
 app = create_app()
@@ -27,13 +33,37 @@ logger = get_logger(__name__)
 
 if __name__ == "__main__":
     logger.info("=" * 60)
-    logger.info(f"Cursor HTTP server starting at http://{Config.HOST}:{Config.PORT}/open")
+    logger.info("Cursor HTTP server starting at http://%s:%s/open", Config.HOST, Config.PORT)
     logger.info("=" * 60)
     
-    app.run(
-        host=Config.HOST,
-        port=Config.PORT,
-        threaded=True,
-        debug=os.environ.get('FLASK_ENV') == 'development'
-    )
+    if Config.WORKSPACE_POOL_ENABLED:
+        get_workspace_pool().start()
+    get_repo_index().start()
+    if Config.COMPANION_ENABLED:
+        get_companion_channel().start()
+    get_health_monitor()
+    
+    if Config.SERVER_MODE == 'asyncio':
+        try:
+            import uvicorn
+        except ImportError:
+            raise SystemExit('SERVER_MODE=asyncio requires uvicorn (pip install -e ".[asyncio]")')
+        from app.asgi import application
+        
+        # Without a WebSocket implementation uvicorn rejects /ws upgrades and
+        # the extension silently falls back to HTTP
+        if importlib.util.find_spec('websockets') is None and importlib.util.find_spec('wsproto') is None:
+            logger.warning(
+                "No WebSocket implementation installed, /ws is unavailable "
+                "(pip install -e \".[asyncio]\" installs websockets)"
+            )
+        logger.info("Serving in asyncio mode (ASGI)")
+        uvicorn.run(application, host=Config.HOST, port=Config.PORT, log_config=None)
+    else:
+        app.run(
+            host=Config.HOST,
+            port=Config.PORT,
+            threaded=True,
+            debug=os.environ.get('FLASK_ENV') == 'development'
+        )
 
@@ -29,7 +29,13 @@ setup(
         'pyperclip>=1.8.0',
         'pywin32>=300',
         'python-dotenv>=0.19.0',
+        'psutil>=5.8.0',
     ],
+    extras_require={
+        # SERVER_MODE=asyncio: the ASGI application served by uvicorn, with a
+        # WebSocket implementation (websockets) for the extension's /ws channel
+        'asyncio': ['uvicorn[standard]>=0.20.0'],
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',
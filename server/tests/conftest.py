@@ -0,0 +1,22 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/conftest.py
+# Purpose: Shared pytest setup for the server tests
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""
+Pytest configuration: makes the ``app`` package importable when the tests
+are run from any directory.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
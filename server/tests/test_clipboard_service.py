@@ -0,0 +1,106 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_clipboard_service.py
+# Purpose: Tests for clipboard copy, verification and restore
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.clipboard_service`` against the fake backend."""
+import time
+import pytest
+from app.services import clipboard_service
+from app.services.clipboard_service import ClipboardService, FakeClipboardBackend, set_clipboard_backend
+
+
+@pytest.fixture
+def clipboard():
+    backend = FakeClipboardBackend("user's text")
+    previous = set_clipboard_backend(backend)
+    yield backend
+    set_clipboard_backend(previous)
+
+
+def test_copy_puts_the_message_on_the_clipboard(clipboard):
+    assert ClipboardService.copy("message") == (True, "")
+    assert ClipboardService.read() == "message"
+
+
+def test_verify_does_not_read_while_the_sequence_is_unchanged(clipboard):
+    ClipboardService.copy("message")
+    reads = clipboard.reads
+    assert ClipboardService.verify("message") is True
+    assert ClipboardService.verify("message") is True
+    assert clipboard.reads == reads
+
+
+def test_verify_reads_back_after_a_change(clipboard):
+    ClipboardService.copy("message")
+    clipboard.copy("something the user copied")
+    reads = clipboard.reads
+    assert ClipboardService.verify("message") is False
+    assert clipboard.reads == reads + 1
+
+
+def test_verify_reads_back_a_message_we_did_not_copy(clipboard):
+    clipboard.copy("copied elsewhere")
+    assert ClipboardService.verify("copied elsewhere") is True
+    assert clipboard.reads == 1
+
+
+def test_verify_without_a_backend_is_unknown(monkeypatch):
+    monkeypatch.setattr(clipboard_service, '_create_backend', lambda: None)
+    previous = set_clipboard_backend(None)
+    try:
+        assert ClipboardService.verify("message") is None
+    finally:
+        set_clipboard_backend(previous)
+
+
+def test_restore_puts_the_user_contents_back(clipboard):
+    ClipboardService.copy("message", save_previous=True)
+    ClipboardService.restore()
+    assert ClipboardService.read() == "user's text"
+
+
+def test_restore_without_saving_leaves_the_message(clipboard):
+    ClipboardService.copy("message")
+    ClipboardService.restore()
+    assert ClipboardService.read() == "message"
+
+
+def test_restore_is_skipped_after_a_user_copy(clipboard):
+    ClipboardService.copy("message", save_previous=True)
+    clipboard.copy("copied by the user meanwhile")
+    ClipboardService.restore()
+    assert ClipboardService.read() == "copied by the user meanwhile"
+
+
+def test_second_copy_keeps_the_user_contents(clipboard):
+    ClipboardService.copy("first", save_previous=True)
+    ClipboardService.copy("second", save_previous=True)
+    ClipboardService.restore()
+    assert ClipboardService.read() == "user's text"
+
+
+def test_pending_restore_gives_way_to_a_newer_copy(clipboard):
+    ClipboardService.copy("first", save_previous=True)
+    ClipboardService.restore(delay=0.1)
+    ClipboardService.copy("second", save_previous=True)
+    time.sleep(0.3)
+    # The stale restore did not overwrite the new message...
+    assert ClipboardService.read() == "second"
+    # ...and the user's contents are still saved for the newer copy's restore
+    ClipboardService.restore()
+    assert ClipboardService.read() == "user's text"
+
+
+def test_delayed_restore_runs_after_the_delay(clipboard):
+    ClipboardService.copy("message", save_previous=True)
+    ClipboardService.restore(delay=0.05)
+    assert ClipboardService.read() == "message"
+    time.sleep(0.3)
+    assert ClipboardService.read() == "user's text"
@@ -0,0 +1,216 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_companion_channel.py
+# Purpose: Protocol tests for the editor companion channel
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.companion_channel`` over a loopback channel."""
+import json
+import os
+import socket
+import time
+import pytest
+from app.config import Config
+from app.services.async_runtime import get_automation_loop
+from app.services.companion_channel import PROTOCOL_VERSION, CompanionChannel, StandInCompanion
+from app.services.message_store import StoredMessage
+
+
+@pytest.fixture
+def channel(tmp_path):
+    channel = CompanionChannel(port=0, info_path=str(tmp_path / 'companion.json'))
+    assert channel.start()
+    yield channel
+    channel.stop()
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / 'repo'
+    root.mkdir()
+    return str(root)
+
+
+def stored_message(tmp_path, message):
+    path = tmp_path / 'message.txt'
+    path.write_text(message, encoding='utf-8')
+    return StoredMessage('abc123', str(path), len(message.encode('utf-8')))
+
+
+def deliver(channel, workspace, tmp_path, message, auto_submit=False):
+    file_path = os.path.join(workspace, 'a.py')
+    return get_automation_loop().run(
+        channel.deliver(workspace, file_path, 12, message, stored_message(tmp_path, message), auto_submit)
+    )
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class RawCompanion:
+    """A companion speaking the protocol by hand."""
+
+    def __init__(self, address):
+        self.sock = socket.create_connection(address, timeout=2.0)
+        self.file = self.sock.makefile('rwb')
+
+    def send(self, frame):
+        self.file.write(json.dumps(frame).encode('utf-8') + b'\n')
+        self.file.flush()
+
+    def receive(self):
+        line = self.file.readline()
+        return json.loads(line) if line else None
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.file.close()
+        self.sock.close()
+
+
+def test_publishes_port_and_token(channel, tmp_path):
+    with open(tmp_path / 'companion.json', encoding='utf-8') as f:
+        info = json.load(f)
+    assert (info["host"], info["port"]) == tuple(channel.address)
+    assert info["token"] == channel.token
+    assert info["version"] == PROTOCOL_VERSION
+
+
+def test_info_file_is_removed_on_stop(tmp_path):
+    channel = CompanionChannel(port=0, info_path=str(tmp_path / 'companion.json'))
+    channel.start()
+    channel.stop()
+    assert not (tmp_path / 'companion.json').exists()
+
+
+def test_handshake_subscribes_the_companion(channel, workspace):
+    companion = StandInCompanion(channel.address, channel.token, [workspace], name='editor')
+    try:
+        assert wait_until(lambda: channel.subscribers())
+        assert channel.subscribers()[0]["name"] == 'editor'
+        assert channel.subscriber_for(workspace, os.path.join(workspace, 'a.py')) is not None
+        assert channel.subscriber_for(None, os.path.join(os.path.dirname(workspace), 'other.py')) is None
+    finally:
+        companion.close()
+    assert wait_until(lambda: not channel.subscribers())
+
+
+@pytest.mark.parametrize('make_hello', [
+    lambda token: {"type": "hello", "token": "not-the-token"},
+    lambda token: {"type": "hello"},
+    lambda token: {"type": "insert", "token": token},
+], ids=['wrong token', 'no token', 'not a hello'])
+def test_bad_hello_is_rejected(channel, make_hello):
+    companion = RawCompanion(channel.address)
+    try:
+        companion.send(make_hello(channel.token))
+        assert companion.receive() is None  # Closed without a welcome
+    finally:
+        companion.close()
+    assert channel.subscribers() == []
+
+
+def test_message_is_delivered_inline(channel, workspace, tmp_path):
+    companion = StandInCompanion(channel.address, channel.token, [workspace])
+    try:
+        assert deliver(channel, workspace, tmp_path, "Review comment", auto_submit=True) == (True, "")
+        frame = companion.frames[0]
+        assert frame["type"] == "insert"
+        assert frame["text"] == "Review comment"
+        assert frame["line"] == 12 and frame["autoSubmit"] is True
+        assert "path" not in frame
+        assert companion.inserted == ["Review comment"]
+    finally:
+        companion.close()
+
+
+def test_large_message_is_handed_over_as_its_file(channel, workspace, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'COMPANION_INLINE_MAX_BYTES', 16)
+    message = "x" * 1000
+    companion = StandInCompanion(channel.address, channel.token, [workspace])
+    try:
+        assert deliver(channel, workspace, tmp_path, message) == (True, "")
+        frame = companion.frames[0]
+        assert "text" not in frame
+        assert frame["messageId"] == 'abc123'
+        assert frame["size"] == 1000
+        assert companion.inserted == [message]
+    finally:
+        companion.close()
+
+
+def test_missing_ack_times_out(channel, workspace, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'COMPANION_ACK_TIMEOUT', 0.2)
+    companion = RawCompanion(channel.address)
+    try:
+        companion.send({"type": "hello", "token": channel.token, "name": "silent", "workspaces": [workspace]})
+        assert companion.receive()["type"] == "welcome"
+        start = time.monotonic()
+        ok, error = deliver(channel, workspace, tmp_path, "Review comment")
+        assert not ok and "did not acknowledge" in error
+        assert time.monotonic() - start < 1.0
+    finally:
+        companion.close()
+
+
+def test_failed_ack_is_reported(channel, workspace, tmp_path):
+    companion = RawCompanion(channel.address)
+    try:
+        companion.send({"type": "hello", "token": channel.token, "name": "busy", "workspaces": [workspace]})
+        assert companion.receive()["type"] == "welcome"
+        loop = get_automation_loop()
+        future = loop.submit(channel.deliver(
+            workspace, os.path.join(workspace, 'a.py'), None, "Review comment",
+            stored_message(tmp_path, "Review comment"), False
+        ))
+        insert = companion.receive()
+        companion.send({"type": "ack", "id": insert["id"], "ok": False, "error": "chat is busy"})
+        assert future.result(timeout=2.0) == (False, "chat is busy")
+    finally:
+        companion.close()
+
+
+def test_disconnect_fails_pending_delivery(channel, workspace, tmp_path):
+    companion = RawCompanion(channel.address)
+    companion.send({"type": "hello", "token": channel.token, "name": "flaky", "workspaces": [workspace]})
+    assert companion.receive()["type"] == "welcome"
+    future = get_automation_loop().submit(channel.deliver(
+        workspace, os.path.join(workspace, 'a.py'), None, "Review comment",
+        stored_message(tmp_path, "Review comment"), False
+    ))
+    assert companion.receive()["type"] == "insert"
+    companion.close()
+    ok, error = future.result(timeout=2.0)
+    assert not ok and "disconnected" in error
+
+
+def test_delivery_without_a_companion(channel, workspace, tmp_path):
+    assert deliver(channel, workspace, tmp_path, "Review comment") == (False, "No companion connected")
+
+
+def test_port_in_use_leaves_the_channel_off(tmp_path):
+    taken = socket.socket()
+    taken.bind(('127.0.0.1', 0))
+    taken.listen()
+    try:
+        channel = CompanionChannel(port=taken.getsockname()[1], info_path=str(tmp_path / 'companion.json'))
+        assert channel.start() is False
+        assert channel.address is None
+        assert not (tmp_path / 'companion.json').exists()
+        channel.stop()
+    finally:
+        taken.close()
@@ -0,0 +1,131 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_desktop_scheduler.py
+# Purpose: Tests for the window and desktop leases shared by jobs
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.desktop_scheduler``."""
+import asyncio
+import os
+import pytest
+from app.services.desktop_scheduler import DesktopScheduler
+
+
+@pytest.fixture
+def scheduler():
+    return DesktopScheduler()
+
+
+async def _hold(lease, log, name, seconds=0.02):
+    async with lease:
+        log.append(("enter", name))
+        await asyncio.sleep(seconds)
+        log.append(("exit", name))
+
+
+def _overlapped(log):
+    """True if some lease was entered while another was held."""
+    held = 0
+    for event, _ in log:
+        held += 1 if event == "enter" else -1
+        if held > 1:
+            return True
+    return False
+
+
+def test_desktop_lease_is_exclusive(scheduler):
+    log = []
+
+    async def main():
+        await asyncio.gather(*(_hold(scheduler.desktop(f"job {i}"), log, i) for i in range(3)))
+
+    asyncio.run(main())
+    assert not _overlapped(log)
+    assert scheduler.snapshot()["leases"] == 3
+
+
+def test_same_workspace_takes_turns(scheduler, tmp_path):
+    log = []
+    workspace = str(tmp_path / "repo")
+    same = os.path.join(str(tmp_path), "other", "..", "repo")
+
+    async def main():
+        await asyncio.gather(_hold(scheduler.window(workspace), log, 1), _hold(scheduler.window(same), log, 2))
+
+    asyncio.run(main())
+    assert not _overlapped(log)
+
+
+def test_different_workspaces_overlap(scheduler, tmp_path):
+    log = []
+
+    async def main():
+        await asyncio.gather(*(_hold(scheduler.window(str(tmp_path / name)), log, name) for name in ("a", "b")))
+
+    asyncio.run(main())
+    assert _overlapped(log)
+
+
+def test_window_lease_then_desktop_lease_overlaps_only_background_stages(scheduler, tmp_path):
+    log = []
+
+    async def job(name):
+        async with scheduler.window(str(tmp_path / name)):
+            # Background stage (launch, wait for the window) overlaps other jobs
+            await _hold(_Nothing(), log, f"{name} launch")
+            await _hold(scheduler.desktop(name), log, f"{name} paste")
+
+    async def main():
+        await asyncio.gather(job("a"), job("b"))
+
+    asyncio.run(main())
+    pastes = [entry for entry in log if entry[1].endswith("paste")]
+    launches = [entry for entry in log if entry[1].endswith("launch")]
+    assert not _overlapped(pastes)
+    assert _overlapped(launches)
+
+
+def test_snapshot_names_the_holder(scheduler, tmp_path):
+    seen = {}
+
+    async def main():
+        async with scheduler.window(str(tmp_path)):
+            async with scheduler.desktop("open job 1"):
+                seen.update(scheduler.snapshot())
+
+    asyncio.run(main())
+    assert (seen["desktopHeldBy"], seen["windowsLeased"]) == ("open job 1", 1)
+    after = scheduler.snapshot()
+    assert (after["desktopHeldBy"], after["windowsLeased"], after["leases"]) == (None, 0, 1)
+
+
+def test_leases_are_released_when_a_stage_fails(scheduler, tmp_path):
+    async def failing():
+        async with scheduler.window(str(tmp_path)):
+            async with scheduler.desktop("failing"):
+                raise RuntimeError("paste failed")
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await failing()
+        # Both leases are free again
+        await asyncio.wait_for(_hold(scheduler.window(str(tmp_path)), [], "next"), 1)
+        await asyncio.wait_for(_hold(scheduler.desktop("next"), [], "next"), 1)
+
+    asyncio.run(main())
+    assert scheduler.snapshot()["windowsLeased"] == 0
+
+
+class _Nothing:
+    """Stand-in for a stage that needs no lease."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
@@ -0,0 +1,106 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_file_index.py
+# Purpose: Tests for resolving missing PR paths through the file index
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.file_index``."""
+import os
+import pytest
+from app.config import Config
+from app.services.file_index import FileIndexes, WorkspaceFileIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    files = (
+        'index.ts', 'pkg/b/src/index.ts', 'pkg/d/src/index.ts', 'pkg/b/lib/index.ts',
+        'pkg/c/lib/util.ts', 'docs/guide.md',
+    )
+    for rel in files:
+        path = tmp_path.joinpath(*rel.split('/'))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    index = WorkspaceFileIndex(str(tmp_path))
+    index.refresh()
+    return index
+
+
+def rel(index, path):
+    return os.path.relpath(path, index.root).replace(os.sep, '/') if path else None
+
+
+def test_longest_shared_suffix_wins(index):
+    assert rel(index, index.resolve('legacy/pkg/b/src/index.ts')) == 'pkg/b/src/index.ts'
+
+
+def test_tie_on_parent_and_name_is_not_guessed(index):
+    # pkg/b and pkg/d both have src/index.ts; the PR's pkg/a is not either
+    assert index.resolve('pkg/a/src/index.ts') is None
+
+
+def test_tie_across_several_packages_is_not_guessed(tmp_path):
+    for package in ('bar', 'foo', 'qux'):
+        path = tmp_path / 'packages' / package / 'src' / 'index.ts'
+        path.parent.mkdir(parents=True)
+        path.touch()
+    index = WorkspaceFileIndex(str(tmp_path))
+    index.refresh()
+    assert index.resolve('packages/newpkg/src/index.ts') is None
+    assert rel(index, index.resolve('old/packages/foo/src/index.ts')) == 'packages/foo/src/index.ts'
+
+
+def test_single_longest_suffix_wins_over_shorter_ones(index):
+    # Both lib/index.ts and src/index.ts share "index.ts"; only one shares "b/lib/index.ts"
+    assert rel(index, index.resolve('moved/b/lib/index.ts')) == 'pkg/b/lib/index.ts'
+
+
+def test_unique_parent_and_name(index):
+    assert rel(index, index.resolve('packages/c/lib/util.ts')) == 'pkg/c/lib/util.ts'
+
+
+def test_only_file_with_the_name_is_used(index):
+    assert rel(index, index.resolve('packages/old/util.ts')) == 'pkg/c/lib/util.ts'
+    assert rel(index, index.resolve('guide.md')) == 'docs/guide.md'
+
+
+def test_common_name_without_a_shared_parent_is_not_guessed(index):
+    # Three index.ts files, none of them under a "feature" folder
+    assert index.resolve('pkg/a/feature/index.ts') is None
+    assert index.resolve('index.tsx') is None
+
+
+def test_matching_is_case_insensitive(index):
+    assert rel(index, index.resolve('Pkg/B/SRC/Index.ts')) == 'pkg/b/src/index.ts'
+
+
+@pytest.fixture
+def indexes(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'FILE_INDEX_MIN_REFRESH', 0.0)
+    (tmp_path / 'a.py').touch()
+    indexes = FileIndexes()
+    index = indexes.get(str(tmp_path))
+    assert index.wait_ready(2.0)
+    # Let the first build finish entirely, so a miss starts a new refresh
+    # rather than joining one that listed the tree before the test changed it
+    assert index.refresh_in_background().wait(2.0)
+    return indexes
+
+
+def test_miss_finds_files_created_since_the_build(indexes, tmp_path):
+    (tmp_path / 'new').mkdir()
+    (tmp_path / 'new' / 'b.py').touch()
+    assert indexes.resolve(str(tmp_path), str(tmp_path / 'old' / 'b.py')) == str(tmp_path / 'new' / 'b.py')
+
+
+def test_miss_does_not_refresh_on_the_request_thread(indexes, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'FILE_INDEX_MISS_WAIT', 0.0)
+    index = indexes.get(str(tmp_path))
+    monkeypatch.setattr(index, 'refresh', lambda: pytest.fail("refreshed inline"), raising=False)
+    monkeypatch.setattr(index, '_refresh_logged', lambda done: done.set())
+    assert indexes.resolve(str(tmp_path), str(tmp_path / 'missing.py')) is None
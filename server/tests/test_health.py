@@ -0,0 +1,136 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_health.py
+# Purpose: Tests for the cached health and readiness state
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.health``."""
+from types import SimpleNamespace
+import pytest
+import app as app_package
+from app.services import clipboard_service, health
+from app.services.clipboard_service import FakeClipboardBackend, set_clipboard_backend
+from app.services.cursor_launcher import CursorLauncher
+from app.services.health import HealthMonitor, set_health_monitor
+from app.services.job_queue import AutomationQueue
+from app.services.simulated_desktop import DesktopTimings, SimulatedDesktop
+
+
+@pytest.fixture
+def cursor_exe(tmp_path, monkeypatch):
+    """A resolvable Cursor executable, cached like the launcher's; records calls."""
+    exe = tmp_path / "Cursor.exe"
+    exe.write_text("")
+    calls, cached = [], []
+
+    def resolve():
+        calls.append('resolve')
+        if not cached:
+            cached.append([str(exe)] if exe.exists() else None)
+        return cached[0]
+
+    def invalidate():
+        calls.append('invalidate')
+        cached.clear()
+
+    monkeypatch.setattr(CursorLauncher, 'resolve', staticmethod(resolve))
+    monkeypatch.setattr(CursorLauncher, 'invalidate', staticmethod(invalidate))
+    return exe, calls
+
+
+@pytest.fixture
+def companions(monkeypatch):
+    connected = []
+    queue = AutomationQueue(max_size=4, concurrency=1)
+    monkeypatch.setattr(health, 'get_companion_channel', lambda: SimpleNamespace(subscribers=lambda: connected))
+    monkeypatch.setattr(health, 'get_automation_queue', lambda: queue)
+    return connected
+
+
+@pytest.fixture
+def desktop():
+    with SimulatedDesktop(DesktopTimings(), seed=1) as desktop:
+        yield desktop
+
+
+def test_not_ready_until_the_first_check(companions):
+    snapshot = HealthMonitor().snapshot()
+    assert (snapshot["status"], snapshot["ready"]) == ("starting", False)
+    assert snapshot["queue"] == {"depth": 0}
+
+
+def test_ready_when_every_dependency_is_available(desktop, cursor_exe, companions):
+    monitor = HealthMonitor()
+    monitor.refresh()
+    snapshot = monitor.snapshot()
+    assert (snapshot["status"], snapshot["ready"], snapshot["problems"]) == ("ok", True, [])
+    assert snapshot["checks"]["cursorExecutable"] == {"ok": True, "path": str(cursor_exe[0])}
+    assert snapshot["checks"]["clipboard"] == {"ok": True, "backend": "FakeClipboardBackend"}
+    assert snapshot["cursor"] == {"running": False, "windows": 0}
+
+
+def test_snapshot_runs_no_checks(desktop, cursor_exe, companions):
+    _, calls = cursor_exe
+    monitor = HealthMonitor()
+    monitor.refresh()
+    resolved = len(calls)
+    for _ in range(100):
+        monitor.snapshot()
+    assert len(calls) == resolved
+
+
+def test_missing_pywin32_is_reported(cursor_exe, companions, monkeypatch):
+    monkeypatch.setattr(health.window_service, 'win32gui', None)
+    previous = set_clipboard_backend(FakeClipboardBackend())
+    try:
+        monitor = HealthMonitor()
+        monitor.refresh()
+        snapshot = monitor.snapshot()
+    finally:
+        set_clipboard_backend(previous)
+    assert (snapshot["status"], snapshot["ready"]) == ("degraded", False)
+    assert snapshot["problems"] == ["pywin32 is not installed (pip install pywin32)"]
+    assert snapshot["cursor"] == {"running": False, "windows": None}
+
+
+def test_removed_executable_is_resolved_again(desktop, cursor_exe, companions):
+    exe, calls = cursor_exe
+    monitor = HealthMonitor()
+    monitor.refresh()
+    exe.unlink()
+    checks = monitor.refresh()
+    assert 'invalidate' in calls
+    assert checks["cursorExecutable"] == {"ok": False, "path": None}
+    assert monitor.snapshot()["ready"] is False
+
+
+def test_companion_makes_up_for_a_missing_clipboard(desktop, cursor_exe, companions, monkeypatch):
+    monkeypatch.setattr(clipboard_service, '_create_backend', lambda: None)
+    previous = set_clipboard_backend(None)
+    try:
+        monitor = HealthMonitor()
+        monitor.refresh()
+        assert monitor.snapshot()["ready"] is False
+        companions.append(object())
+        snapshot = monitor.snapshot()
+    finally:
+        set_clipboard_backend(previous)
+    assert (snapshot["status"], snapshot["ready"], snapshot["companions"]) == ("degraded", True, 1)
+
+
+def test_health_route_serves_the_snapshot(desktop, cursor_exe, companions, monkeypatch):
+    monitor = HealthMonitor()
+    monitor.refresh()
+    previous = set_health_monitor(monitor)
+    monkeypatch.setattr(app_package, 'setup_logging', lambda: None)
+    try:
+        response = app_package.create_app().test_client().get("/health")
+    finally:
+        set_health_monitor(previous)
+    assert response.status_code == 200
+    assert response.get_json()["ready"] is True
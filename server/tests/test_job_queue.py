@@ -0,0 +1,312 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_job_queue.py
+# Purpose: Tests for the automation job queue and its HTTP responses
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.job_queue``."""
+import asyncio
+import json
+import threading
+import time
+import pytest
+import app as app_package
+from app.routes import job_routes, open_routes
+from app.services.job_queue import AutomationError, AutomationQueue, JobStatus, QueueFullError, sse_message
+
+
+def _wait(job, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not job.finished and time.monotonic() < deadline:
+        job.events_since(len(job.events), 0.1)
+    assert job.finished, f"job {job.id} is still {job.status}"
+
+
+def _blocker(queue):
+    """Occupy the queue's only worker until the returned event is set."""
+    gate = threading.Event()
+    job = queue.submit("block", lambda job: gate.wait(5) and {}, 0)
+    deadline = time.monotonic() + 5
+    while job.status != JobStatus.RUNNING and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return job, gate
+
+
+@pytest.fixture
+def queue():
+    return AutomationQueue(max_size=4, retention=60, dedup_window=60, concurrency=1)
+
+
+@pytest.fixture
+def client(monkeypatch, queue):
+    monkeypatch.setattr(app_package, 'setup_logging', lambda: None)
+    monkeypatch.setattr(open_routes, 'get_automation_queue', lambda: queue)
+    monkeypatch.setattr(job_routes, 'get_automation_queue', lambda: queue)
+    flask_app = app_package.create_app()
+    flask_app.testing = True
+    return flask_app.test_client()
+
+
+def test_lower_priority_values_run_first(queue):
+    blocker, gate = _blocker(queue)
+    order = []
+    jobs = [
+        queue.submit(name, lambda job, name=name: order.append(name) or {}, priority)
+        for name, priority in (("paste", 5), ("open-file", 1), ("second open-file", 1))
+    ]
+    gate.set()
+    for job in [blocker] + jobs:
+        _wait(job)
+    assert order == ["open-file", "second open-file", "paste"]
+
+
+def test_full_queue_rejects_with_a_retry_estimate(queue):
+    _, gate = _blocker(queue)
+    try:
+        for _ in range(queue.max_size):
+            queue.submit("open", lambda job: {}, 5)
+        with pytest.raises(QueueFullError) as raised:
+            queue.submit("open", lambda job: {}, 5)
+        assert raised.value.retry_after >= 1
+        assert queue.depth() == queue.max_size
+    finally:
+        gate.set()
+
+
+def test_cancelled_queued_job_never_runs(queue):
+    blocker, gate = _blocker(queue)
+    ran = []
+    job = queue.submit("open", lambda job: ran.append(job) or {}, 5)
+    assert job.cancel() is True
+    gate.set()
+    _wait(blocker)
+    assert job.status == JobStatus.CANCELLED
+    assert not ran
+    assert job.cancel() is False
+
+
+def test_running_job_stops_at_its_next_stage(queue):
+    started, stop = threading.Event(), threading.Event()
+
+    def pipeline(job):
+        job.report("launch")
+        started.set()
+        stop.wait(5)
+        job.report("file_loaded")
+        return {"never": "reached"}
+
+    job = queue.submit("open", pipeline, 5)
+    assert started.wait(5)
+    job.cancel()
+    stop.set()
+    _wait(job)
+    assert job.status == JobStatus.CANCELLED
+    assert [event["stage"] for event in job.events] == ["queued", "running", "launch", "cancelled"]
+
+
+def test_automation_error_fails_the_job_with_its_message(queue):
+    def pipeline(job):
+        raise AutomationError("Cursor did not start", "timed out after 30s")
+
+    job = queue.submit("open", pipeline, 5)
+    _wait(job)
+    assert job.status == JobStatus.FAILED
+    data = job.to_dict()
+    assert (data["error"], data["detail"]) == ("Cursor did not start", "timed out after 30s")
+
+
+def test_unexpected_exception_fails_the_job(queue):
+    job = queue.submit("open", lambda job: 1 / 0, 5)
+    _wait(job)
+    assert job.status == JobStatus.FAILED
+    assert job.error == "Automation failed"
+
+
+def test_successful_job_keeps_its_result(queue):
+    job = queue.submit("open", lambda job: {"delivered": "companion"}, 5)
+    _wait(job)
+    assert job.to_dict()["result"] == {"delivered": "companion"}
+    assert queue.get(job.id) is job
+
+
+def test_open_file_is_accepted_with_a_job_url(client, queue, tmp_path):
+    path = tmp_path / "a.py"
+    path.write_text("x")
+    # Keep the job queued, and cancel it, so no automation runs
+    _, gate = _blocker(queue)
+    try:
+        response = client.post("/open-file", json={"filePath": str(path), "workspacePath": str(tmp_path)})
+        assert response.status_code == 202
+        body = response.get_json()
+        assert body["statusUrl"] == f"/jobs/{body['jobId']}"
+        job = queue.get(body["jobId"])
+        assert (job.kind, job.status) == ("open-file", JobStatus.QUEUED)
+        job.cancel()
+    finally:
+        gate.set()
+
+
+def test_full_queue_answers_429_with_retry_after(client, queue, tmp_path):
+    path = tmp_path / "a.py"
+    path.write_text("x")
+    _, gate = _blocker(queue)
+    try:
+        for _ in range(queue.max_size):
+            queue.submit("open", lambda job: {}, 5)
+        response = client.post("/open-file", json={"filePath": str(path), "workspacePath": str(tmp_path)})
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert response.get_json()["retryAfter"] == int(response.headers["Retry-After"])
+    finally:
+        gate.set()
+
+
+def _parse_sse(text):
+    events = []
+    for message in text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines() if line and not line.startswith(":"))
+        if fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def _staged_job(queue):
+    def pipeline(job):
+        job.report("launch", pid=42)
+        job.report("file_loaded")
+        return {"line": 7}
+
+    job = queue.submit("open", pipeline, 5)
+    _wait(job)
+    return job
+
+
+def test_sse_message_names_the_stage_and_numbers_it(queue):
+    event = _staged_job(queue).events[2]
+    assert sse_message(event) == f"id: 3\nevent: launch\ndata: {json.dumps(event)}\n\n"
+    assert event["pid"] == 42
+
+
+def test_event_stream_replays_every_stage_and_ends(client, queue):
+    job = _staged_job(queue)
+    response = client.get(f"/jobs/{job.id}/events")
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    events = _parse_sse(response.get_data(as_text=True))
+    assert [stage for _, stage, _ in events] == ["queued", "running", "launch", "file_loaded", "succeeded"]
+    assert events[-1][2]["result"] == {"line": 7}
+
+
+def test_event_stream_resumes_after_last_event_id(client, queue):
+    job = _staged_job(queue)
+    response = client.get(f"/jobs/{job.id}/events", headers={"Last-Event-ID": "3"})
+    events = _parse_sse(response.get_data(as_text=True))
+    assert [seq for seq, _, _ in events] == [4, 5]
+
+
+def test_event_stream_of_an_unknown_job_is_404(client):
+    assert client.get("/jobs/nope/events").status_code == 404
+
+
+def test_wait_events_wakes_when_a_stage_is_reported(queue):
+    blocker, gate = _blocker(queue)
+
+    async def follow():
+        seen = len(blocker.events)
+        waiter = asyncio.ensure_future(blocker.wait_events(seen, 5))
+        await asyncio.sleep(0.05)
+        gate.set()
+        return await waiter
+
+    events = asyncio.run(follow())
+    assert events and events[0]["stage"] == JobStatus.SUCCEEDED
+
+
+def test_wait_events_times_out_empty(queue):
+    blocker, gate = _blocker(queue)
+    try:
+        assert asyncio.run(blocker.wait_events(len(blocker.events), 0.05)) == []
+    finally:
+        gate.set()
+
+
+def test_duplicate_of_an_in_flight_job_is_attached(queue):
+    _, gate = _blocker(queue)
+    try:
+        job, created = queue.submit_once("open", lambda job: {}, 5, "open:fp:1")
+        again, created_again = queue.submit_once("open", lambda job: {}, 5, "open:fp:1")
+        assert (created, created_again) == (True, False)
+        assert again is job
+        assert queue.depth() == 1
+    finally:
+        gate.set()
+
+
+def test_duplicate_within_the_window_after_success_is_attached(queue):
+    job, _ = queue.submit_once("open", lambda job: {}, 5, "open:fp:1")
+    _wait(job)
+    assert queue.submit_once("open", lambda job: {}, 5, "open:fp:1") == (job, False)
+
+
+def test_duplicate_after_the_window_runs_again():
+    queue = AutomationQueue(max_size=4, retention=60, dedup_window=0, concurrency=1)
+    job, _ = queue.submit_once("open", lambda job: {}, 5, "open:fp:1")
+    _wait(job)
+    again, created = queue.submit_once("open", lambda job: {}, 5, "open:fp:1")
+    assert created and again is not job
+
+
+def test_failed_or_cancelled_jobs_are_retried(queue):
+    failed, _ = queue.submit_once("open", lambda job: 1 / 0, 5, "open:fp:1")
+    _wait(failed)
+    retried, created = queue.submit_once("open", lambda job: {}, 5, "open:fp:1")
+    assert created and retried is not failed
+
+    _, gate = _blocker(queue)
+    try:
+        cancelled, _ = queue.submit_once("open", lambda job: {}, 5, "open:fp:2")
+        cancelled.cancel()
+        assert queue.submit_once("open", lambda job: {}, 5, "open:fp:2")[1] is True
+    finally:
+        gate.set()
+
+
+def _post_twice(client, queue, path, first, second, headers=({}, {})):
+    # Keep the jobs queued, and cancel them, so no automation runs
+    _, gate = _blocker(queue)
+    try:
+        responses = [
+            client.post("/open-file", json={"filePath": str(path), **body}, headers=extra)
+            for body, extra in zip((first, second), headers)
+        ]
+        for response in responses:
+            assert response.status_code == 202
+            queue.get(response.get_json()["jobId"]).cancel()
+        return [response.get_json() for response in responses]
+    finally:
+        gate.set()
+
+
+def test_double_clicked_request_maps_to_one_job(client, queue, tmp_path):
+    path = tmp_path / "a.py"
+    path.write_text("x")
+    body = {"workspacePath": str(tmp_path)}
+    first, second = _post_twice(client, queue, path, body, body)
+    assert second["jobId"] == first["jobId"]
+    assert second["duplicate"] is True and "duplicate" not in first
+
+
+def test_idempotency_key_wins_over_the_fingerprint(client, queue, tmp_path):
+    path = tmp_path / "a.py"
+    path.write_text("x")
+    key = {"Idempotency-Key": "click-1"}
+    first, second = _post_twice(client, queue, path, {}, {"workspacePath": str(tmp_path)}, (key, key))
+    assert second["jobId"] == first["jobId"]
+
+    first, second = _post_twice(client, queue, path, {"idempotencyKey": "a"}, {"idempotencyKey": "b"})
+    assert second["jobId"] != first["jobId"]
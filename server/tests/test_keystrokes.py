@@ -0,0 +1,195 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_keystrokes.py
+# Purpose: Tests for the key sequence compiler and keyboard backends
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.keystrokes``."""
+import pytest
+from app.config import Config
+from app.services import keystrokes
+from app.services.keystrokes import (
+    KEYEVENTF_EXTENDEDKEY,
+    KEYEVENTF_KEYUP,
+    KeyBatch,
+    KeybdEventBackend,
+    KeyEvent,
+    KeySequence,
+    RecordingKeyboardBackend,
+)
+
+CTRL, SHIFT, ALT = 0x11, 0x10, 0x12
+K, L, V, ESC, PLUS, LEFT, DELETE = 0x4B, 0x4C, 0x56, 0x1B, 0xBB, 0x25, 0x2E
+
+
+def down(*vks):
+    return tuple(KeyEvent(vk) for vk in vks)
+
+
+def up(*vks):
+    return tuple(KeyEvent(vk, up=True) for vk in vks)
+
+
+def test_single_key():
+    sequence = KeySequence.parse('esc', chord_gap=0.02)
+    assert sequence.batches == [KeyBatch(down(ESC) + up(ESC))]
+    assert sequence.sends == 1
+    assert sequence.cost == 0.0
+
+
+def test_chord_modifiers_wrap_the_key():
+    sequence = KeySequence.parse('ctrl+shift+l', chord_gap=0.02)
+    assert sequence.batches == [KeyBatch(down(CTRL, SHIFT, L) + up(L, SHIFT, CTRL))]
+
+
+def test_modifiers_go_first_whatever_the_order():
+    assert KeySequence.parse('l+ctrl').batches == KeySequence.parse('ctrl+l').batches
+
+
+def test_chords_get_the_default_gap():
+    sequence = KeySequence.parse('ctrl+k ctrl+l', chord_gap=0.02)
+    assert sequence.batches == [
+        KeyBatch(down(CTRL, K) + up(K, CTRL), 0.02),
+        KeyBatch(down(CTRL, L) + up(L, CTRL)),
+    ]
+    assert sequence.sends == 2
+    assert sequence.cost == pytest.approx(0.02)
+
+
+def test_explicit_pause_replaces_the_gap():
+    sequence = KeySequence.parse('ctrl+k 50ms ctrl+l', chord_gap=0.02)
+    assert [batch.pause for batch in sequence.batches] == [pytest.approx(0.05), 0.0]
+    assert sequence.cost == pytest.approx(0.05)
+
+
+def test_consecutive_pauses_merge():
+    sequence = KeySequence.parse('esc 50ms 0.2s ctrl+l', chord_gap=0.02)
+    assert sequence.sends == 2
+    assert len(sequence.batches) == 2
+    assert sequence.batches[0].pause == pytest.approx(0.25)
+
+
+def test_leading_pause_is_an_empty_batch():
+    sequence = KeySequence.parse('100ms 50ms esc', chord_gap=0.02)
+    assert sequence.batches == [KeyBatch((), pytest.approx(0.15)), KeyBatch(down(ESC) + up(ESC))]
+    assert sequence.sends == 1
+    assert sequence.cost == pytest.approx(0.15)
+
+
+def test_trailing_pause_is_kept():
+    sequence = KeySequence.parse('esc 30ms', chord_gap=0.02)
+    assert sequence.batches == [KeyBatch(down(ESC) + up(ESC), pytest.approx(0.03))]
+
+
+def test_plus_key_by_name():
+    sequence = KeySequence.parse('ctrl+plus', chord_gap=0.02)
+    assert sequence.events == list(down(CTRL, PLUS) + up(PLUS, CTRL))
+
+
+def test_case_insensitive():
+    assert KeySequence.parse('Ctrl+V').batches == KeySequence.parse('ctrl+v').batches
+
+
+@pytest.mark.parametrize('spec', ['ctrl++', 'ctrl+', '+v'])
+def test_literal_plus_is_malformed(spec):
+    with pytest.raises(ValueError, match="plus"):
+        KeySequence.parse(spec)
+
+
+def test_two_non_modifier_keys_are_rejected():
+    with pytest.raises(ValueError, match="more than one non-modifier"):
+        KeySequence.parse('ctrl+k+l')
+
+
+def test_unknown_key_is_rejected():
+    with pytest.raises(ValueError, match="Unknown key 'hyper'"):
+        KeySequence.parse('hyper+l')
+
+
+@pytest.mark.parametrize('spec', ['', '50ms', '10ms 1s'])
+def test_sequence_without_keys_is_rejected(spec):
+    with pytest.raises(ValueError, match="presses no keys"):
+        KeySequence.parse(spec)
+
+
+def test_followed_by_replaces_the_trailing_pause():
+    sequence = KeySequence.parse('esc 10ms', chord_gap=0.02).followed_by(KeySequence.parse('ctrl+l'), 0.75)
+    assert sequence.batches == [
+        KeyBatch(down(ESC) + up(ESC), 0.75),
+        KeyBatch(down(CTRL, L) + up(L, CTRL)),
+    ]
+    assert sequence.sends == 2
+    assert sequence.cost == pytest.approx(0.75)
+
+
+def test_replay_records_batches_and_pauses():
+    backend = RecordingKeyboardBackend()
+    sequence = KeySequence.parse('100ms ctrl+k 50ms ctrl+l', chord_gap=0.02)
+    sequence.replay(backend)
+    assert backend.batches == [batch.events for batch in sequence.batches if batch.events]
+    assert backend.events == sequence.events
+    assert backend.waited == pytest.approx(sequence.cost)
+    backend.clear()
+    assert backend.batches == [] and backend.waited == 0.0
+
+
+def test_recording_backend_forwards_to_the_sink():
+    received = []
+    backend = RecordingKeyboardBackend(sink=received.append)
+    KeySequence.parse('ctrl+v').replay(backend)
+    assert received == list(down(CTRL, V) + up(V, CTRL))
+
+
+def test_extended_keys_are_flagged(monkeypatch):
+    calls = []
+
+    class FakeWin32Api:
+        @staticmethod
+        def keybd_event(vk, scan, flags, extra):
+            calls.append((vk, flags))
+
+    monkeypatch.setattr(keystrokes, 'win32api', FakeWin32Api)
+    KeybdEventBackend().send(KeySequence.parse('ctrl+left').batches[0].events)
+    KeybdEventBackend().send(KeySequence.parse('delete').batches[0].events)
+    assert calls == [
+        (CTRL, 0),
+        (LEFT, KEYEVENTF_EXTENDEDKEY),
+        (LEFT, KEYEVENTF_EXTENDEDKEY | KEYEVENTF_KEYUP),
+        (CTRL, KEYEVENTF_KEYUP),
+        (DELETE, KEYEVENTF_EXTENDEDKEY),
+        (DELETE, KEYEVENTF_EXTENDEDKEY | KEYEVENTF_KEYUP),
+    ]
+
+
+@pytest.fixture
+def fresh_sequences(monkeypatch):
+    monkeypatch.setattr(keystrokes, '_sequences', {})
+    monkeypatch.setattr(Config, 'KEY_SEQUENCES', dict(Config.KEY_SEQUENCE_DEFAULTS))
+
+
+def test_configured_sequence_is_used(fresh_sequences):
+    Config.KEY_SEQUENCES['open_chat'] = 'ctrl+k ctrl+l'
+    assert keystrokes.get_key_sequence('open_chat').sends == 2
+
+
+@pytest.mark.parametrize('bad', ['ctrl+hyper', 'ctrl++', '50ms', 'ctrl+k+l'])
+def test_bad_configured_sequence_falls_back_to_the_default(fresh_sequences, bad):
+    Config.KEY_SEQUENCES['open_chat'] = bad
+    sequence = keystrokes.get_key_sequence('open_chat')
+    assert sequence.batches == KeySequence.parse(Config.KEY_SEQUENCE_DEFAULTS['open_chat']).batches
+    assert keystrokes.get_key_sequence('open_chat') is sequence  # Compiled once
+
+
+def test_press_replays_through_the_shared_backend(fresh_sequences):
+    backend = RecordingKeyboardBackend()
+    previous = keystrokes.set_keyboard_backend(backend)
+    try:
+        keystrokes.press('paste')
+    finally:
+        keystrokes.set_keyboard_backend(previous)
+    assert backend.batches == [down(CTRL, V) + up(V, CTRL)]
@@ -0,0 +1,115 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_message_store.py
+# Purpose: Tests for the content-addressed message store
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.message_store``."""
+import hashlib
+import os
+import time
+import app as app_package
+from app.services.message_store import MessageStore, set_message_store
+
+
+def _store(tmp_path, **limits):
+    limits.setdefault('max_entries', 100)
+    limits.setdefault('max_bytes', 1024 * 1024)
+    limits.setdefault('cache_bytes', 1024 * 1024)
+    return MessageStore(str(tmp_path), **limits)
+
+
+def test_messages_are_named_after_their_hash(tmp_path):
+    store = _store(tmp_path)
+    stored = store.put("héllo")
+    store.flush(5)
+    assert stored.id == hashlib.sha256("héllo".encode('utf-8')).hexdigest()
+    assert stored.size == len("héllo".encode('utf-8'))
+    with open(stored.path, encoding='utf-8') as f:
+        assert f.read() == "héllo"
+
+
+def test_repeated_message_is_stored_once(tmp_path):
+    store = _store(tmp_path)
+    first = store.put("same")
+    second = store.put("same")
+    store.flush(5)
+    assert first == second
+    assert os.listdir(tmp_path) == [os.path.basename(first.path)]
+
+
+def test_oldest_messages_are_evicted_beyond_max_entries(tmp_path):
+    store = _store(tmp_path, max_entries=2)
+    a, b, c = (store.put(text) for text in ("a", "b", "c"))
+    store.flush(5)
+    assert store.get(a.id) is None
+    assert (store.get(b.id), store.get(c.id)) == ("b", "c")
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(s.path) for s in (b, c))
+
+
+def test_oldest_messages_are_evicted_beyond_max_bytes(tmp_path):
+    store = _store(tmp_path, max_bytes=25)
+    a, b, c = (store.put(text * 10) for text in ("a", "b", "c"))
+    store.flush(5)
+    assert store.get(a.id) is None
+    assert store.get(c.id) == "c" * 10
+    assert not os.path.exists(a.path)
+
+
+def test_reading_a_message_keeps_it_from_eviction(tmp_path):
+    store = _store(tmp_path, max_entries=2)
+    a, b = store.put("a"), store.put("b")
+    store.get(a.id)
+    store.put("c")
+    assert store.get(a.id) == "a"
+    assert store.get(b.id) is None
+
+
+def test_newest_message_is_kept_even_over_the_byte_limit(tmp_path):
+    store = _store(tmp_path, max_bytes=4)
+    stored = store.put("larger than the limit")
+    store.flush(5)
+    assert store.get(stored.id) == "larger than the limit"
+
+
+def test_messages_past_the_memory_cache_are_read_from_disk(tmp_path):
+    store = _store(tmp_path, cache_bytes=4)
+    stored = store.put("too big to cache")
+    store.flush(5)
+    assert store.get(stored.id) == "too big to cache"
+    os.remove(stored.path)
+    assert store.get(stored.id) is None
+
+
+def test_index_is_rebuilt_oldest_first_on_restart(tmp_path):
+    store = _store(tmp_path)
+    old, new = store.put("old"), store.put("new")
+    store.flush(5)
+    now = time.time()
+    os.utime(old.path, (now - 60, now - 60))
+    os.utime(new.path, (now, now))
+
+    restarted = _store(tmp_path, max_entries=1)
+    restarted.flush(5)
+    assert restarted.get(old.id) is None
+    assert restarted.get(new.id) == "new"
+    assert not os.path.exists(old.path)
+
+
+def test_message_route_serves_stored_text(tmp_path, monkeypatch):
+    store = _store(tmp_path)
+    previous = set_message_store(store)
+    monkeypatch.setattr(app_package, 'setup_logging', lambda: None)
+    try:
+        client = app_package.create_app().test_client()
+        stored = store.put("message text")
+        response = client.get(f"/messages/{stored.id}")
+        assert (response.status_code, response.get_data(as_text=True)) == (200, "message text")
+        assert client.get("/messages/unknown").status_code == 404
+    finally:
+        set_message_store(previous)
@@ -0,0 +1,86 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_paste_pipeline.py
+# Purpose: Tests for the readiness-probe paste state machine
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.paste_pipeline``."""
+import asyncio
+import pytest
+from app.config import Config
+from app.services.paste_pipeline import PastePipeline, PasteState
+from app.services.timing_model import TimingModel
+
+
+@pytest.fixture
+def timing(monkeypatch):
+    # stage -> (default, floor, ceiling); short so failing probes time out quickly
+    monkeypatch.setattr(Config, 'TIMING_STAGES', {'focus': (0.03, 0.01, 0.06), 'settle': (0.01, 0.0, 0.02)})
+    monkeypatch.setattr(Config, 'PROBE_INTERVAL', 0.005)
+    return TimingModel(min_samples=100)
+
+
+def _run(states, timing, reports=None):
+    report = (lambda stage, **data: reports.append(stage)) if reports is not None else None
+    return asyncio.run(PastePipeline(states, report, timing).run())
+
+
+def test_states_run_in_order_and_report_their_stage(timing):
+    log, reports = [], []
+    states = [
+        PasteState('focus', lambda: log.append('raise'), lambda: True, report='focus'),
+        PasteState('settle', lambda: log.append('paste'), report='paste'),
+    ]
+    assert _run(states, timing, reports) == (True, "")
+    assert log == ['raise', 'paste']
+    assert reports == ['focus', 'paste']
+
+
+def test_probe_passing_early_skips_the_rest_of_the_delay(timing):
+    polls = []
+
+    def probe():
+        polls.append(None)
+        return len(polls) == 2
+
+    assert _run([PasteState('focus', None, probe)], timing) == (True, "")
+    assert len(polls) == 2
+    assert timing.snapshot()['focus']['samples'] == 1
+
+
+def test_failed_probe_is_retried_with_the_retry_action(timing):
+    log = []
+    state = PasteState(
+        'focus', lambda: log.append('raise'), lambda: 'alt-tab' in log,
+        attempts=3, prepare=lambda: log.append('baseline'), retry=lambda: log.append('alt-tab')
+    )
+    assert _run([state], timing) == (True, "")
+    assert log == ['baseline', 'raise', 'alt-tab']
+
+
+def test_required_state_that_never_passes_fails_the_pipeline(timing):
+    log = []
+    states = [
+        PasteState('focus', lambda: log.append('raise'), lambda: False, attempts=2, required=True,
+                   failure="Could not focus Cursor"),
+        PasteState('settle', lambda: log.append('paste')),
+    ]
+    assert _run(states, timing) == (False, "Could not focus Cursor")
+    assert log == ['raise', 'raise']
+
+
+def test_optional_state_that_never_passes_is_passed_over(timing):
+    log = []
+    states = [
+        PasteState('focus', lambda: log.append('raise'), lambda: False),
+        PasteState('settle', lambda: log.append('paste')),
+    ]
+    assert _run(states, timing) == (True, "")
+    assert log == ['raise', 'paste']
+    # A timeout pushes the learned delay toward the ceiling
+    assert list(timing._samples['focus']) == [0.06]
@@ -0,0 +1,107 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_request_limits.py
+# Purpose: Tests for bounded request bodies and message assembly
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for request body limits in the Flask routes and the ASGI bridge."""
+import asyncio
+import json
+import pytest
+import app as app_package
+from app.asgi import AsgiApp
+from app.config import Config
+from app.services.message_service import MessageService
+
+LIMIT = 1024
+
+
+@pytest.fixture
+def flask_app(monkeypatch):
+    monkeypatch.setattr(app_package, 'setup_logging', lambda: None)
+    monkeypatch.setattr(Config, 'MAX_CONTENT_LENGTH', LIMIT)
+    flask_app = app_package.create_app()
+    flask_app.testing = True
+    return flask_app
+
+
+@pytest.fixture
+def asgi(flask_app):
+    asgi = AsgiApp(flask_app, wsgi_workers=1)
+    yield asgi
+    asgi.executor.shutdown(wait=False)
+
+
+def _call(asgi, chunks, content_length=None):
+    """Send a POST /open through the ASGI app; returns (status, body, chunks read)."""
+    messages = [
+        {'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    read, sent = [], []
+
+    async def receive():
+        message = messages.pop(0)
+        read.append(message)
+        return message
+
+    async def send(message):
+        sent.append(message)
+
+    headers = [(b'content-type', b'application/json')]
+    if content_length is not None:
+        headers.append((b'content-length', str(content_length).encode()))
+    scope = {
+        'type': 'http', 'method': 'POST', 'path': '/open', 'query_string': b'', 'headers': headers,
+        'http_version': '1.1', 'scheme': 'http', 'server': ('127.0.0.1', 5050), 'client': ('127.0.0.1', 1)
+    }
+    asyncio.run(asgi(scope, receive, send))
+    body = b''.join(message.get('body', b'') for message in sent[1:])
+    return sent[0]['status'], json.loads(body), len(read)
+
+
+def test_flask_rejects_a_body_over_the_limit(flask_app):
+    body = json.dumps({"filePath": "a.py", "comment": "x" * LIMIT})
+    response = flask_app.test_client().post("/open", data=body, content_type="application/json")
+    assert response.status_code == 413
+    assert response.get_json() == {"error": "Request body too large", "maxBytes": LIMIT}
+
+
+def test_flask_reports_invalid_json(flask_app):
+    response = flask_app.test_client().post("/open", data="{not json", content_type="application/json")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid JSON"
+
+
+def test_asgi_rejects_a_declared_length_without_reading_the_body(asgi):
+    status, body, read = _call(asgi, [b'x' * (LIMIT + 1)], content_length=LIMIT + 1)
+    assert (status, body["maxBytes"]) == (413, LIMIT)
+    assert read == 0
+
+
+def test_asgi_stops_buffering_a_chunked_body_at_the_limit(asgi):
+    chunks = [b'x' * (LIMIT // 2)] * 4
+    status, _, read = _call(asgi, chunks)
+    assert status == 413
+    assert read == 3
+
+
+def test_asgi_passes_a_body_within_the_limit_to_flask(asgi):
+    status, body, _ = _call(asgi, [b'{"comment": "', b'hi"}'])
+    # Reaches the route, which then finds the file path missing
+    assert (status, body) == (400, {"error": "Missing 'filePath'"})
+
+
+def test_combined_message_keeps_comment_and_snippet():
+    assert MessageService.combine_message("Fix this", "x = 1") == "Fix this\n\n--- CODE SNIPPET ---\n\nx = 1"
+
+
+def test_blank_parts_are_left_out():
+    assert MessageService.combine_message("Fix this", "  \n") == "Fix this"
+    assert MessageService.combine_message(None, "x = 1") == "\n--- CODE SNIPPET ---\n\nx = 1"
+    assert MessageService.combine_message("", None) == ""
@@ -0,0 +1,128 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_snippet_locator.py
+# Purpose: Tests for finding the line a code snippet is on
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.snippet_locator``."""
+import os
+import pytest
+from app.services.snippet_locator import SnippetLocator, snippet_lines
+
+SOURCE = """import os
+
+
+def load(path):
+    with open(path) as f:
+        data = f.read()
+    return parse(data)
+
+
+def parse(text):
+    rows = [line.split(',') for line in text.splitlines()]
+    header, *body = rows
+    return [dict(zip(header, row)) for row in body]
+
+
+def save(path, rows):
+    with open(path, 'w') as f:
+        f.write(render(rows))
+"""
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "module.py"
+    path.write_bytes(SOURCE.encode("utf-8"))
+    return str(path)
+
+
+@pytest.fixture
+def locator():
+    # Small blocks so the line index spans several of them
+    return SnippetLocator(block=64)
+
+
+def test_snippet_is_found_at_its_last_line(locator, source):
+    snippet = "    header, *body = rows\n    return [dict(zip(header, row)) for row in body]"
+    match = locator.locate(source, snippet)
+    assert (match.start_line, match.line, match.score) == (12, 13, 1.0)
+
+
+def test_whitespace_differences_are_ignored(locator, source):
+    snippet = "def   parse(text):\n\trows = [line.split(',')  for line in text.splitlines()]"
+    match = locator.locate(source, snippet)
+    assert (match.start_line, match.line) == (10, 11)
+
+
+def test_tabs_and_extra_spaces_in_the_file_are_matched(locator, tmp_path):
+    path = tmp_path / "spaced.py"
+    path.write_text("x = 1\n\nvalue  =\tcompute(x,   y)\n")
+    match = locator.locate(str(path), "value = compute(x, y)")
+    assert match.line == 3
+
+
+def test_drifted_snippet_with_an_edited_line_still_matches(locator, source):
+    snippet = (
+        "def parse(text):\n"
+        "    rows = [line.split(';') for line in text.splitlines()]\n"
+        "    header, *body = rows\n"
+        "    return [dict(zip(header, row)) for row in body]"
+    )
+    match = locator.locate(source, snippet)
+    assert match.line == 13
+    assert match.score == pytest.approx(0.75)
+
+
+def test_diff_snippet_is_matched_by_its_new_lines(locator, source):
+    snippet = (
+        "@@ -16,3 +16,3 @@ def save(path, rows):\n"
+        " def save(path, rows):\n"
+        "-    with open(path) as f:\n"
+        "+    with open(path, 'w') as f:\n"
+        "         f.write(render(rows))"
+    )
+    assert snippet_lines(snippet) == ["def save(path, rows):", "with open(path, 'w') as f:", "f.write(render(rows))"]
+    assert locator.locate(source, snippet).line == 18
+
+
+def test_snippet_mostly_missing_from_the_file_is_not_found(locator, source):
+    snippet = "def unrelated():\n    return compute_something_else()\n    header, *body = rows"
+    assert locator.locate(source, snippet) is None
+
+
+def test_unreadable_or_empty_inputs_are_not_found(locator, source, tmp_path):
+    empty = tmp_path / "empty.py"
+    empty.write_text("")
+    assert locator.locate(source, "") is None
+    assert locator.locate(source, "\n  \n") is None
+    assert locator.locate(str(tmp_path / "missing.py"), "def load(path):") is None
+    assert locator.locate(str(empty), "def load(path):") is None
+
+
+def test_crlf_files_count_lines_the_same(locator, tmp_path):
+    path = tmp_path / "crlf.py"
+    path.write_bytes(SOURCE.replace("\n", "\r\n").encode("utf-8"))
+    assert locator.locate(str(path), "    header, *body = rows").line == 12
+
+
+def test_line_numbers_are_right_deep_into_a_large_file(locator, tmp_path):
+    path = tmp_path / "large.py"
+    lines = [f"value_{i} = compute({i})" for i in range(5000)]
+    path.write_text("\n".join(lines) + "\n")
+    for target in (4999, 17, 2500, 1):
+        assert locator.locate(str(path), lines[target - 1]).line == target
+
+
+def test_index_follows_changes_to_the_file(locator, source):
+    snippet = "def save(path, rows):"
+    assert locator.locate(source, snippet).line == 16
+    with open(source, "w") as f:
+        f.write("# header added above\n\n" + SOURCE)
+    os.utime(source, ns=(os.stat(source).st_atime_ns, os.stat(source).st_mtime_ns + 1_000_000_000))
+    assert locator.locate(source, snippet).line == 18
@@ -0,0 +1,106 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_timing_model.py
+# Purpose: Tests for the adaptive keystroke and settle delays
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.timing_model``."""
+import asyncio
+import json
+import pytest
+from app.config import Config
+from app.services.timing_model import TimingModel
+
+
+@pytest.fixture(autouse=True)
+def stages(monkeypatch):
+    # stage -> (default, floor, ceiling)
+    monkeypatch.setattr(Config, 'TIMING_STAGES', {'settle': (0.5, 0.1, 1.0), 'focus': (0.3, 0.05, 2.0)})
+
+
+@pytest.fixture
+def model():
+    return TimingModel(percentile=90, min_samples=5, window=10)
+
+
+def test_default_until_enough_samples(model):
+    for _ in range(4):
+        model.observe('settle', 0.2)
+    assert model.delay('settle') == 0.5
+    model.observe('settle', 0.2)
+    assert model.delay('settle') == 0.2
+
+
+def test_delay_is_the_configured_percentile(model):
+    for ms in range(1, 11):
+        model.observe('settle', ms / 20)
+    # 90th percentile of 0.05 .. 0.50
+    assert model.delay('settle') == pytest.approx(0.45)
+
+
+def test_delay_is_clamped_to_the_stage_bounds(model):
+    for _ in range(5):
+        model.observe('settle', 0.01)
+        model.observe('focus', 5.0)
+    assert model.delay('settle') == 0.1
+    assert model.delay('focus') == 2.0
+
+
+def test_only_the_most_recent_samples_count(model):
+    for _ in range(10):
+        model.observe('settle', 0.9)
+    for _ in range(10):
+        model.observe('settle', 0.2)
+    assert model.delay('settle') == 0.2
+
+
+def test_samples_survive_a_restart(tmp_path):
+    path = str(tmp_path / 'timing.json')
+    model = TimingModel(path, percentile=90, min_samples=5, window=10)
+    for _ in range(5):
+        model.observe('settle', 0.25)
+    model.save()
+    assert TimingModel(path, percentile=90, min_samples=5, window=10).delay('settle') == 0.25
+
+
+def test_unknown_stages_and_corrupt_files_are_ignored(tmp_path):
+    path = tmp_path / 'timing.json'
+    path.write_text(json.dumps({"samples": {"retired": [0.1] * 5, "settle": [0.2] * 5}}))
+    model = TimingModel(str(path), percentile=90, min_samples=5, window=10)
+    assert set(model.snapshot()) == {'settle', 'focus'}
+    assert model.delay('settle') == 0.2
+
+    path.write_text("{not json")
+    assert TimingModel(str(path)).delay('settle') == 0.5
+
+
+def test_wait_until_records_the_observed_latency(model):
+    calls = []
+
+    async def probe():
+        calls.append(None)
+        return len(calls) >= 3
+
+    assert asyncio.run(model.wait_until('settle', probe, interval=0.01)) is True
+    assert model.snapshot()['settle']['samples'] == 1
+    assert model._samples['settle'][0] < 0.5
+
+
+def test_wait_until_records_the_ceiling_on_timeout(model):
+    async def probe():
+        return False
+
+    assert asyncio.run(model.wait_until('settle', probe, interval=0.01, deadline=0.03)) is False
+    assert list(model._samples['settle']) == [1.0]
+
+
+def test_failing_probe_counts_as_not_ready(model):
+    async def probe():
+        raise OSError("window vanished")
+
+    assert asyncio.run(model.wait_until('settle', probe, interval=0.01, deadline=0.03)) is False
@@ -0,0 +1,178 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_websocket.py
+# Purpose: Tests for the extension WebSocket channel of the ASGI app
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for the ``/ws`` channel served by ``app.asgi``."""
+import asyncio
+import json
+import time
+import pytest
+import app as app_package
+from app import asgi as asgi_module
+from app.config import Config
+from app.routes import open_routes
+from app.services.automation_service import AutomationService
+from app.services.job_queue import AutomationQueue
+from app.services.notices import get_notice_board
+
+EXTENSION_ORIGIN = b'chrome-extension://abcdef'
+
+
+class Socket:
+    """Client side of one WebSocket connection to the ASGI app."""
+
+    def __init__(self, app, path='/ws', origin=EXTENSION_ORIGIN):
+        self.inbox = asyncio.Queue()
+        self.sent = []
+        headers = [(b'origin', origin)] if origin else []
+        scope = {
+            'type': 'websocket', 'path': path, 'query_string': b'', 'headers': headers,
+            'server': ('127.0.0.1', 5050), 'client': ('127.0.0.1', 1)
+        }
+        self.inbox.put_nowait({'type': 'websocket.connect'})
+        self.task = asyncio.ensure_future(app(scope, self.inbox.get, self._send))
+
+    async def _send(self, message):
+        self.sent.append(message)
+
+    def frames(self):
+        return [json.loads(message['text']) for message in self.sent if message['type'] == 'websocket.send']
+
+    async def send(self, frame):
+        await self.inbox.put({'type': 'websocket.receive', 'text': json.dumps(frame)})
+
+    async def wait_for(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            found = [frame for frame in self.frames() if predicate(frame)]
+            if found:
+                return found[0]
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"no matching frame in {self.frames()}")
+
+    async def close(self):
+        await self.inbox.put({'type': 'websocket.disconnect', 'code': 1000})
+        await asyncio.wait_for(self.task, 5)
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    queue = AutomationQueue(max_size=4, retention=60, dedup_window=60, concurrency=1)
+    monkeypatch.setattr(open_routes, 'get_automation_queue', lambda: queue)
+    monkeypatch.setattr(asgi_module, 'get_automation_queue', lambda: queue)
+    return queue
+
+
+@pytest.fixture
+def app(monkeypatch, queue):
+    monkeypatch.setattr(app_package, 'setup_logging', lambda: None)
+    app = asgi_module.AsgiApp(app_package.create_app(), wsgi_workers=2)
+    yield app
+    app.executor.shutdown(wait=False)
+
+
+def _session(app, test, **socket_args):
+    async def main():
+        socket = Socket(app, **socket_args)
+        try:
+            return await test(socket)
+        finally:
+            if not socket.task.done():
+                await socket.close()
+    return asyncio.run(main())
+
+
+def test_extension_is_greeted_with_the_protocol_version(app):
+    async def test(socket):
+        return await socket.wait_for(lambda frame: frame['type'] == 'hello')
+
+    assert _session(app, test) == {"type": "hello", "version": asgi_module.WEBSOCKET_PROTOCOL_VERSION}
+
+
+@pytest.mark.parametrize("socket_args", [{'origin': b'https://evil.example'}, {'path': '/other'}])
+def test_web_pages_and_other_paths_are_refused(app, socket_args):
+    async def test(socket):
+        await asyncio.wait_for(socket.task, 5)
+        return socket.sent
+
+    assert _session(app, test, **socket_args) == [{'type': 'websocket.close', 'code': 1008}]
+
+
+def test_ping_is_answered(app):
+    async def test(socket):
+        await socket.send({"type": "ping", "id": 7})
+        return await socket.wait_for(lambda frame: frame['type'] == 'pong')
+
+    assert _session(app, test) == {"type": "pong", "id": 7}
+
+
+def test_invalid_json_is_reported(app):
+    async def test(socket):
+        await socket.inbox.put({'type': 'websocket.receive', 'text': '{not json'})
+        return await socket.wait_for(lambda frame: frame['type'] == 'error')
+
+    assert _session(app, test)["error"] == "Invalid JSON"
+
+
+def test_batched_requests_are_answered_by_id(app, monkeypatch):
+    monkeypatch.setattr(Config, 'MAX_CONTENT_LENGTH', 64)
+
+    async def test(socket):
+        await socket.send([
+            {"id": "missing", "method": "POST", "path": "/open", "body": {"comment": "hi"}},
+            {"id": "no-path", "method": "GET"},
+            {"id": "stream", "method": "GET", "path": "/jobs/abc/events"},
+            {"id": "large", "method": "POST", "path": "/open", "body": {"comment": "x" * 100}},
+            {"id": "query", "method": "GET", "path": "/repos/resolve?url=/local/path"},
+        ])
+        responses = {}
+        for request_id in ("missing", "no-path", "stream", "large", "query"):
+            frame = await socket.wait_for(lambda frame: frame.get('id') == request_id)
+            responses[request_id] = (frame['status'], frame['body']['error'])
+        return responses
+
+    assert _session(app, test) == {
+        "missing": (400, "Missing 'filePath'"),
+        "no-path": (400, "path is required"),
+        "stream": (400, "Streams are not available over the socket; accepted jobs are followed"),
+        "large": (413, "Request body too large"),
+        "query": (400, "Missing or invalid 'url'"),
+    }
+
+
+def test_notices_are_pushed(app):
+    async def test(socket):
+        await socket.wait_for(lambda frame: frame['type'] == 'hello')
+        get_notice_board().publish('test', "hello there")
+        return await socket.wait_for(lambda frame: frame.get('message') == "hello there")
+
+    assert _session(app, test)["kind"] == 'test'
+
+
+def test_accepted_job_is_followed_to_completion(app, monkeypatch, tmp_path):
+    async def open_file_only(workspace_path, file_path, report):
+        report("launch")
+        return {"status": "ok", "file": file_path}
+
+    monkeypatch.setattr(AutomationService, 'open_file_only', staticmethod(open_file_only))
+    path = tmp_path / "a.py"
+    path.write_text("x")
+
+    async def test(socket):
+        await socket.send({"id": 1, "method": "POST", "path": "/open-file", "body": {"filePath": str(path)}})
+        done = await socket.wait_for(lambda frame: frame['type'] == 'done')
+        response = await socket.wait_for(lambda frame: frame['type'] == 'response')
+        stages = [frame['event']['stage'] for frame in socket.frames() if frame['type'] == 'event']
+        return response, stages, done
+
+    response, stages, done = _session(app, test)
+    assert (response['status'], response['headers']['location']) == (202, f"/jobs/{response['body']['jobId']}")
+    assert stages == ["queued", "running", "launch", "succeeded"]
+    assert done['id'] == 1 and done['job']['result'] == {"status": "ok", "file": str(path)}
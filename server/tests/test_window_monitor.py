@@ -0,0 +1,181 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_window_monitor.py
+# Purpose: Tests for the window monitor driven by the fake window backend
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.window_monitor``."""
+import asyncio
+import threading
+import time
+import pytest
+from app.services.window_monitor import FakeWindowBackend, WindowEvent, WindowMonitor
+
+# Long enough that only an event (not a poll) can explain a quick wake-up
+IDLE_POLL = 30.0
+
+
+def titled(title):
+    return lambda windows: next((info for info in windows if info.title == title), None)
+
+
+def later(delay, func, *args):
+    timer = threading.Timer(delay, func, args)
+    timer.start()
+    return timer
+
+
+@pytest.fixture
+def backend():
+    return FakeWindowBackend()
+
+
+@pytest.fixture
+def event_monitor(backend):
+    monitor = WindowMonitor(backend, poll_interval=IDLE_POLL, idle_poll_interval=IDLE_POLL, use_events=True)
+    monitor.start()
+    yield monitor
+    monitor.stop()
+
+
+@pytest.fixture
+def poll_monitor(backend):
+    monitor = WindowMonitor(backend, poll_interval=0.02, idle_poll_interval=IDLE_POLL, use_events=False)
+    monitor.start()
+    yield monitor
+    monitor.stop()
+
+
+def test_start_takes_an_initial_snapshot(backend):
+    hwnd = backend.create_window("a.py - repo - Cursor")
+    monitor = WindowMonitor(backend, use_events=True)
+    monitor.start()
+    try:
+        assert [info.hwnd for info in monitor.windows()] == [hwnd]
+        assert monitor.first_seen(hwnd) is not None
+        assert monitor.event_driven
+    finally:
+        monitor.stop()
+
+
+def test_wait_for_wakes_on_event(backend, event_monitor):
+    later(0.05, backend.create_window, "a.py - repo - Cursor")
+    start = time.monotonic()
+    info = event_monitor.wait_for(titled("a.py - repo - Cursor"), timeout=5.0)
+    assert info is not None and info.title == "a.py - repo - Cursor"
+    assert time.monotonic() - start < 1.0
+
+
+def test_wait_for_async_wakes_on_event(backend, event_monitor):
+    hwnd = backend.create_window("Welcome - repo - Cursor")
+
+    async def wait():
+        later(0.05, backend.set_title, hwnd, "b.py - repo - Cursor")
+        return await event_monitor.wait_for_async(titled("b.py - repo - Cursor"), timeout=5.0)
+
+    start = time.monotonic()
+    info = asyncio.run(wait())
+    assert info is not None and info.hwnd == hwnd
+    assert time.monotonic() - start < 1.0
+
+
+def test_wait_for_times_out(event_monitor):
+    start = time.monotonic()
+    assert event_monitor.wait_for(titled("never"), timeout=0.2) is None
+    assert 0.2 <= time.monotonic() - start < 1.0
+
+
+def test_wait_for_async_times_out(event_monitor):
+    start = time.monotonic()
+    assert asyncio.run(event_monitor.wait_for_async(titled("never"), timeout=0.2)) is None
+    assert 0.2 <= time.monotonic() - start < 1.0
+
+
+def test_recheck_interval_reevaluates_without_changes(event_monitor):
+    deadline = time.monotonic() + 0.1
+    start = time.monotonic()
+    result = event_monitor.wait_for(lambda windows: time.monotonic() >= deadline, timeout=5.0, recheck_interval=0.02)
+    assert result is True
+    assert time.monotonic() - start < 1.0
+
+
+def test_missed_event_is_caught_by_the_final_scan(backend):
+    # Not started: no events are delivered, only the scan after the timeout sees the window
+    monitor = WindowMonitor(backend, use_events=True)
+    backend.create_window("a.py - repo - Cursor")
+    assert monitor.wait_for(titled("a.py - repo - Cursor"), timeout=0.05) is not None
+
+
+def test_polling_wakes_waiters(backend, poll_monitor):
+    assert not poll_monitor.event_driven
+    later(0.05, backend.create_window, "a.py - repo - Cursor")
+    start = time.monotonic()
+    assert poll_monitor.wait_for(titled("a.py - repo - Cursor"), timeout=5.0) is not None
+    assert time.monotonic() - start < 1.0
+
+
+def test_polling_wakes_async_waiters(backend, poll_monitor):
+    async def wait():
+        later(0.05, backend.create_window, "a.py - repo - Cursor")
+        return await poll_monitor.wait_for_async(titled("a.py - repo - Cursor"), timeout=5.0)
+
+    assert asyncio.run(wait()) is not None
+
+
+class _BrokenEventsBackend(FakeWindowBackend):
+    def run_event_loop(self, on_event):
+        raise OSError("SetWinEventHook failed")
+
+
+def test_falls_back_to_polling_when_events_fail():
+    backend = _BrokenEventsBackend()
+    monitor = WindowMonitor(backend, poll_interval=0.02, idle_poll_interval=IDLE_POLL, use_events=True)
+    monitor.start()
+    try:
+        later(0.05, backend.create_window, "a.py - repo - Cursor")
+        assert monitor.wait_for(titled("a.py - repo - Cursor"), timeout=5.0) is not None
+        assert not monitor.event_driven
+    finally:
+        monitor.stop()
+
+
+def test_handle_event_reports_changes_to_listeners(backend):
+    monitor = WindowMonitor(backend, accept=lambda info: info.pid == 7, use_events=True)
+    events = []
+    monitor.add_listener(lambda event, info: events.append((event, info.title)))
+
+    hwnd = backend.create_window("a.py - repo - Cursor", pid=7)
+    other = backend.create_window("Some browser", pid=8)
+    monitor.handle_event(hwnd)
+    monitor.handle_event(other)
+    monitor.handle_event(hwnd)  # Unchanged: no event
+    backend.set_title(hwnd, "b.py - repo - Cursor")
+    monitor.handle_event(hwnd)
+    backend.destroy_window(hwnd)
+    monitor.handle_event(hwnd)
+
+    assert events == [
+        (WindowEvent.CREATED, "a.py - repo - Cursor"),
+        (WindowEvent.RETITLED, "b.py - repo - Cursor"),
+        (WindowEvent.DESTROYED, "b.py - repo - Cursor"),
+    ]
+    assert monitor.windows() == []
+    assert monitor.first_seen(hwnd) is None
+
+
+def test_failing_listener_does_not_stop_the_others(backend):
+    monitor = WindowMonitor(backend, use_events=True)
+    seen = []
+
+    def broken(event, info):
+        raise RuntimeError("boom")
+
+    monitor.add_listener(broken)
+    monitor.add_listener(lambda event, info: seen.append(event))
+    monitor.handle_event(backend.create_window("a.py - repo - Cursor"))
+    assert seen == [WindowEvent.CREATED]
@@ -0,0 +1,127 @@
+# ============================================================================
+# Project: CursIt - Cursor IDE Integration for GitHub & Azure DevOps
+# File: server/tests/test_workspace_pool.py
+# Purpose: Tests for workspace usage ranking and window pre-warming
+#
+# Copyright (c) 2025 Volodymyr Yepishev
+#              All rights reserved.
+#
+# Licensed under GNU General Public License v3.0
+# ============================================================================
+
+"""Tests for ``app.services.workspace_pool``."""
+import time
+import pytest
+from app.config import Config
+from app.services.async_runtime import get_automation_loop
+from app.services.simulated_desktop import DesktopTimings, SimulatedDesktop
+from app.services.window_index import get_window_index
+from app.services.workspace_pool import WorkspacePool
+
+
+@pytest.fixture
+def workspaces(tmp_path):
+    paths = []
+    for name in ("alpha", "beta", "gamma"):
+        path = tmp_path / name
+        path.mkdir()
+        paths.append(str(path))
+    return paths
+
+
+def test_most_used_workspaces_rank_first(workspaces):
+    alpha, beta, gamma = workspaces
+    pool = WorkspacePool(size=2)
+    for path in (alpha, beta, beta, gamma, gamma, gamma):
+        pool.record(path)
+    assert pool.top() == [gamma, beta]
+
+
+def test_old_use_decays(workspaces, monkeypatch):
+    alpha, beta, _ = workspaces
+    pool = WorkspacePool(size=2, half_life=3600)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now - 4 * 3600)
+    for _ in range(4):
+        pool.record(alpha)
+    monkeypatch.setattr(time, 'time', lambda: now)
+    pool.record(beta)
+    # Four uses four half-lives ago are worth a quarter of one use now
+    assert pool.top() == [beta, alpha]
+
+
+def test_deleted_workspaces_are_not_kept_open(workspaces, tmp_path):
+    alpha, _, _ = workspaces
+    pool = WorkspacePool(size=3)
+    pool.record(str(tmp_path / "deleted"))
+    pool.record(alpha)
+    assert pool.top() == [alpha]
+
+
+def test_history_is_bounded(workspaces, monkeypatch):
+    monkeypatch.setattr(Config, 'WORKSPACE_HISTORY_MAX', 2)
+    alpha, beta, gamma = workspaces
+    pool = WorkspacePool(size=3)
+    pool.record(alpha)
+    pool.record(alpha)
+    pool.record(beta)
+    pool.record(gamma)
+    assert {entry["path"] for entry in pool.snapshot()} == {alpha, gamma}
+
+
+def test_history_survives_a_restart(workspaces, tmp_path):
+    alpha, beta, _ = workspaces
+    path = str(tmp_path / "history.json")
+    pool = WorkspacePool(path, size=2)
+    pool.record(beta)
+    pool.record(alpha)
+    pool.record(alpha)
+    pool.save()
+    restored = WorkspacePool(path, size=2)
+    assert restored.top() == [alpha, beta]
+    assert restored.snapshot()[0]["count"] == 2
+
+
+def test_unreadable_history_is_ignored(tmp_path):
+    path = tmp_path / "history.json"
+    path.write_text("{not json")
+    assert WorkspacePool(str(path)).snapshot() == []
+
+
+@pytest.fixture
+def desktop():
+    timings = DesktopTimings(cold_start=0.05, window_appear=0.02, title_change=0.02, jitter=0.0)
+    with SimulatedDesktop(timings, seed=1) as desktop:
+        yield desktop
+
+
+def test_prewarm_opens_the_top_workspaces_and_closes_dropped_ones(desktop, workspaces):
+    alpha, beta, _ = workspaces
+    pool = WorkspacePool(size=1, max_windows=4)
+    pool.record(alpha)
+
+    result = get_automation_loop().run(pool.prewarm())
+    assert result["opened"] == [alpha]
+    assert get_window_index().lookup(alpha) is not None
+    assert pool.snapshot()[0]["prewarmed"] is True
+    assert get_automation_loop().run(pool.prewarm())["opened"] == []
+
+    # beta takes the only slot; alpha's window was never used, so it is closed
+    for _ in range(3):
+        pool.record(beta)
+    result = get_automation_loop().run(pool.prewarm())
+    assert (result["closed"], result["opened"]) == ([alpha], [beta])
+
+
+def test_windows_that_served_a_request_are_never_closed(desktop, workspaces):
+    alpha, beta, _ = workspaces
+    pool = WorkspacePool(size=1, max_windows=4)
+    pool.record(alpha)
+    get_automation_loop().run(pool.prewarm())
+    pool.record(alpha)  # A request used the pre-warmed window
+
+    for _ in range(3):
+        pool.record(beta)
+    result = get_automation_loop().run(pool.prewarm())
+    assert result["closed"] == []
+    assert get_window_index().lookup(alpha) is not None